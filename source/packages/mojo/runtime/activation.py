@@ -14,11 +14,12 @@ __credits__ = []
 from typing import Optional
 
 import os
+import sys
 import tempfile
 import uuid
 
+from datetime import datetime
 from logging import FileHandler
-from logging.handlers import RotatingFileHandler
 
 
 from mojo.collections.contextpaths import ContextPaths
@@ -32,13 +33,116 @@ from mojo.errors.xtraceback import (
 )
 
 
-from mojo.runtime.enumerations import ActivationProfile, JobType
+from mojo.runtime.enumerations import ActivationProfile, JobType, OutputLayout
 from mojo.runtime.variablenames import MOJO_RUNTIME_VARNAMES
 
-from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES
+from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES, bump_runtime_info_version
+from mojo.runtime.tracing import span
 
 from mojo.xmods.xlogging.levels import LogLevel
 
+
+class MOJO_ACTIVATION_STATE:
+    """
+        Holds the state that was captured before the runtime was activated so the activation
+        can be reversed by :func:`deactivate_runtime`.
+    """
+    # The value recorded in the context snapshot for the entries that did not exist before activation.
+    CONTEXT_ENTRY_ABSENT = object()
+
+    CONTEXT_SNAPSHOT = None
+    DEFER_LOG_FILE_OPEN = False
+    ENVIRONMENT_SNAPSHOT = None
+    LOG_HANDLER_SNAPSHOT = None
+    VARIABLES_SNAPSHOT = None
+
+
+ACTIVATION_CONTEXT_PATHS = [
+    ContextPaths.DIAGNOSTICS_TRACEBACK_POLICY_OVERRIDE,
+    ContextPaths.JOB_ID,
+    ContextPaths.LOGGING_LEVEL_CONSOLE,
+    ContextPaths.LOGGING_LEVEL_LOGFILE,
+    ContextPaths.OUTPUT_DIRECTORY,
+    ContextPaths.RESULT_PATH_FOR_CONSOLE,
+    ContextPaths.RESULT_PATH_FOR_ORCHESTRATION,
+    ContextPaths.RESULT_PATH_FOR_SERVICES,
+    ContextPaths.RESULT_PATH_FOR_TESTS,
+    ContextPaths.STARTTIME
+]
+
+ACTIVATION_ENVIRONMENT_VARIABLES = [
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_TYPE,
+    MOJO_RUNTIME_VARNAMES.MJR_LOG_LEVEL_CONSOLE,
+    MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_DIRECTORY
+]
+
+
+def capture_activation_state():
+    """
+        Captures the runtime variables, context entries, environment variables and logging handlers
+        that are modified by activation so they can be restored by :func:`deactivate_runtime`.
+    """
+    from mojo.runtime.logcontrol import capture_log_handlers
+
+    ctx = ContextSingleton()
+
+    context_snapshot = {}
+    for ctx_path in ACTIVATION_CONTEXT_PATHS:
+        context_snapshot[ctx_path] = ctx.lookup(ctx_path, default=MOJO_ACTIVATION_STATE.CONTEXT_ENTRY_ABSENT)
+
+    environment_snapshot = {}
+    for var_name in ACTIVATION_ENVIRONMENT_VARIABLES:
+        environment_snapshot[var_name] = os.environ.get(var_name, None)
+
+    # Only the variables declared by the runtime are captured, setting an inherited configuration
+    # variable on the runtime class would shadow later updates made to the configuration variables.
+    variables_snapshot = {}
+    for var_name, var_value in vars(MOJO_RUNTIME_VARIABLES).items():
+        if var_name.startswith("MJR_"):
+            variables_snapshot[var_name] = var_value
+
+    MOJO_ACTIVATION_STATE.CONTEXT_SNAPSHOT = context_snapshot
+    MOJO_ACTIVATION_STATE.ENVIRONMENT_SNAPSHOT = environment_snapshot
+    MOJO_ACTIVATION_STATE.LOG_HANDLER_SNAPSHOT = capture_log_handlers()
+    MOJO_ACTIVATION_STATE.VARIABLES_SNAPSHOT = variables_snapshot
+
+    return
+
+def select_file_logging_handler(handler_type: Optional[type] = None) -> type:
+    """
+        Returns the file handler type for the logging activation, the rotating file handler by default.
+        When MJR_LOG_COMPRESSION is set, the rotated log files are compressed on a background thread
+        and the compressed files are kept within MJR_LOG_RETENTION_BYTES.  The bytes written to the log
+        files are counted against the output quota.  When the runtime is activated
+        by :func:`activate_runtime_async`, the handlers are created without opening their files so the
+        files can be opened concurrently once the activation profile is active.
+
+        :param handler_type: The file handler type to use instead of the rotating file handler.
+    """
+    if handler_type is None:
+        from logging.handlers import RotatingFileHandler
+
+        handler_type = RotatingFileHandler
+
+        if MOJO_RUNTIME_VARIABLES.MJR_LOG_COMPRESSION is not None:
+            from mojo.runtime.logrotation import CompressingRotatingFileHandler, configure_log_compression
+
+            configure_log_compression(compression=MOJO_RUNTIME_VARIABLES.MJR_LOG_COMPRESSION,
+                                      retention_bytes=MOJO_RUNTIME_VARIABLES.MJR_LOG_RETENTION_BYTES)
+            handler_type = CompressingRotatingFileHandler
+
+    # The bytes written to the log files are counted against the output quota.
+    from mojo.runtime.quotas import quota_tracked_handler_type
+
+    handler_type = quota_tracked_handler_type(handler_type)
+
+    if MOJO_ACTIVATION_STATE.DEFER_LOG_FILE_OPEN:
+        from mojo.runtime.logcontrol import deferred_open_handler_type
+
+        handler_type = deferred_open_handler_type(handler_type)
+
+    return handler_type
+
 def activate_profile_command():
 
     # Guard against attemps to activate more than one, activation profile.
@@ -48,6 +152,8 @@ def activate_profile_command():
         )
         raise SemanticError(errmsg)
 
+    capture_activation_state()
+
     MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE = ActivationProfile.Command
     MOJO_RUNTIME_VARIABLES.MJR_JOB_TYPE = JobType.Unknown.value
     os.environ[MOJO_RUNTIME_VARNAMES.MJR_JOB_TYPE] = MOJO_RUNTIME_VARIABLES.MJR_JOB_TYPE
@@ -59,8 +165,9 @@ def activate_profile_command():
 
     from mojo.xmods.xlogging.foundations import logging_initialize, LoggingDefaults # pylint: disable=wrong-import-position
 
-    LoggingDefaults.DefaultFileLoggingHandler = FileHandler
-    logging_initialize()
+    LoggingDefaults.DefaultFileLoggingHandler = select_file_logging_handler(FileHandler)
+    with span("logging_initialize", category="activation"):
+        logging_initialize()
 
 
     return
@@ -74,6 +181,8 @@ def activate_profile_console():
         )
         raise SemanticError(errmsg)
 
+    capture_activation_state()
+
     MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE = ActivationProfile.Console
     MOJO_RUNTIME_VARIABLES.MJR_JOB_TYPE = JobType.Console.value
     os.environ[MOJO_RUNTIME_VARNAMES.MJR_JOB_TYPE] = MOJO_RUNTIME_VARIABLES.MJR_JOB_TYPE
@@ -107,8 +216,9 @@ def activate_profile_console():
 
         from mojo.xmods.xlogging.foundations import logging_initialize, LoggingDefaults # pylint: disable=wrong-import-position
 
-        LoggingDefaults.DefaultFileLoggingHandler = RotatingFileHandler
-        logging_initialize()
+        LoggingDefaults.DefaultFileLoggingHandler = select_file_logging_handler()
+        with span("logging_initialize", category="activation"):
+            logging_initialize()
 
         showlog()
 
@@ -118,8 +228,9 @@ def activate_profile_console():
 
         from mojo.xmods.xlogging.foundations import logging_initialize, LoggingDefaults # pylint: disable=wrong-import-position
 
-        LoggingDefaults.DefaultFileLoggingHandler = RotatingFileHandler
-        logging_initialize()
+        LoggingDefaults.DefaultFileLoggingHandler = select_file_logging_handler()
+        with span("logging_initialize", category="activation"):
+            logging_initialize()
 
     return
 
@@ -132,6 +243,8 @@ def activate_profile_service():
         )
         raise SemanticError(errmsg)
 
+    capture_activation_state()
+
     MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE = ActivationProfile.Service
 
     service_name = MOJO_RUNTIME_VARIABLES.MJR_SERVICE_NAME
@@ -159,9 +272,10 @@ def activate_profile_service():
 
     from mojo.xmods.xlogging.foundations import logging_initialize, LoggingDefaults # pylint: disable=wrong-import-position
 
-    LoggingDefaults.DefaultFileLoggingHandler = RotatingFileHandler
+    LoggingDefaults.DefaultFileLoggingHandler = select_file_logging_handler()
 
-    logging_initialize()
+    with span("logging_initialize", category="activation"):
+        logging_initialize()
 
 
     return
@@ -175,6 +289,8 @@ def activate_profile_testrun():
         )
         raise RuntimeError(errmsg)
 
+    capture_activation_state()
+
     MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE = ActivationProfile.TestRun
     MOJO_RUNTIME_VARIABLES.MJR_LOG_LEVEL_CONSOLE = LogLevel.WARNING
 
@@ -187,7 +303,8 @@ def activate_profile_testrun():
 
     from mojo.xmods.xlogging.foundations import logging_initialize
     
-    logging_initialize()
+    with span("logging_initialize", category="activation"):
+        logging_initialize()
 
     return
 
@@ -247,18 +364,38 @@ def activate_profile_common():
 
     starttime_name = MOJO_RUNTIME_VARIABLES.MJR_STARTTIME.strftime(DATETIME_FORMAT_FILESYSTEM)
 
-    fill_dict = {
-        "starttime": starttime_name
-    }
-
     if MOJO_RUNTIME_VARIABLES.MJR_JOB_ID is None or MOJO_RUNTIME_VARIABLES.MJR_JOB_ID == DefaultValue.NotSet:
         MOJO_RUNTIME_VARIABLES.MJR_JOB_ID = str(uuid.uuid4())
 
+    # When a list of output roots is configured, the output root for this job is selected from the
+    # list so the output of the jobs running on a node is spread across the volumes of the roots.
+    output_root = os.path.join(MOJO_RUNTIME_VARIABLES.MJR_HOME_DIRECTORY, "results")
+    if MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_ROOTS is not None and len(MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_ROOTS) > 0:
+        from mojo.runtime.paths import get_directory_for_cached_files
+        from mojo.runtime.striping import select_output_root, ROUND_ROBIN_COUNTER_FILENAME
+
+        counter_file = os.path.join(get_directory_for_cached_files(), ROUND_ROBIN_COUNTER_FILENAME)
+        with span("select_output_root", category="activation"):
+            output_root = select_output_root(MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_ROOTS, MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STRIPING_POLICY,
+                                             MOJO_RUNTIME_VARIABLES.MJR_JOB_ID, counter_file=counter_file)
+
+    fill_dict = {
+        "starttime": starttime_name,
+        "output_root": output_root,
+        "job_id": MOJO_RUNTIME_VARIABLES.MJR_JOB_ID,
+        "job_name": MOJO_RUNTIME_VARIABLES.MJR_JOB_NAME,
+        "run_id": MOJO_RUNTIME_VARIABLES.MJR_RUN_ID,
+        "pipeline_id": MOJO_RUNTIME_VARIABLES.MJR_PIPELINE_ID,
+        "pipeline_name": MOJO_RUNTIME_VARIABLES.MJR_PIPELINE_NAME,
+        "pipeline_instance": MOJO_RUNTIME_VARIABLES.MJR_PIPELINE_INSTANCE
+    }
+
     # We want to pull the console and testresults value from the configuration, because if its not there it
     # will be set from the default_dir_template variable
     env = ctx.lookup("/environment")
     ctx.insert(ContextPaths.STARTTIME, MOJO_RUNTIME_VARIABLES.MJR_STARTTIME)
     ctx.insert(ContextPaths.JOB_ID, MOJO_RUNTIME_VARIABLES.MJR_JOB_ID)
+    bump_runtime_info_version()
 
     outdir_full = None
 
@@ -266,26 +403,26 @@ def activate_profile_common():
     # determines where loggin will go and is different depending on the activation mode of the test framework
     filled_dir_results = None
     if jobtype == JobType.Console:
-        default_dir_template = os.path.join(MOJO_RUNTIME_VARIABLES.MJR_HOME_DIRECTORY, "results", "console", "%(starttime)s")
+        default_dir_template = os.path.join("%(output_root)s", "console", "%(starttime)s")
         outdir_template = ctx.lookup(ContextPaths.TEMPLATE_PATH_FOR_CONSOLE, default=default_dir_template)
         filled_dir_results = outdir_template % fill_dict
         ctx.insert(ContextPaths.RESULT_PATH_FOR_CONSOLE, filled_dir_results)
 
     elif jobtype == JobType.Orchestration:
-        default_dir_template = os.path.join(MOJO_RUNTIME_VARIABLES.MJR_HOME_DIRECTORY, "results", "orchestration", "%(starttime)s")
+        default_dir_template = os.path.join("%(output_root)s", "orchestration", "%(starttime)s")
         outdir_template = ctx.lookup(ContextPaths.TEMPLATE_PATH_FOR_ORCHESTRATION, default=default_dir_template)
         filled_dir_results = outdir_template % fill_dict
         ctx.insert(ContextPaths.RESULT_PATH_FOR_ORCHESTRATION, filled_dir_results)
 
     elif jobtype == JobType.Service:
-        default_dir_template = os.path.join(MOJO_RUNTIME_VARIABLES.MJR_HOME_DIRECTORY, "results", "service", "%(starttime)s")
+        default_dir_template = os.path.join("%(output_root)s", "service", "%(starttime)s")
         outdir_template = ctx.lookup(ContextPaths.TEMPLATE_PATH_FOR_SERVICES, default=default_dir_template)
         filled_dir_results = outdir_template % fill_dict
         ctx.insert(ContextPaths.RESULT_PATH_FOR_SERVICES, filled_dir_results)
 
     else:
         if MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_DIRECTORY is None:
-            default_dir_template = os.path.join(MOJO_RUNTIME_VARIABLES.MJR_HOME_DIRECTORY, "results", "testresults", "%(starttime)s")
+            default_dir_template = os.path.join("%(output_root)s", "testresults", "%(starttime)s")
             outdir_template = ctx.lookup(ContextPaths.TEMPLATE_PATH_FOR_TESTS, default=default_dir_template)
             filled_dir_results = outdir_template % fill_dict
             ctx.insert(ContextPaths.RESULT_PATH_FOR_TESTS, filled_dir_results)
@@ -293,24 +430,417 @@ def activate_profile_common():
             filled_dir_results = MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_DIRECTORY % fill_dict
             ctx.insert(ContextPaths.RESULT_PATH_FOR_TESTS, filled_dir_results)
 
+    # When the output directory is shared across nodes and the sharded layout is selected, each process
+    # writes its output under its own shard so the metadata operations of the processes do not contend
+    # on the same directories.  When a process exits and every shard is complete, the process merges the
+    # shards into a unified view with `merge_output_shards`.
+    if MOJO_RUNTIME_VARIABLES.MJR_HAS_SHARED_OUTPUT_DIRECTORY and MOJO_RUNTIME_VARIABLES.MJR_SHARED_OUTPUT_LAYOUT == OutputLayout.Sharded:
+        import atexit
+        from mojo.runtime.sharding import complete_output_shard, configure_output_sharding
+
+        with span("configure_output_sharding", category="activation"):
+            shard_dir = configure_output_sharding(filled_dir_results)
+        atexit.register(complete_output_shard, mode=MOJO_RUNTIME_VARIABLES.MJR_SHARD_MERGE_MODE)
+
+        if ctx.lookup(ContextPaths.RESULT_PATH_FOR_TESTS, default=None) == filled_dir_results:
+            ctx.insert(ContextPaths.RESULT_PATH_FOR_TESTS, shard_dir)
+
+        filled_dir_results = shard_dir
+
+    # When output staging is enabled, the output directory is pointed at a node-local staging directory
+    # and the files written there are written back to the real output directory in the background.
+    if MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_DIRECTORY is not None:
+        import atexit
+        from mojo.runtime.staging import start_output_staging, stop_output_staging
+
+        staging_root = os.path.abspath(os.path.expanduser(MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_DIRECTORY))
+        staging_dir = os.path.join(staging_root, MOJO_RUNTIME_VARIABLES.MJR_JOB_ID)
+        destination_dir = os.path.abspath(os.path.expandvars(os.path.expanduser(filled_dir_results)))
+
+        with span("start_output_staging", category="activation"):
+            start_output_staging(staging_dir, destination_dir, max_workers=MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_WORKERS,
+                                 job_id=MOJO_RUNTIME_VARIABLES.MJR_JOB_ID,
+                                 flush_interval=MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_FLUSH_INTERVAL)
+        atexit.register(stop_output_staging, timeout=MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_FLUSH_TIMEOUT)
+
+        if ctx.lookup(ContextPaths.RESULT_PATH_FOR_TESTS, default=None) == filled_dir_results:
+            ctx.insert(ContextPaths.RESULT_PATH_FOR_TESTS, staging_dir)
+
+        filled_dir_results = staging_dir
+
     ctx.insert(ContextPaths.OUTPUT_DIRECTORY, filled_dir_results)
 
+    # The operations on shared storage paths are run on the shared I/O executor so a stalled filer
+    # causes activation to fail with a timeout instead of hanging when logging creates its files.
+    from mojo.runtime.sharedio import configure_shared_io, shared_makedirs
+
+    configure_shared_io(max_workers=MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_WORKERS,
+                        max_stalled=MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_MAX_STALLED,
+                        timeout=MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_TIMEOUT,
+                        retries=MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_RETRIES)
+
+    if MOJO_RUNTIME_VARIABLES.MJR_HAS_SHARED_OUTPUT_DIRECTORY and MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_DIRECTORY is None:
+        with span("create_shared_output_directory", category="activation"):
+            shared_makedirs(os.path.abspath(os.path.expandvars(os.path.expanduser(filled_dir_results))))
+
+    # Configure the quota for the output directory, the limits for the activation profile can be
+    # overridden by the MJR_OUTPUT_QUOTA_SOFT and MJR_OUTPUT_QUOTA_HARD variables.
+    from mojo.runtime.quotas import configure_output_quota
+    from mojo.runtime.runtimesettings import MOJO_RUNTIME_DEFAULTS
+
+    profile = ActivationProfile(MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE)
+    soft_limit, hard_limit = MOJO_RUNTIME_DEFAULTS.MJR_OUTPUT_QUOTA_LIMITS.get(profile, (None, None))
+
+    if MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_SOFT is not None:
+        soft_limit = MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_SOFT
+    if MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_HARD is not None:
+        hard_limit = MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_HARD
+
+    with span("configure_output_quota", category="activation"):
+        configure_output_quota(soft_limit=soft_limit, hard_limit=hard_limit)
+
     return
 
 
 def activate_runtime(*, profile: Optional[ActivationProfile]=ActivationProfile.Console):
 
+    # The spans of the activation phases are recorded when tracing is enabled and written to the
+    # output directory as Chrome trace events when the runtime is deactivated or the process exits.
+    if MOJO_RUNTIME_VARIABLES.MJR_TRACING_ENABLED:
+        from mojo.runtime.tracing import enable_tracing
+        enable_tracing()
+
     # Activate the runtime profile specified
-    if profile == ActivationProfile.Command:
-        activate_profile_command()
-    elif profile == ActivationProfile.Console:
-        activate_profile_console()
-    elif profile == ActivationProfile.Service:
-        activate_profile_service()
-    elif profile == ActivationProfile.TestRun:
-        activate_profile_testrun()
+    with span("activate_runtime", category="activation", profile=str(profile)):
+        if profile == ActivationProfile.Command:
+            activate_profile_command()
+        elif profile == ActivationProfile.Console:
+            activate_profile_console()
+        elif profile == ActivationProfile.Service:
+            activate_profile_service()
+        elif profile == ActivationProfile.TestRun:
+            activate_profile_testrun()
+        else:
+            errmsg = f"Unknown runtime activation profile. profile={profile}"
+            raise SemanticError(errmsg)
+
+    # The handlers added by the activation profile are registered as runtime handlers, the reloaded
+    # log levels are applied to them and not to the handlers of the application.
+    if MOJO_ACTIVATION_STATE.LOG_HANDLER_SNAPSHOT is not None:
+        from mojo.runtime.logcontrol import find_added_log_handlers, register_runtime_log_handler
+
+        for _, handler in find_added_log_handlers(MOJO_ACTIVATION_STATE.LOG_HANDLER_SNAPSHOT):
+            register_runtime_log_handler(handler)
+
+    # The trace is flushed at exit before the output staging is stopped, so the trace file is
+    # written back with the rest of the staged output.
+    if MOJO_RUNTIME_VARIABLES.MJR_TRACING_ENABLED:
+        import atexit
+        from mojo.runtime.tracing import flush_runtime_trace
+        atexit.register(flush_runtime_trace)
+
+    # The resource telemetry sampler records the cpu, memory and I/O usage of the process to the
+    # diagnostics directory so slow jobs can be correlated with resource pressure.
+    if MOJO_RUNTIME_VARIABLES.MJR_TELEMETRY_ENABLED:
+        import atexit
+        from mojo.runtime.paths import get_path_for_diagnostics
+        from mojo.runtime.telemetry import start_resource_telemetry, stop_resource_telemetry
+
+        start_resource_telemetry(get_path_for_diagnostics("telemetry"), interval=MOJO_RUNTIME_VARIABLES.MJR_TELEMETRY_INTERVAL)
+        atexit.register(stop_resource_telemetry)
+
+    # The sampling profiler writes collapsed stacks to the diagnostics directory, it can be running
+    # for the whole process or toggled on and off with SIGUSR2.
+    if MOJO_RUNTIME_VARIABLES.MJR_PROFILER_ENABLED or MOJO_RUNTIME_VARIABLES.MJR_PROFILER_SIGNAL:
+        import atexit
+        from mojo.runtime.profiler import (
+            configure_sampling_profiler, install_profiler_signal_handler, start_sampling_profiler, stop_sampling_profiler
+        )
+
+        configure_sampling_profiler(None, interval=MOJO_RUNTIME_VARIABLES.MJR_PROFILER_INTERVAL)
+
+        if MOJO_RUNTIME_VARIABLES.MJR_PROFILER_SIGNAL:
+            install_profiler_signal_handler()
+
+        if MOJO_RUNTIME_VARIABLES.MJR_PROFILER_ENABLED:
+            start_sampling_profiler()
+
+        atexit.register(stop_sampling_profiler)
+
+    # Memory tracing takes tracemalloc snapshots of the top allocation sites at activation, at exit,
+    # on SIGUSR1, at checkpoints requested with `take_memory_snapshot` and when the RSS limit is crossed.
+    if MOJO_RUNTIME_VARIABLES.MJR_MEMORY_TRACING:
+        import atexit
+        from mojo.runtime.memorydiag import install_memory_signal_handler, start_memory_diagnostics, stop_memory_diagnostics
+        from mojo.runtime.paths import get_path_for_diagnostics
+
+        start_memory_diagnostics(get_path_for_diagnostics("memory"), frames=MOJO_RUNTIME_VARIABLES.MJR_MEMORY_TRACE_FRAMES,
+                                 rss_limit=MOJO_RUNTIME_VARIABLES.MJR_MEMORY_RSS_LIMIT)
+        atexit.register(stop_memory_diagnostics)
+
+        if MOJO_RUNTIME_VARIABLES.MJR_MEMORY_SIGNAL:
+            install_memory_signal_handler()
+
+    # The hang watchdog dumps the stacks of the process to the diagnostics directory when no progress
+    # has been reported with `report_progress` for the watchdog timeout.
+    if MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_TIMEOUT is not None:
+        import atexit
+        from mojo.runtime.paths import get_path_for_diagnostics
+        from mojo.runtime.watchdog import start_hang_watchdog, stop_hang_watchdog
+
+        start_hang_watchdog(get_path_for_diagnostics("hang"), MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_TIMEOUT,
+                            policy=MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_POLICY,
+                            capture_profile=MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_CAPTURE_PROFILE,
+                            capture_memory=MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_CAPTURE_MEMORY)
+        atexit.register(stop_hang_watchdog)
+
+    # The log levels and the reloadable runtime variables of a running process can be reloaded
+    # with SIGHUP or by changing the reload file, the log files are reopened on each reload.
+    if MOJO_RUNTIME_VARIABLES.MJR_RELOAD_SIGNAL or MOJO_RUNTIME_VARIABLES.MJR_RELOAD_FILE is not None:
+        import atexit
+        from mojo.runtime.reload import start_runtime_reloader, stop_runtime_reloader
+
+        reload_file = MOJO_RUNTIME_VARIABLES.MJR_RELOAD_FILE
+        if reload_file is not None:
+            reload_file = os.path.abspath(os.path.expandvars(os.path.expanduser(reload_file)))
+
+        start_runtime_reloader(reload_file=reload_file, use_signal=MOJO_RUNTIME_VARIABLES.MJR_RELOAD_SIGNAL,
+                               poll_interval=MOJO_RUNTIME_VARIABLES.MJR_RELOAD_POLL_INTERVAL)
+        atexit.register(stop_runtime_reloader)
+
+    # The binary log writes the records without formatting them to a compact binary stream in the
+    # output directory and keeps the most recent records in a ring buffer in the diagnostics directory
+    # that can be recovered after a crash.
+    if MOJO_RUNTIME_VARIABLES.MJR_LOG_BINARY_ENABLED:
+        import atexit
+        from mojo.runtime.binarylog import start_binary_logging, stop_binary_logging
+        from mojo.runtime.logcontrol import resolve_log_level
+        from mojo.runtime.paths import get_path_for_diagnostics, get_path_for_output
+
+        log_file = os.path.join(get_path_for_output(), "log-{}.mjrlog".format(os.getpid()))
+        ring_file = os.path.join(get_path_for_diagnostics("binarylog"), "ring-{}.mjrring".format(os.getpid()))
+
+        start_binary_logging(log_file=log_file, ring_file=ring_file,
+                             ring_records=MOJO_RUNTIME_VARIABLES.MJR_LOG_BINARY_RING_RECORDS,
+                             level=resolve_log_level(MOJO_RUNTIME_VARIABLES.MJR_LOG_LEVEL_FILE))
+        atexit.register(stop_binary_logging)
+
+    # The rate limit and duplicate filters are installed on the runtime handlers, the handlers created by
+    # the activation profile and the runtime features, the handlers of the application are not filtered.
+    # The suppressed records are reported in periodic summary records.
+    if MOJO_RUNTIME_VARIABLES.MJR_LOG_RATE_LIMIT is not None or MOJO_RUNTIME_VARIABLES.MJR_LOG_DEDUP:
+        import atexit
+        from mojo.runtime.logcontrol import get_runtime_log_handlers
+        from mojo.runtime.logfilters import install_log_filters, uninstall_log_filters
+
+        install_log_filters(rate=MOJO_RUNTIME_VARIABLES.MJR_LOG_RATE_LIMIT, burst=MOJO_RUNTIME_VARIABLES.MJR_LOG_RATE_BURST,
+                            dedup=MOJO_RUNTIME_VARIABLES.MJR_LOG_DEDUP,
+                            summary_interval=MOJO_RUNTIME_VARIABLES.MJR_LOG_SUMMARY_INTERVAL,
+                            handlers=get_runtime_log_handlers())
+        atexit.register(uninstall_log_filters)
+
+    return
+
+async def activate_runtime_async(*, profile: Optional[ActivationProfile]=ActivationProfile.Console):
+    """
+        Activates the runtime from an asyncio event loop without blocking the loop.  The activation
+        profile is activated on a worker thread, then the signal handlers of the runtime features are
+        installed on the thread of the event loop and the log files are opened and the output, temporary,
+        cache and static resource directories are created concurrently, so the runtime is ready to use
+        once the call returns.
+
+        :param profile: The activation profile to activate.
+    """
+    import asyncio
+    import logging
+    import threading
+
+    from mojo.runtime.asyncpaths import (
+        get_directory_for_cached_files_async,
+        get_path_for_output_async,
+        get_path_for_testresults_async,
+        get_summary_static_resource_dest_dir_async,
+        get_temporary_directory_async
+    )
+    from mojo.runtime.logcontrol import find_deferred_log_handlers, open_log_file
+    from mojo.runtime.sighandlers import install_pending_signal_handlers
+
+    # Activation updates the process wide context, environment and logging so the steps of the
+    # activation itself are run in order on a single worker thread.  The log handlers are created
+    # without opening their files, the files are opened concurrently with the directory creation.
+    MOJO_ACTIVATION_STATE.DEFER_LOG_FILE_OPEN = True
+    try:
+        await asyncio.to_thread(activate_runtime, profile=profile)
+    finally:
+        MOJO_ACTIVATION_STATE.DEFER_LOG_FILE_OPEN = False
+
+    # The signal handlers of the runtime features could not be installed from the worker thread,
+    # they are installed here on the thread of the event loop.
+    if threading.current_thread() is threading.main_thread():
+        install_pending_signal_handlers()
     else:
-        errmsg = f"Unknown runtime activation profile. profile={profile}"
-        raise SemanticError(errmsg)
+        logger = logging.getLogger()
+        logger.warning("The runtime signal handlers were not installed, the event loop is not running "
+                       "on the main thread. thread=%s", threading.current_thread().name)
 
-    return
\ No newline at end of file
+    ctx = ContextSingleton()
+
+    prepare_steps = [
+        asyncio.to_thread(open_log_file, handler) for handler in find_deferred_log_handlers()
+    ]
+    prepare_steps.extend([
+        get_path_for_output_async(),
+        get_temporary_directory_async(),
+        get_directory_for_cached_files_async()
+    ])
+
+    if profile == ActivationProfile.TestRun:
+        prepare_steps.append(get_path_for_testresults_async())
+
+    if ctx.lookup(ContextPaths.DIR_RESULTS_RESOURCE_DEST, default=None) is not None:
+        prepare_steps.append(get_summary_static_resource_dest_dir_async())
+
+    await asyncio.gather(*prepare_steps)
+
+    return
+
+def deactivate_runtime(flush_timeout: Optional[float] = None):
+    """
+        Reverses the activation of the runtime so another activation profile can be activated in
+        the same process.  The logging handlers that were installed by activation are removed and
+        closed, the temporary files are removed, the path caches are cleared and the runtime
+        variables, context entries and environment variables modified by activation are restored
+        to their pre-activation values.
+
+        :param flush_timeout: The maximum number of seconds to wait for the staged output to be
+                              written back, defaults to MJR_OUTPUT_STAGING_FLUSH_TIMEOUT.
+    """
+    import atexit
+
+    from mojo.runtime.logcontrol import teardown_log_handlers
+    from mojo.runtime.paths import reset_path_caches
+    from mojo.runtime.quotas import configure_output_quota
+    from mojo.runtime.tempalloc import reset_temp_file_allocator
+    from mojo.runtime.tracing import disable_tracing, flush_runtime_trace
+
+    if MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE is None:
+        return
+
+    if flush_timeout is None:
+        flush_timeout = MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_FLUSH_TIMEOUT
+
+    # The runtime features are only torn down when their modules were imported, the module of a
+    # feature that was never enabled is not imported just to stop it.
+    logfilters = sys.modules.get("mojo.runtime.logfilters", None)
+    if logfilters is not None:
+        atexit.unregister(logfilters.uninstall_log_filters)
+        logfilters.uninstall_log_filters()
+
+    binarylog = sys.modules.get("mojo.runtime.binarylog", None)
+    if binarylog is not None:
+        atexit.unregister(binarylog.stop_binary_logging)
+        binarylog.stop_binary_logging()
+
+    reload = sys.modules.get("mojo.runtime.reload", None)
+    if reload is not None:
+        atexit.unregister(reload.stop_runtime_reloader)
+        reload.stop_runtime_reloader()
+
+    watchdog = sys.modules.get("mojo.runtime.watchdog", None)
+    if watchdog is not None:
+        atexit.unregister(watchdog.stop_hang_watchdog)
+        watchdog.stop_hang_watchdog()
+
+    profiler = sys.modules.get("mojo.runtime.profiler", None)
+    if profiler is not None:
+        atexit.unregister(profiler.stop_sampling_profiler)
+        profiler.reset_sampling_profiler()
+
+    memorydiag = sys.modules.get("mojo.runtime.memorydiag", None)
+    if memorydiag is not None:
+        atexit.unregister(memorydiag.stop_memory_diagnostics)
+        memorydiag.reset_memory_diagnostics()
+
+    telemetry = sys.modules.get("mojo.runtime.telemetry", None)
+    if telemetry is not None:
+        atexit.unregister(telemetry.stop_resource_telemetry)
+        telemetry.stop_resource_telemetry()
+
+    # The trace is written while the output directory of the activation is still current.
+    atexit.unregister(flush_runtime_trace)
+    flush_runtime_trace()
+    disable_tracing()
+
+    if MOJO_ACTIVATION_STATE.LOG_HANDLER_SNAPSHOT is not None:
+        teardown_log_handlers(MOJO_ACTIVATION_STATE.LOG_HANDLER_SNAPSHOT)
+
+    logrotation = sys.modules.get("mojo.runtime.logrotation", None)
+    if logrotation is not None:
+        logrotation.configure_log_compression()
+
+    # The temporary files are removed before the staged output is written back so they
+    # are not copied to the output directory.
+    reset_temp_file_allocator()
+
+    staging = sys.modules.get("mojo.runtime.staging", None)
+    if staging is not None:
+        atexit.unregister(staging.stop_output_staging)
+        staging.stop_output_staging(timeout=flush_timeout)
+
+    sharding = sys.modules.get("mojo.runtime.sharding", None)
+    if sharding is not None:
+        atexit.unregister(sharding.complete_output_shard)
+        sharding.complete_output_shard(mode=MOJO_RUNTIME_VARIABLES.MJR_SHARD_MERGE_MODE)
+        sharding.reset_output_sharding()
+
+    configure_output_quota()
+    reset_path_caches()
+
+    ctx = ContextSingleton()
+
+    if MOJO_ACTIVATION_STATE.CONTEXT_SNAPSHOT is not None:
+        for ctx_path, ctx_value in MOJO_ACTIVATION_STATE.CONTEXT_SNAPSHOT.items():
+            # The entries that were created by activation are removed instead of being set to None.
+            if ctx_value is MOJO_ACTIVATION_STATE.CONTEXT_ENTRY_ABSENT:
+                if ctx.lookup(ctx_path, default=MOJO_ACTIVATION_STATE.CONTEXT_ENTRY_ABSENT) is not MOJO_ACTIVATION_STATE.CONTEXT_ENTRY_ABSENT:
+                    ctx.remove(ctx_path)
+            else:
+                ctx.insert(ctx_path, ctx_value)
+
+    if MOJO_ACTIVATION_STATE.ENVIRONMENT_SNAPSHOT is not None:
+        for var_name, var_value in MOJO_ACTIVATION_STATE.ENVIRONMENT_SNAPSHOT.items():
+            if var_value is None:
+                os.environ.pop(var_name, None)
+            else:
+                os.environ[var_name] = var_value
+
+    if MOJO_ACTIVATION_STATE.VARIABLES_SNAPSHOT is not None:
+        for var_name, var_value in MOJO_ACTIVATION_STATE.VARIABLES_SNAPSHOT.items():
+            setattr(MOJO_RUNTIME_VARIABLES, var_name, var_value)
+
+    MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE = None
+    bump_runtime_info_version()
+
+    MOJO_ACTIVATION_STATE.CONTEXT_SNAPSHOT = None
+    MOJO_ACTIVATION_STATE.ENVIRONMENT_SNAPSHOT = None
+    MOJO_ACTIVATION_STATE.LOG_HANDLER_SNAPSHOT = None
+    MOJO_ACTIVATION_STATE.VARIABLES_SNAPSHOT = None
+
+    return
+
+def reset_runtime(flush_timeout: Optional[float] = None):
+    """
+        Deactivates the runtime and resolves the runtime variables again from the environment so
+        the next activation starts a new job with a new start time, run id and job id.
+
+        :param flush_timeout: The maximum number of seconds to wait for the staged output to be
+                              written back, defaults to MJR_OUTPUT_STAGING_FLUSH_TIMEOUT.
+    """
+    from mojo.runtime.runtimevariables import resolve_runtime_variables
+
+    deactivate_runtime(flush_timeout=flush_timeout)
+
+    MOJO_RUNTIME_VARIABLES.MJR_STARTTIME = datetime.now()
+    resolve_runtime_variables()
+
+    return
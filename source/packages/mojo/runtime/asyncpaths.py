@@ -0,0 +1,73 @@
+"""
+.. module:: asyncpaths
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains asyncio variants of the path getters in :mod:`mojo.runtime.paths`
+               that run the blocking filesystem work off of the event loop.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Callable
+
+import asyncio
+
+from mojo.runtime import paths
+
+
+async def run_path_getter(getter: Callable, *args, **kwargs) -> Any:
+    """
+        Runs a blocking path getter on a worker thread and awaits its result.  The context
+        variables of the caller are copied to the worker thread so the getter resolves against
+        the isolated runtime context of the calling task, if any.
+
+        :param getter: The path getter to run.
+
+        :returns: The result of the path getter.
+    """
+    rtnval = await asyncio.to_thread(getter, *args, **kwargs)
+    return rtnval
+
+async def get_directory_for_cached_files_async(create=True) -> str:
+    rtnval = await run_path_getter(paths.get_directory_for_cached_files, create=create)
+    return rtnval
+
+async def get_path_for_artifacts_async(label: str) -> str:
+    rtnval = await run_path_getter(paths.get_path_for_artifacts, label)
+    return rtnval
+
+async def get_path_for_diagnostics_async(label: str) -> str:
+    rtnval = await run_path_getter(paths.get_path_for_diagnostics, label)
+    return rtnval
+
+async def get_path_for_output_async(create=True) -> str:
+    rtnval = await run_path_getter(paths.get_path_for_output, create=create)
+    return rtnval
+
+async def get_path_for_shared_store_async(create=True) -> str:
+    rtnval = await run_path_getter(paths.get_path_for_shared_store, create=create)
+    return rtnval
+
+async def get_path_for_testcase_by_products_async(test_id: str) -> str:
+    rtnval = await run_path_getter(paths.get_path_for_testcase_by_products, test_id)
+    return rtnval
+
+async def get_path_for_testresults_async() -> str:
+    rtnval = await run_path_getter(paths.get_path_for_testresults)
+    return rtnval
+
+async def get_summary_static_resource_dest_dir_async(create=True) -> str:
+    rtnval = await run_path_getter(paths.get_summary_static_resource_dest_dir, create=create)
+    return rtnval
+
+async def get_temporary_directory_async() -> str:
+    rtnval = await run_path_getter(paths.get_temporary_directory)
+    return rtnval
+
+async def get_temporary_file_async(suffix: str = '', prefix: str = '') -> str:
+    rtnval = await run_path_getter(paths.get_temporary_file, suffix=suffix, prefix=prefix)
+    return rtnval
@@ -0,0 +1,595 @@
+"""
+.. module:: binarylog
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`BinaryLogHandler` which is used to write log records
+               as compact binary entries to a log stream and to a crash safe mmap ring buffer, and the
+               decoder that turns the entries back into text.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+
+    The records are written without being formatted.  Each record is stored as the time it was
+    created, its level, the ID of its logger, the ID of its message template and its arguments.  The
+    logger names and message templates are written to the stream once, the first time they are
+    used, so a record that repeats a template only costs its arguments.
+
+    The ring buffer is a fixed size file in the diagnostics directory that is mapped into memory.
+    Each record is copied into the next slot of the ring, so the pages of the file always hold the
+    most recent records and they can be recovered from the file after the process crashes.
+
+    The entries are decoded with::
+
+        python -m mojo.runtime.binarylog (log or ring file) [--tail N]
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import argparse
+import logging
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from datetime import datetime
+
+BINARY_LOG_MAGIC = b"MJRBLOG1"
+BINARY_RING_MAGIC = b"MJRRING1"
+
+ENTRY_KIND_LOGGER = 1
+ENTRY_KIND_TEMPLATE = 2
+ENTRY_KIND_RECORD = 3
+
+ENTRY_FLAG_EXCEPTION = 0x01
+
+VALUE_NONE = 0
+VALUE_TRUE = 1
+VALUE_FALSE = 2
+VALUE_INT = 3
+VALUE_FLOAT = 4
+VALUE_STR = 5
+
+ENTRY_HEADER = struct.Struct("<BI")
+RECORD_HEADER = struct.Struct("<dBBII")
+RING_HEADER = struct.Struct("<8sII")
+RING_RECORD_HEADER = struct.Struct("<dBB")
+SLOT_HEADER = struct.Struct("<IIQ")
+ID_FIELD = struct.Struct("<I")
+INT_FIELD = struct.Struct("<q")
+FLOAT_FIELD = struct.Struct("<d")
+
+INT_MIN = -(1 << 63)
+INT_MAX = (1 << 63) - 1
+
+
+class BinaryLogRecord(NamedTuple):
+    created: float
+    levelno: int
+    logger: str
+    template: str
+    args: tuple
+    exc_text: Optional[str]
+
+
+def encode_string(buffer: bytearray, value: str):
+    """
+        Appends a length prefixed UTF-8 string to a buffer.
+    """
+    encoded = value.encode("utf-8", errors="backslashreplace")
+    buffer += ID_FIELD.pack(len(encoded))
+    buffer += encoded
+    return
+
+def encode_args(buffer: bytearray, args: tuple):
+    """
+        Appends the arguments of a record to a buffer.  None, booleans, integers, floats and strings
+        keep their type, any other argument is stored as the string it formats to with '%s'.
+    """
+    buffer.append(min(len(args), 255))
+
+    for arg in args[:255]:
+        if arg is None:
+            buffer.append(VALUE_NONE)
+        elif arg is True:
+            buffer.append(VALUE_TRUE)
+        elif arg is False:
+            buffer.append(VALUE_FALSE)
+        elif isinstance(arg, int) and INT_MIN <= arg <= INT_MAX:
+            buffer.append(VALUE_INT)
+            buffer += INT_FIELD.pack(arg)
+        elif isinstance(arg, float):
+            buffer.append(VALUE_FLOAT)
+            buffer += FLOAT_FIELD.pack(arg)
+        else:
+            buffer.append(VALUE_STR)
+            encode_string(buffer, arg if isinstance(arg, str) else str(arg))
+
+    return
+
+def decode_string(data: bytes, offset: int) -> Tuple[str, int]:
+    """
+        Decodes a length prefixed UTF-8 string from a buffer.
+
+        :returns: The string and the offset after the string.
+    """
+    length, = ID_FIELD.unpack_from(data, offset)
+    offset += ID_FIELD.size
+    if offset + length > len(data):
+        raise ValueError("The string extends past the end of the entry.")
+    value = bytes(data[offset:offset + length]).decode("utf-8", errors="replace")
+    return value, offset + length
+
+def decode_args(data: bytes, offset: int) -> Tuple[tuple, int]:
+    """
+        Decodes the arguments of a record from a buffer.
+
+        :returns: The arguments and the offset after the arguments.
+    """
+    count = data[offset]
+    offset += 1
+
+    args = []
+    for _ in range(count):
+        vtype = data[offset]
+        offset += 1
+        if vtype == VALUE_NONE:
+            args.append(None)
+        elif vtype == VALUE_TRUE:
+            args.append(True)
+        elif vtype == VALUE_FALSE:
+            args.append(False)
+        elif vtype == VALUE_INT:
+            args.append(INT_FIELD.unpack_from(data, offset)[0])
+            offset += INT_FIELD.size
+        elif vtype == VALUE_FLOAT:
+            args.append(FLOAT_FIELD.unpack_from(data, offset)[0])
+            offset += FLOAT_FIELD.size
+        elif vtype == VALUE_STR:
+            value, offset = decode_string(data, offset)
+            args.append(value)
+        else:
+            errmsg = "Unknown argument type in binary log entry. type={}".format(vtype)
+            raise ValueError(errmsg)
+
+    return tuple(args), offset
+
+def format_binary_log_record(record: BinaryLogRecord) -> str:
+    """
+        Formats a decoded record as a line of text.
+    """
+    try:
+        message = record.template % record.args if record.args else record.template
+    except (TypeError, ValueError, KeyError):
+        message = "{} {!r}".format(record.template, record.args)
+
+    timestamp = datetime.fromtimestamp(record.created).isoformat(sep=" ", timespec="milliseconds")
+    line = "{} {:<8} {}: {}".format(timestamp, logging.getLevelName(record.levelno), record.logger, message)
+
+    if record.exc_text:
+        line = line + os.linesep + record.exc_text
+
+    return line
+
+
+class MmapRingBuffer:
+    """
+        The :class:`MmapRingBuffer` stores the most recent records in a fixed number of fixed size
+        slots of a memory mapped file.  A slot holds the length, a CRC32 checksum and the sequence
+        number of its entry, followed by the entry.  The entry is written before its slot header, so a
+        slot that was being written when the process crashed fails its checksum and is skipped when
+        the ring is read.
+    """
+
+    def __init__(self, ring_file: str, slot_count: int = 4096, slot_size: int = 512):
+        self._ring_file = ring_file
+        self._slot_count = slot_count
+        self._slot_size = slot_size
+        self._sequence = 0
+
+        ring_dir = os.path.dirname(os.path.abspath(ring_file))
+        os.makedirs(ring_dir, exist_ok=True)
+
+        ring_length = RING_HEADER.size + slot_count * slot_size
+
+        fd = os.open(ring_file, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, ring_length)
+            self._mmap = mmap.mmap(fd, ring_length)
+        finally:
+            os.close(fd)
+
+        RING_HEADER.pack_into(self._mmap, 0, BINARY_RING_MAGIC, slot_count, slot_size)
+        return
+
+    @property
+    def capacity(self) -> int:
+        """
+            The largest entry that fits in a slot.
+        """
+        return self._slot_size - SLOT_HEADER.size
+
+    @property
+    def ring_file(self) -> str:
+        return self._ring_file
+
+    def append(self, entry: bytes):
+        """
+            Copies an entry into the next slot of the ring.
+        """
+        if len(entry) > self.capacity:
+            errmsg = "The entry does not fit in a slot of the ring buffer. length={} capacity={}".format(
+                len(entry), self.capacity)
+            raise ValueError(errmsg)
+
+        self._sequence += 1
+
+        offset = RING_HEADER.size + ((self._sequence - 1) % self._slot_count) * self._slot_size
+        entry_offset = offset + SLOT_HEADER.size
+
+        self._mmap[entry_offset:entry_offset + len(entry)] = entry
+        SLOT_HEADER.pack_into(self._mmap, offset, len(entry), zlib.crc32(entry), self._sequence)
+        return
+
+    def close(self):
+        """
+            Writes the ring to the file and unmaps it.
+        """
+        if self._mmap is not None:
+            self._mmap.flush()
+            self._mmap.close()
+            self._mmap = None
+        return
+
+    def flush(self):
+        """
+            Writes the pages of the ring to the file, this is only needed to survive a crash of the
+            operating system, the pages of a crashed process are written by the operating system.
+        """
+        if self._mmap is not None:
+            self._mmap.flush()
+        return
+
+
+class BinaryLogHandler(logging.Handler):
+    """
+        The :class:`BinaryLogHandler` writes log records as compact binary entries to a log stream
+        file, to a :class:`MmapRingBuffer` or to both.  The records are never formatted, the message
+        templates and the arguments are stored so the text can be produced by the decoder.
+    """
+
+    def __init__(self, log_file: Optional[str] = None, ring_file: Optional[str] = None, ring_records: int = 4096,
+                 ring_slot_size: int = 512, level: int = logging.NOTSET):
+        super().__init__(level=level)
+
+        self._log_file = log_file
+        self._stream = None
+        self._logger_ids: Dict[str, int] = {}
+        self._template_ids: Dict[str, int] = {}
+
+        if log_file is not None:
+            log_dir = os.path.dirname(os.path.abspath(log_file))
+            os.makedirs(log_dir, exist_ok=True)
+
+            self._stream = open(log_file, 'wb', buffering=64 * 1024)
+            self._stream.write(BINARY_LOG_MAGIC)
+
+        self._ring = None
+        if ring_file is not None and ring_records > 0:
+            self._ring = MmapRingBuffer(ring_file, slot_count=ring_records, slot_size=ring_slot_size)
+
+        return
+
+    @property
+    def log_file(self) -> Optional[str]:
+        return self._log_file
+
+    @property
+    def ring(self) -> Optional[MmapRingBuffer]:
+        return self._ring
+
+    def close(self):
+        self.acquire()
+        try:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+            if self._ring is not None:
+                self._ring.close()
+                self._ring = None
+        finally:
+            self.release()
+
+        super().close()
+        return
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            template = record.msg if isinstance(record.msg, str) else str(record.msg)
+            args = record.args
+            if not args:
+                args = ()
+            elif not isinstance(args, tuple):
+                # Records with a mapping for their arguments are stored as their message.
+                template = "%s"
+                args = (record.getMessage(),)
+
+            exc_text = None
+            if record.exc_info:
+                if not record.exc_text:
+                    record.exc_text = logging.Formatter().formatException(record.exc_info)
+                exc_text = record.exc_text
+
+            levelno = min(record.levelno, 255)
+            flags = ENTRY_FLAG_EXCEPTION if exc_text is not None else 0
+
+            if self._stream is not None:
+                self._write_stream_entry(record.created, levelno, flags, record.name, template, args, exc_text)
+
+            if self._ring is not None:
+                self._write_ring_entry(record.created, levelno, flags, record.name, template, args, exc_text)
+
+        except Exception: # pylint: disable=broad-except
+            self.handleError(record)
+
+        return
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._stream is not None:
+                self._stream.flush()
+        finally:
+            self.release()
+        return
+
+    def _get_id(self, table: Dict[str, int], kind: int, value: str) -> int:
+        entry_id = table.get(value)
+
+        if entry_id is None:
+            entry_id = len(table) + 1
+            table[value] = entry_id
+
+            payload = bytearray(ID_FIELD.pack(entry_id))
+            payload += value.encode("utf-8", errors="backslashreplace")
+            self._stream.write(ENTRY_HEADER.pack(kind, len(payload)))
+            self._stream.write(payload)
+
+        return entry_id
+
+    def _write_ring_entry(self, created: float, levelno: int, flags: int, name: str, template: str, args: tuple,
+                          exc_text: Optional[str]):
+
+        entry = bytearray(RING_RECORD_HEADER.pack(created, levelno, flags))
+        encode_string(entry, name)
+        encode_string(entry, template)
+        encode_args(entry, args)
+        if exc_text is not None:
+            encode_string(entry, exc_text)
+
+        if len(entry) > self._ring.capacity:
+            # An entry that does not fit in a slot is stored as the start of its formatted message.
+            try:
+                message = template % args if args else template
+            except (TypeError, ValueError, KeyError):
+                message = template
+
+            entry = bytearray(RING_RECORD_HEADER.pack(created, levelno, 0))
+            encode_string(entry, name)
+            available = max(self._ring.capacity - len(entry) - ID_FIELD.size - 1, 0)
+            encode_string(entry, message.encode("utf-8", errors="backslashreplace")[:available].decode("utf-8", errors="ignore"))
+            encode_args(entry, ())
+
+        if len(entry) <= self._ring.capacity:
+            self._ring.append(bytes(entry))
+
+        return
+
+    def _write_stream_entry(self, created: float, levelno: int, flags: int, name: str, template: str, args: tuple,
+                            exc_text: Optional[str]):
+
+        logger_id = self._get_id(self._logger_ids, ENTRY_KIND_LOGGER, name)
+        template_id = self._get_id(self._template_ids, ENTRY_KIND_TEMPLATE, template)
+
+        payload = bytearray(RECORD_HEADER.pack(created, levelno, flags, logger_id, template_id))
+        encode_args(payload, args)
+        if exc_text is not None:
+            encode_string(payload, exc_text)
+
+        self._stream.write(ENTRY_HEADER.pack(ENTRY_KIND_RECORD, len(payload)))
+        self._stream.write(payload)
+        return
+
+
+def read_binary_log(log_file: str) -> Iterator[BinaryLogRecord]:
+    """
+        Reads the records from a binary log stream.  A partial entry at the end of the stream, from
+        a process that crashed while writing it, ends the stream.
+
+        :param log_file: The path of the binary log stream.
+    """
+    with open(log_file, 'rb') as lf:
+        data = lf.read()
+
+    if not data.startswith(BINARY_LOG_MAGIC):
+        errmsg = "The file is not a binary log stream. file={}".format(log_file)
+        raise ValueError(errmsg)
+
+    loggers: Dict[int, str] = {}
+    templates: Dict[int, str] = {}
+
+    offset = len(BINARY_LOG_MAGIC)
+    while offset + ENTRY_HEADER.size <= len(data):
+        kind, length = ENTRY_HEADER.unpack_from(data, offset)
+        offset += ENTRY_HEADER.size
+
+        if offset + length > len(data):
+            break
+
+        payload = data[offset:offset + length]
+        offset += length
+
+        if kind in (ENTRY_KIND_LOGGER, ENTRY_KIND_TEMPLATE):
+            entry_id, = ID_FIELD.unpack_from(payload, 0)
+            table = loggers if kind == ENTRY_KIND_LOGGER else templates
+            table[entry_id] = payload[ID_FIELD.size:].decode("utf-8", errors="replace")
+
+        elif kind == ENTRY_KIND_RECORD:
+            created, levelno, flags, logger_id, template_id = RECORD_HEADER.unpack_from(payload, 0)
+            args, poffset = decode_args(payload, RECORD_HEADER.size)
+            exc_text = None
+            if flags & ENTRY_FLAG_EXCEPTION:
+                exc_text, poffset = decode_string(payload, poffset)
+
+            yield BinaryLogRecord(created, levelno, loggers.get(logger_id, "?"), templates.get(template_id, "?"),
+                                  args, exc_text)
+
+    return
+
+def read_ring_buffer(ring_file: str) -> List[BinaryLogRecord]:
+    """
+        Reads the records that are held in a ring buffer file, oldest first.  Slots that fail their
+        checksum are skipped.
+
+        :param ring_file: The path of the ring buffer file.
+    """
+    with open(ring_file, 'rb') as rf:
+        data = rf.read()
+
+    magic, slot_count, slot_size = RING_HEADER.unpack_from(data, 0)
+    if magic != BINARY_RING_MAGIC:
+        errmsg = "The file is not a binary log ring buffer. file={}".format(ring_file)
+        raise ValueError(errmsg)
+
+    entries: List[Tuple[int, BinaryLogRecord]] = []
+
+    for slot_index in range(slot_count):
+        offset = RING_HEADER.size + slot_index * slot_size
+        if offset + SLOT_HEADER.size > len(data):
+            break
+
+        length, checksum, sequence = SLOT_HEADER.unpack_from(data, offset)
+        if sequence == 0 or length > slot_size - SLOT_HEADER.size:
+            continue
+
+        entry = data[offset + SLOT_HEADER.size:offset + SLOT_HEADER.size + length]
+        if zlib.crc32(entry) != checksum:
+            continue
+
+        try:
+            created, levelno, flags = RING_RECORD_HEADER.unpack_from(entry, 0)
+            name, eoffset = decode_string(entry, RING_RECORD_HEADER.size)
+            template, eoffset = decode_string(entry, eoffset)
+            args, eoffset = decode_args(entry, eoffset)
+            exc_text = None
+            if flags & ENTRY_FLAG_EXCEPTION:
+                exc_text, eoffset = decode_string(entry, eoffset)
+        except (ValueError, IndexError, struct.error):
+            continue
+
+        entries.append((sequence, BinaryLogRecord(created, levelno, name, template, args, exc_text)))
+
+    entries.sort(key=lambda item: item[0])
+
+    records = [record for _, record in entries]
+
+    return records
+
+def read_binary_log_file(log_file: str) -> List[BinaryLogRecord]:
+    """
+        Reads the records from a binary log stream or a ring buffer file, the kind of the file is
+        detected from its header.
+    """
+    with open(log_file, 'rb') as lf:
+        magic = lf.read(len(BINARY_LOG_MAGIC))
+
+    if magic == BINARY_RING_MAGIC:
+        records = read_ring_buffer(log_file)
+    else:
+        records = list(read_binary_log(log_file))
+
+    return records
+
+
+BINARY_LOG_HANDLER: Optional[BinaryLogHandler] = None
+
+
+def get_binary_log_handler() -> Optional[BinaryLogHandler]:
+    """
+        Returns the binary log handler of the current process or None if binary logging is not running.
+    """
+    return BINARY_LOG_HANDLER
+
+def start_binary_logging(log_file: Optional[str] = None, ring_file: Optional[str] = None, ring_records: int = 4096,
+                         level: int = logging.NOTSET) -> BinaryLogHandler:
+    """
+        Starts writing the records of the root logger to a binary log stream, a ring buffer or both.
+
+        :param log_file: The path of the binary log stream, None for no stream.
+        :param ring_file: The path of the ring buffer file, None for no ring buffer.
+        :param ring_records: The number of records held by the ring buffer.
+        :param level: The level of the binary log handler.
+
+        :returns: The binary log handler of the current process.
+    """
+    global BINARY_LOG_HANDLER
+
+    stop_binary_logging()
+
+    from mojo.runtime.logcontrol import register_runtime_log_handler
+
+    handler = BinaryLogHandler(log_file=log_file, ring_file=ring_file, ring_records=ring_records, level=level)
+    logging.getLogger().addHandler(handler)
+    register_runtime_log_handler(handler)
+
+    BINARY_LOG_HANDLER = handler
+
+    return handler
+
+def stop_binary_logging():
+    """
+        Removes the binary log handler of the current process from the root logger and closes it.
+    """
+    global BINARY_LOG_HANDLER
+
+    if BINARY_LOG_HANDLER is not None:
+        handler = BINARY_LOG_HANDLER
+        BINARY_LOG_HANDLER = None
+
+        from mojo.runtime.logcontrol import unregister_runtime_log_handler
+
+        logging.getLogger().removeHandler(handler)
+        unregister_runtime_log_handler(handler)
+        handler.close()
+
+    return
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+        Decodes a binary log stream or ring buffer file and writes the records as text to stdout.
+    """
+    parser = argparse.ArgumentParser(prog="python -m mojo.runtime.binarylog",
+                                     description="Decodes a binary log stream or ring buffer file to text.")
+    parser.add_argument("log_file", help="The binary log stream or ring buffer file.")
+    parser.add_argument("--tail", type=int, default=None, help="Only write the last N records.")
+    args = parser.parse_args(argv)
+
+    records = read_binary_log_file(args.log_file)
+    if args.tail is not None:
+        records = records[-args.tail:] if args.tail > 0 else []
+
+    for record in records:
+        sys.stdout.write(format_binary_log_record(record))
+        sys.stdout.write("\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+.. module:: cliopts
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which generates the command line options for the overridable runtime variables
+               and applies the parsed options as a single batch of overrides.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+import argparse
+import functools
+
+from datetime import datetime
+
+from mojo.runtime.enumerations import OptionValueType
+from mojo.runtime.optionspecs import RUNTIME_OPTION_SPECS, RuntimeOptionSpec
+
+# NOTE: This module is imported by command line tools before the runtime is activated, so at module
+# scope it must only import from the standard library and the runtime modules that declare constants.
+# The runtime override machinery is imported when the parsed options are applied.
+
+CLI_OPTION_DEST_PREFIX = "mjr_"
+
+# The functions that parse the command line values of the option value types, the values of the
+# types that are not listed are passed through as strings and are normalized when they are applied.
+CLI_OPTION_PARSERS: Dict[OptionValueType, Callable[[str], Any]] = {
+    OptionValueType.DateTime: datetime.fromisoformat,
+    OptionValueType.LogLevel: str.upper
+}
+
+
+def add_runtime_options(parser: argparse.ArgumentParser, prefix: str = "", include: Optional[List[str]] = None,
+                        title: str = "runtime options") -> argparse._ArgumentGroup:
+    """
+        Adds the command line options for the overridable runtime variables to an argparse parser.
+        The options are added to their own argument group and store their values under a 'mjr_'
+        prefixed destination so they do not collide with the options of the tool.
+
+        :param parser: The parser to add the runtime options to.
+        :param prefix: A prefix for the option names, for example 'mjr-' produces '--mjr-job-name'.
+        :param include: An optional list of the variable names to generate options for.
+        :param title: The title of the argument group.
+
+        :returns: The argument group the options were added to.
+    """
+    group = parser.add_argument_group(title)
+
+    for spec in iter_runtime_option_specs(include=include):
+        group.add_argument(get_option_flag(spec.var_name, prefix=prefix), dest=get_option_dest(spec.var_name),
+                           type=get_option_parser(spec), choices=get_option_choices(spec), default=None,
+                           metavar=spec.metavar, help=spec.help)
+
+    return group
+
+def apply_parsed_overrides(parsed: Any) -> FrozenSet[str]:
+    """
+        Applies the runtime options that were provided on the command line as a single batch of
+        overrides.  Options that were not provided are ignored.
+
+        :param parsed: An argparse namespace or a dictionary of option destinations to values.
+
+        :returns: The set of the variable names whose values were changed.
+    """
+    if isinstance(parsed, argparse.Namespace):
+        parsed = vars(parsed)
+
+    overrides = collect_parsed_overrides(parsed)
+
+    changed = frozenset()
+    if len(overrides) > 0:
+        from mojo.runtime.optionoverrides import MOJO_RUNTIME_OPTION_OVERRIDES
+
+        changed = MOJO_RUNTIME_OPTION_OVERRIDES.apply_overrides(overrides)
+
+    return changed
+
+def collect_parsed_overrides(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """
+        Collects the values of the runtime options that were provided from a dictionary of option
+        destinations to values.
+
+        :returns: A dictionary of runtime variable names to override values.
+    """
+    overrides = {}
+
+    for spec in RUNTIME_OPTION_SPECS:
+        value = parsed.get(get_option_dest(spec.var_name), None)
+        if value is not None:
+            overrides[spec.var_name] = value
+
+    return overrides
+
+def get_option_choices(spec: RuntimeOptionSpec) -> Optional[List[str]]:
+    """
+        Returns the values that are accepted for a runtime option, or None if the option accepts any value.
+    """
+    choices = None
+
+    if spec.value_type == OptionValueType.LogLevel:
+        from mojo.xmods.xlogging.levels import LOG_LEVEL_NAMES
+        choices = list(LOG_LEVEL_NAMES)
+
+    return choices
+
+def get_option_dest(var_name: str) -> str:
+    """
+        Returns the parser destination for the option of a runtime variable, 'MJR_JOB_NAME' becomes 'mjr_job_name'.
+    """
+    dest = CLI_OPTION_DEST_PREFIX + _strip_variable_prefix(var_name).lower()
+    return dest
+
+def get_option_flag(var_name: str, prefix: str = "") -> str:
+    """
+        Returns the command line flag for the option of a runtime variable, 'MJR_JOB_NAME' becomes '--job-name'.
+    """
+    flag = "--" + prefix + _strip_variable_prefix(var_name).lower().replace("_", "-")
+    return flag
+
+def get_option_parser(spec: RuntimeOptionSpec) -> Callable[[str], Any]:
+    """
+        Returns the function that parses the command line value of a runtime option.
+    """
+    parser = CLI_OPTION_PARSERS.get(spec.value_type, str)
+    return parser
+
+def iter_runtime_option_specs(include: Optional[List[str]] = None):
+    """
+        Iterates the specs of the runtime options, optionally limited to a list of variable names.
+    """
+    for spec in RUNTIME_OPTION_SPECS:
+        if include is None or spec.var_name in include:
+            yield spec
+    return
+
+def runtime_options(prefix: str = "", include: Optional[List[str]] = None) -> Callable:
+    """
+        A decorator for a click command that adds the command line options for the overridable
+        runtime variables.  The options that were provided are applied as a single batch of
+        overrides before the command function is called, and are not passed to the function.
+
+        :param prefix: A prefix for the option names, for example 'mjr-' produces '--mjr-job-name'.
+        :param include: An optional list of the variable names to generate options for.
+    """
+    def decorator(command_func: Callable) -> Callable:
+
+        import click
+
+        @functools.wraps(command_func)
+        def command_wrapper(*args, **kwargs):
+            parsed = {}
+            for spec in RUNTIME_OPTION_SPECS:
+                dest = get_option_dest(spec.var_name)
+                if dest in kwargs:
+                    parsed[dest] = kwargs.pop(dest)
+
+            apply_parsed_overrides(parsed)
+
+            rtnval = command_func(*args, **kwargs)
+            return rtnval
+
+        # The click options are applied in reverse so they are listed in the help in spec order.
+        wrapped = command_wrapper
+        for spec in reversed(list(iter_runtime_option_specs(include=include))):
+            option = click.option(get_option_flag(spec.var_name, prefix=prefix), get_option_dest(spec.var_name),
+                                  type=_get_click_type(click, spec), default=None, metavar=spec.metavar,
+                                  help=spec.help)
+            wrapped = option(wrapped)
+
+        return wrapped
+
+    return decorator
+
+def _get_click_type(click: Any, spec: RuntimeOptionSpec) -> Any:
+    choices = get_option_choices(spec)
+    parser = get_option_parser(spec)
+    if choices is not None:
+        rtnval = click.Choice(choices, case_sensitive=False)
+    elif parser is str:
+        rtnval = click.STRING
+    else:
+        rtnval = click.FuncParamType(parser)
+    return rtnval
+
+def _strip_variable_prefix(var_name: str) -> str:
+    stripped = var_name
+    if stripped.startswith("MJR_"):
+        stripped = stripped[4:]
+    return stripped
@@ -26,3 +26,34 @@ class JobType(str, Enum):
     Service = "service"
     TestRun = "testrun"
     Orchestration = "orchestration"
+
+class LogCompression(str, Enum):
+    Auto = "auto"
+    Gzip = "gzip"
+    Zstd = "zstd"
+
+class OptionValueType(str, Enum):
+    ByteCount = "byte-count"
+    DateTime = "datetime"
+    LogLevel = "log-level"
+    Str = "str"
+    StrList = "str-list"
+
+class OutputStripingPolicy(str, Enum):
+    FreeSpace = "free-space"
+    JobHash = "job-hash"
+    RoundRobin = "round-robin"
+
+class OutputLayout(str, Enum):
+    Flat = "flat"
+    Sharded = "sharded"
+
+class ShardMergeMode(str, Enum):
+    Copy = "copy"
+    Manifest = "manifest"
+    Symlink = "symlink"
+
+class WatchdogPolicy(str, Enum):
+    Log = "log"
+    Dump = "dump"
+    Abort = "abort"
@@ -0,0 +1,25 @@
+"""
+.. module:: exceptions
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the exceptions that are raised by the runtime.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+class OutputQuotaExceededError(Exception):
+    """
+        Raised before a write to the output directory that would cause the bytes written
+        to the output directory to exceed the hard output quota.
+    """
+
+
+class SharedStorageTimeoutError(TimeoutError):
+    """
+        Raised when an operation on a shared storage path did not complete within its timeout
+        after all of the retry attempts were exhausted.
+    """
@@ -0,0 +1,455 @@
+"""
+.. module:: extensionindex
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`ExtensionIndex` object which is used to find the
+               factories provided by extension modules without importing the extension modules.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import tempfile
+import threading
+
+EXTENSION_INDEX_FORMAT_VERSION = 1
+
+
+class FactoryEntry(NamedTuple):
+    """
+        An entry in the extension index for a class that is defined at the top level of a module.
+    """
+    name: str
+    module: str
+    bases: Tuple[str, ...]
+
+    @property
+    def qualified_name(self) -> str:
+        rtnval = "{}.{}".format(self.module, self.name)
+        return rtnval
+
+
+class ExtensionIndex:
+    """
+        The :class:`ExtensionIndex` maps the factory classes defined in a set of extension modules to
+        the modules that define them.  The index is built by parsing the module sources, so building
+        the index does not import any of the extension modules.  An extension module is imported only
+        when one of its factories is resolved.
+
+        The parsed entries of each module file are cached along with the size and modification time of
+        the file, so after the first build only the files that changed are parsed again.
+    """
+
+    def __init__(self, module_names: Sequence[str], cache_file: Optional[str] = None):
+        self._module_names = list(module_names)
+        self._cache_file = cache_file
+
+        self._entries: List[FactoryEntry] = []
+        self._entries_by_name: Dict[str, List[FactoryEntry]] = {}
+        self._entries_by_base: Dict[str, List[FactoryEntry]] = {}
+
+        self._parsed_file_count = 0
+        self._built = False
+        self._lock = threading.Lock()
+        return
+
+    @property
+    def module_names(self) -> List[str]:
+        return list(self._module_names)
+
+    @property
+    def parsed_file_count(self) -> int:
+        """
+            The number of module files that were parsed when the index was built, files that were
+            loaded from the cache are not counted.
+        """
+        return self._parsed_file_count
+
+    def build(self):
+        """
+            Builds the index, loading the cached entries of the module files that have not changed.
+        """
+        with self._lock:
+            cached_files = self._load_cache()
+
+            file_records = {}
+            self._parsed_file_count = 0
+
+            for module_name, module_file in iter_module_files(self._module_names):
+                stat_info = os.stat(module_file)
+                fingerprint = [stat_info.st_size, stat_info.st_mtime_ns]
+
+                cached = cached_files.get(module_file, None)
+                if cached is not None and cached["module"] == module_name and cached["fingerprint"] == fingerprint:
+                    classes = cached["classes"]
+                else:
+                    classes = parse_module_classes(module_file)
+                    self._parsed_file_count += 1
+
+                file_records[module_file] = {
+                    "module": module_name,
+                    "fingerprint": fingerprint,
+                    "classes": classes
+                }
+
+            self._index_file_records(file_records)
+
+            if self._parsed_file_count > 0 or len(file_records) != len(cached_files):
+                self._store_cache(file_records)
+
+            self._built = True
+
+        return
+
+    def find_factories(self, base_type: Union[str, type]) -> List[FactoryEntry]:
+        """
+            Finds the factory classes that derive from a base type, directly or through other classes
+            in the index.  The base type is matched by class name.
+
+            :param base_type: The base type or the name of the base type.
+
+            :returns: The entries for the derived factory classes.
+        """
+        self._ensure_built()
+
+        base_name = base_type if isinstance(base_type, str) else base_type.__name__
+
+        found = []
+        found_names: Set[str] = set()
+
+        pending = [base_name]
+        while len(pending) > 0:
+            current = pending.pop()
+            for entry in self._entries_by_base.get(current, []):
+                if entry.qualified_name not in found_names:
+                    found_names.add(entry.qualified_name)
+                    found.append(entry)
+                    pending.append(entry.name)
+
+        return found
+
+    def find_factory(self, name: str) -> Optional[FactoryEntry]:
+        """
+            Finds the entry for a factory class by its class name or fully qualified name.
+        """
+        self._ensure_built()
+
+        entry = None
+
+        if "." in name:
+            module_name, _, class_name = name.rpartition(".")
+            for candidate in self._entries_by_name.get(class_name, []):
+                if candidate.module == module_name:
+                    entry = candidate
+                    break
+        else:
+            candidates = self._entries_by_name.get(name, [])
+            if len(candidates) > 0:
+                entry = candidates[0]
+
+        return entry
+
+    def load_factories(self, base_type: Union[str, type]) -> List[type]:
+        """
+            Imports the modules that contain factories deriving from a base type and returns the
+            factory classes.  Factory classes that are not subclasses of the base type once imported
+            are skipped, which guards against name collisions between unrelated base classes.
+        """
+        factories = []
+
+        for entry in self.find_factories(base_type):
+            factory = resolve_factory_entry(entry)
+            if isinstance(base_type, type) and not (isinstance(factory, type) and issubclass(factory, base_type)):
+                continue
+            factories.append(factory)
+
+        return factories
+
+    def resolve_factory(self, name: str) -> Any:
+        """
+            Imports the module that defines a factory and returns the factory.
+
+            :param name: The class name or fully qualified name of the factory.
+        """
+        entry = self.find_factory(name)
+        if entry is None:
+            errmsg = "Unable to find an extension factory named '{}'. modules={}".format(name, self._module_names)
+            raise LookupError(errmsg)
+
+        factory = resolve_factory_entry(entry)
+
+        return factory
+
+    def _ensure_built(self):
+        if not self._built:
+            self.build()
+        return
+
+    def _index_file_records(self, file_records: Dict[str, dict]):
+
+        entries = []
+        entries_by_name = {}
+        entries_by_base = {}
+
+        for module_file in sorted(file_records.keys()):
+            record = file_records[module_file]
+            for class_name, bases in record["classes"]:
+                entry = FactoryEntry(class_name, record["module"], tuple(bases))
+                entries.append(entry)
+                entries_by_name.setdefault(class_name, []).append(entry)
+                for base in bases:
+                    entries_by_base.setdefault(base.rpartition(".")[2], []).append(entry)
+
+        self._entries = entries
+        self._entries_by_name = entries_by_name
+        self._entries_by_base = entries_by_base
+
+        return
+
+    def _load_cache(self) -> Dict[str, dict]:
+        cached_files = {}
+
+        if self._cache_file is not None and os.path.exists(self._cache_file):
+            try:
+                with open(self._cache_file, 'r') as cf:
+                    cache_data = json.load(cf)
+                if cache_data.get("format") == EXTENSION_INDEX_FORMAT_VERSION and cache_data.get("modules") == self._module_names:
+                    cached_files = cache_data.get("files", {})
+            except (OSError, ValueError) as err:
+                logger = logging.getLogger()
+                logger.debug("Ignoring unreadable extension index cache '%s'. error=%s", self._cache_file, err)
+
+        return cached_files
+
+    def _store_cache(self, file_records: Dict[str, dict]):
+
+        if self._cache_file is not None:
+            cache_data = {
+                "format": EXTENSION_INDEX_FORMAT_VERSION,
+                "modules": self._module_names,
+                "files": file_records
+            }
+
+            cache_dir = os.path.dirname(self._cache_file)
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(prefix=".extension-index-", suffix=".json", dir=cache_dir)
+                with os.fdopen(fd, 'w') as cf:
+                    json.dump(cache_data, cf)
+                os.replace(temp_path, self._cache_file)
+            except OSError as err:
+                logger = logging.getLogger()
+                logger.debug("Unable to write the extension index cache '%s'. error=%s", self._cache_file, err)
+
+        return
+
+
+EXTENSION_MODULES: List[str] = []
+EXTENSION_INDEX: Optional[ExtensionIndex] = None
+EXTENSION_INDEX_LOCK = threading.Lock()
+
+
+def configure_extension_modules(extension_modules: Union[str, Sequence[str], None]):
+    """
+        Sets the extension modules that the extension index is built from.  The index itself is
+        not built until a factory is first requested.
+
+        :param extension_modules: A comma separated string or a list of module names.
+    """
+    global EXTENSION_MODULES
+    global EXTENSION_INDEX
+
+    if extension_modules is None:
+        module_names = []
+    elif isinstance(extension_modules, str):
+        module_names = [mname.strip() for mname in extension_modules.split(",") if len(mname.strip()) > 0]
+    else:
+        module_names = list(extension_modules)
+
+    with EXTENSION_INDEX_LOCK:
+        EXTENSION_MODULES = module_names
+        EXTENSION_INDEX = None
+
+    return
+
+def get_extension_index() -> ExtensionIndex:
+    """
+        Returns the extension index for the configured extension modules.  The index is cached in
+        the runtime cache directory.
+    """
+    global EXTENSION_INDEX
+
+    with EXTENSION_INDEX_LOCK:
+        if EXTENSION_INDEX is None:
+            from mojo.runtime.paths import get_directory_for_cached_files
+
+            modules_key = hashlib.sha1(",".join(EXTENSION_MODULES).encode("utf-8")).hexdigest()[:16]
+            cache_file = os.path.join(get_directory_for_cached_files(), "extension-index-{}.json".format(modules_key))
+
+            EXTENSION_INDEX = ExtensionIndex(EXTENSION_MODULES, cache_file=cache_file)
+
+    return EXTENSION_INDEX
+
+def get_extension_modules() -> List[str]:
+    """
+        Returns the names of the configured extension modules.  The modules are not imported by the
+        runtime, code that needs the factories of the extensions should use :func:`load_extension_factories`
+        or :func:`resolve_extension_factory` so only the modules that define the factories are imported.
+    """
+    return list(EXTENSION_MODULES)
+
+def iter_module_files(module_names: Sequence[str]):
+    """
+        Iterates the (module name, module file) pairs of the modules and the modules of the packages
+        in a list of module names, without importing the modules.
+    """
+    for module_name in module_names:
+        module_file, search_dirs = _locate_module(module_name)
+        if module_file is not None:
+            yield module_name, module_file
+
+        for search_dir in search_dirs:
+            for root, dirnames, filenames in os.walk(search_dir):
+                dirnames[:] = sorted([dname for dname in dirnames if not dname.startswith((".", "__"))])
+
+                rel_dir = os.path.relpath(root, search_dir)
+                package_name = module_name
+                if rel_dir != ".":
+                    package_name = "{}.{}".format(module_name, rel_dir.replace(os.sep, "."))
+
+                for fname in sorted(filenames):
+                    fbase, fext = os.path.splitext(fname)
+                    if fext != ".py":
+                        continue
+                    if fbase == "__init__":
+                        if rel_dir != ".":
+                            yield package_name, os.path.join(root, fname)
+                    else:
+                        yield "{}.{}".format(package_name, fbase), os.path.join(root, fname)
+
+    return
+
+def load_extension_factories(base_type: Union[str, type]) -> List[type]:
+    """
+        Returns the factory classes of the configured extension modules that derive from a base type.
+        Only the modules that define the factories are imported.
+
+        :param base_type: The base type or the name of the base type.
+    """
+    factories = get_extension_index().load_factories(base_type)
+    return factories
+
+def parse_module_classes(module_file: str) -> List[Tuple[str, List[str]]]:
+    """
+        Parses a module file and returns the name and base class names of each class defined at
+        the top level of the module.
+    """
+    classes = []
+
+    with open(module_file, 'rb') as mf:
+        source = mf.read()
+
+    try:
+        tree = ast.parse(source, filename=module_file)
+    except SyntaxError as serr:
+        logger = logging.getLogger()
+        logger.warning("Unable to index extension module '%s'. error=%s", module_file, serr)
+        return classes
+
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            bases = []
+            for base in node.bases:
+                base_name = _get_expression_name(base)
+                if base_name is not None:
+                    bases.append(base_name)
+            classes.append((node.name, bases))
+
+    return classes
+
+def resolve_extension_factory(name: str) -> Any:
+    """
+        Returns a factory of the configured extension modules, importing only the module that defines it.
+
+        :param name: The class name or fully qualified name of the factory.
+    """
+    factory = get_extension_index().resolve_factory(name)
+    return factory
+
+def resolve_factory_entry(entry: FactoryEntry) -> Any:
+    """
+        Imports the module of an index entry and returns the factory the entry refers to.
+    """
+    module = importlib.import_module(entry.module)
+    factory = getattr(module, entry.name)
+    return factory
+
+def _get_expression_name(node: ast.AST) -> Optional[str]:
+    name = None
+
+    if isinstance(node, ast.Name):
+        name = node.id
+    elif isinstance(node, ast.Attribute):
+        prefix = _get_expression_name(node.value)
+        if prefix is not None:
+            name = "{}.{}".format(prefix, node.attr)
+    elif isinstance(node, ast.Subscript):
+        name = _get_expression_name(node.value)
+
+    return name
+
+def _locate_module(module_name: str) -> Tuple[Optional[str], List[str]]:
+    """
+        Locates the source file and package directories for a module name.  The parent packages are
+        found by walking the search locations of the top level package, so locating a dotted module
+        name does not import the parent packages.
+    """
+    name_parts = module_name.split(".")
+
+    top_spec = importlib.util.find_spec(name_parts[0])
+    if top_spec is None:
+        errmsg = "Unable to locate the extension module '{}'.".format(module_name)
+        raise ModuleNotFoundError(errmsg)
+
+    origin = top_spec.origin if top_spec.has_location else None
+    search_dirs = list(top_spec.submodule_search_locations or [])
+
+    for part in name_parts[1:]:
+        next_origin = None
+        next_dirs = []
+        for search_dir in search_dirs:
+            package_dir = os.path.join(search_dir, part)
+            module_file = os.path.join(search_dir, part + ".py")
+            if os.path.isdir(package_dir):
+                next_dirs.append(package_dir)
+                init_file = os.path.join(package_dir, "__init__.py")
+                if next_origin is None and os.path.exists(init_file):
+                    next_origin = init_file
+            elif next_origin is None and os.path.exists(module_file):
+                next_origin = module_file
+
+        if next_origin is None and len(next_dirs) == 0:
+            errmsg = "Unable to locate the extension module '{}'.".format(module_name)
+            raise ModuleNotFoundError(errmsg)
+
+        origin = next_origin
+        search_dirs = next_dirs
+
+    if origin is not None and not origin.endswith(".py"):
+        origin = None
+
+    return origin, search_dirs
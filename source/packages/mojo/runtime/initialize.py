@@ -24,7 +24,7 @@ class MOJO_RUNTIME_STATE:
 
 def initialize_runtime(*, name: Optional[str]=None, home_dir: Optional[str]=None, settings_file: Optional[str]=None,
                        extension_modules: Optional[str]=None, logger_name: Optional[str]=None, default_configuration: dict=None,
-                       service_name: Optional[str]=None, **other):
+                       service_name: Optional[str]=None, use_extension_index: bool=False, **other):
 
     # =======================================================================================
     # The way we start up the test framework and the order which things come up in is a very
@@ -37,9 +37,25 @@ def initialize_runtime(*, name: Optional[str]=None, home_dir: Optional[str]=None
 
     MOJO_RUNTIME_STATE.INITIALIZED = True
 
-    establish_runtime_settings(name=name, home_dir=home_dir, settings_file=settings_file, extension_modules=extension_modules,
-                               logger_name=logger_name, default_configuration=default_configuration, service_name=service_name, **other)
-    
+    # The extension modules are handed to the configuration settings, which import them so the
+    # factory lookups of the configuration and extension packages can find their factories.  When
+    # `use_extension_index` is set, the modules are not handed to the configuration settings and
+    # are only imported when a factory is first requested through `load_extension_factories`
+    # or `resolve_extension_factory`.
+    config_extension_modules = extension_modules
+    if use_extension_index:
+        config_extension_modules = None
+
+    establish_runtime_settings(name=name, home_dir=home_dir, settings_file=settings_file,
+                               extension_modules=config_extension_modules, logger_name=logger_name,
+                               default_configuration=default_configuration, service_name=service_name, **other)
+
+    # The names of the extension modules are always recorded for the extension index, the index
+    # is not built until a factory is first requested.
+    from mojo.runtime.extensionindex import configure_extension_modules
+
+    configure_extension_modules(extension_modules)
+
     from mojo.runtime.runtimevariables import resolve_runtime_variables
 
     # The runtime variables can tell us where to find extensions, so we must resolve the runtime
@@ -4,103 +4,255 @@ __copyright__ = "Copyright 2023, Myron W Walker"
 __credits__ = []
 
 
-from typing import Dict
+# pylint: disable=global-statement
+
+from typing import Any, Dict, Optional, Tuple
 
 from mojo.collections.contextpaths import ContextPaths
 from mojo.collections.wellknown import ContextSingleton
 
-def get_job_info() -> Dict[str, str]:
+from mojo.runtime.runtimecontext import get_current_runtime_context
+from mojo.runtime.runtimevariables import get_runtime_info_version
+
+
+class _FrozenInfo:
+    """
+        Base for the immutable job and pipeline information snapshots.  The fields are declared
+        in the `__slots__` of the derived classes and are assigned once by the constructor.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name, None))
+        return
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.__slots__:
+            raise KeyError(name)
+        rtnval = getattr(self, name)
+        return rtnval
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("'{}' objects are immutable.".format(type(self).__name__))
+
+    def __delattr__(self, name: str):
+        raise AttributeError("'{}' objects are immutable.".format(type(self).__name__))
+
+    def __eq__(self, other: Any) -> bool:
+        rtnval = type(self) is type(other) and self.as_tuple() == other.as_tuple()
+        return rtnval
+
+    def __hash__(self) -> int:
+        rtnval = hash(self.as_tuple())
+        return rtnval
+
+    def __repr__(self) -> str:
+        field_list = ", ".join(["{}={!r}".format(name, getattr(self, name)) for name in self.__slots__])
+        rtnval = "{}({})".format(type(self).__name__, field_list)
+        return rtnval
+
+    def as_dict(self) -> Dict[str, Any]:
+        rtnval = { name: getattr(self, name) for name in self.__slots__ }
+        return rtnval
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        rtnval = tuple([getattr(self, name) for name in self.__slots__])
+        return rtnval
+
+
+class JobInfo(_FrozenInfo):
+    """
+        An immutable snapshot of the information about the current job.
+    """
+
+    __slots__ = ("id", "initiator", "label", "name", "owner", "type", "venue")
+
+
+class PipelineInfo(_FrozenInfo):
+    """
+        An immutable snapshot of the information about the current pipeline.
+    """
+
+    __slots__ = ("id", "instance", "name")
+
+
+# The snapshots are cached along with the runtime info version they were built for, the version
+# is bumped whenever a job or pipeline field is changed so a stale snapshot is rebuilt on next use.
+JOB_INFO_SNAPSHOT: Optional[Tuple[int, JobInfo]] = None
+PIPELINE_INFO_SNAPSHOT: Optional[Tuple[int, PipelineInfo]] = None
+
+
+def _build_job_info() -> JobInfo:
 
     ctx = ContextSingleton()
 
-    rtnval = ctx.lookup(ContextPaths.JOB_INFO)
+    job_info = JobInfo(
+        id=ctx.lookup(ContextPaths.JOB_ID, default=None),
+        initiator=ctx.lookup(ContextPaths.JOB_INITIATOR, default=None),
+        label=ctx.lookup(ContextPaths.JOB_LABEL, default=None),
+        name=ctx.lookup(ContextPaths.JOB_NAME, default=None),
+        owner=ctx.lookup(ContextPaths.JOB_OWNER, default=None),
+        type=ctx.lookup(ContextPaths.JOB_TYPE, default=None),
+        venue=ctx.lookup(ContextPaths.JOB_VENUE, default=None)
+    )
 
-    return rtnval
+    return job_info
 
-def get_job_id() -> str:
+def _build_pipeline_info() -> PipelineInfo:
 
     ctx = ContextSingleton()
 
-    rtnval = ctx.lookup(ContextPaths.JOB_ID)
+    pipeline_info = PipelineInfo(
+        id=ctx.lookup(ContextPaths.PIPELINE_ID, default=None),
+        instance=ctx.lookup(ContextPaths.PIPELINE_INSTANCE, default=None),
+        name=ctx.lookup(ContextPaths.PIPELINE_NAME, default=None)
+    )
+
+    return pipeline_info
+
+
+def get_job_info() -> JobInfo:
+    """
+        Returns the :class:`JobInfo` snapshot for the current job.  The snapshot is built once and
+        is only rebuilt after a job field has been changed.
+    """
+    global JOB_INFO_SNAPSHOT
+
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.get_job_info()
+    else:
+        version = get_runtime_info_version()
+
+        snapshot = JOB_INFO_SNAPSHOT
+        if snapshot is None or snapshot[0] != version:
+            snapshot = (version, _build_job_info())
+            JOB_INFO_SNAPSHOT = snapshot
+
+        rtnval = snapshot[1]
 
     return rtnval
 
-def get_job_initiator() -> str:
+def get_job_id() -> str:
 
-    ctx = ContextSingleton()
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.job_id
+    else:
+        rtnval = get_job_info().id
+
+    return rtnval
+
+def get_job_initiator() -> str:
 
-    rtnval = ctx.lookup(ContextPaths.JOB_INITIATOR)
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.job_initiator
+    else:
+        rtnval = get_job_info().initiator
 
     return rtnval
 
 def get_job_label() -> str:
 
-    ctx = ContextSingleton()
-
-    rtnval = ctx.lookup(ContextPaths.JOB_LABEL)
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.job_label
+    else:
+        rtnval = get_job_info().label
 
     return rtnval
 
 def get_job_name() -> str:
 
-    ctx = ContextSingleton()
-
-    rtnval = ctx.lookup(ContextPaths.JOB_NAME)
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.job_name
+    else:
+        rtnval = get_job_info().name
 
     return rtnval
 
 def get_job_owner() -> str:
 
-    ctx = ContextSingleton()
-
-    rtnval = ctx.lookup(ContextPaths.JOB_OWNER)
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.job_owner
+    else:
+        rtnval = get_job_info().owner
 
     return rtnval
 
 def get_job_type() -> str:
 
-    ctx = ContextSingleton()
-
-    rtnval = ctx.lookup(ContextPaths.JOB_TYPE)
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.job_type
+    else:
+        rtnval = get_job_info().type
 
     return rtnval
 
 def get_job_venue() -> str:
 
-    ctx = ContextSingleton()
-
-    rtnval = ctx.lookup(ContextPaths.JOB_VENUE)
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.job_venue
+    else:
+        rtnval = get_job_info().venue
 
     return rtnval
 
-def get_pipeline_info() -> Dict[str, str]:
+def get_pipeline_info() -> PipelineInfo:
+    """
+        Returns the :class:`PipelineInfo` snapshot for the current pipeline.  The snapshot is built once and
+        is only rebuilt after a pipeline field has been changed.
+    """
+    global PIPELINE_INFO_SNAPSHOT
 
-    ctx = ContextSingleton()
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.get_pipeline_info()
+    else:
+        version = get_runtime_info_version()
 
-    rtnval = ctx.lookup(ContextPaths.PIPELINE_INFO)
+        snapshot = PIPELINE_INFO_SNAPSHOT
+        if snapshot is None or snapshot[0] != version:
+            snapshot = (version, _build_pipeline_info())
+            PIPELINE_INFO_SNAPSHOT = snapshot
+
+        rtnval = snapshot[1]
 
     return rtnval
 
 def get_pipeline_id() -> str:
 
-    ctx = ContextSingleton()
-
-    rtnval = ctx.lookup(ContextPaths.PIPELINE_ID)
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.pipeline_id
+    else:
+        rtnval = get_pipeline_info().id
 
     return rtnval
 
 def get_pipeline_instance() -> str:
 
-    ctx = ContextSingleton()
-
-    rtnval = ctx.lookup(ContextPaths.PIPELINE_INSTANCE)
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.pipeline_instance
+    else:
+        rtnval = get_pipeline_info().instance
 
     return rtnval
 
 def get_pipeline_name() -> str:
 
-    ctx = ContextSingleton()
-
-    rtnval = ctx.lookup(ContextPaths.PIPELINE_NAME)
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.pipeline_name
+    else:
+        rtnval = get_pipeline_info().name
 
     return rtnval
\ No newline at end of file
@@ -0,0 +1,298 @@
+"""
+.. module:: logcontrol
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains functions that are used to find, flush, reconfigure and tear
+               down the logging handlers that are installed by the runtime.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import logging
+import logging.handlers
+import threading
+
+DEFERRED_OPEN_HANDLER_TYPES: Dict[type, type] = {}
+
+# The handlers that were installed by the runtime activation and the runtime features, as opposed
+# to the handlers installed by the application or a test harness.
+RUNTIME_LOG_HANDLERS: List[logging.Handler] = []
+RUNTIME_LOG_HANDLERS_LOCK = threading.Lock()
+
+
+def apply_log_levels(console_level: Optional[Union[int, str]] = None, file_level: Optional[Union[int, str]] = None,
+                     handlers: Optional[Iterable[logging.Handler]] = None) -> int:
+    """
+        Applies new logging levels to the handlers that were installed by the runtime.  The console
+        level is applied to the stream handlers that write to a console and the file level is applied
+        to the file handlers and the binary log handler.  Handlers installed by the application are
+        left alone.  When the root logger would filter out the records for the more verbose level, the
+        level of the root logger is lowered, it is never raised.
+
+        :param console_level: The level name or number for the console handlers.
+        :param file_level: The level name or number for the file handlers.
+        :param handlers: The handlers to apply the levels to, defaults to the handlers registered with
+                         :func:`register_runtime_log_handler`.
+
+        :returns: The number of handlers whose level was set.
+    """
+    from mojo.runtime.binarylog import BinaryLogHandler
+
+    console_levelno = resolve_log_level(console_level) if console_level is not None else None
+    file_levelno = resolve_log_level(file_level) if file_level is not None else None
+
+    if handlers is None:
+        handlers = get_runtime_log_handlers()
+
+    applied_count = 0
+
+    for handler in handlers:
+        if isinstance(handler, (logging.FileHandler, BinaryLogHandler)):
+            if file_levelno is not None:
+                handler.setLevel(file_levelno)
+                applied_count += 1
+        elif isinstance(handler, logging.StreamHandler):
+            if console_levelno is not None:
+                handler.setLevel(console_levelno)
+                applied_count += 1
+
+    levels = [levelno for levelno in (console_levelno, file_levelno) if levelno is not None]
+    if len(levels) > 0:
+        root_logger = logging.getLogger()
+        if root_logger.getEffectiveLevel() > min(levels):
+            root_logger.setLevel(min(levels))
+
+    return applied_count
+
+def capture_log_handlers() -> Dict[str, List[logging.Handler]]:
+    """
+        Captures the handlers that are attached to the root logger and to every named logger.  The
+        snapshot is used by :func:`teardown_log_handlers` to find the handlers that were added after
+        the snapshot was taken.
+
+        :returns: A dictionary of logger names to the list of handlers attached to the logger.
+    """
+    snapshot = {}
+
+    for logger in iter_loggers():
+        snapshot[logger.name] = list(logger.handlers)
+
+    return snapshot
+
+def deferred_open_handler_type(handler_type: type) -> type:
+    """
+        Returns a subclass of a file handler type whose instances are created without opening their
+        files.  The files are opened by :func:`open_log_file` or by the first record that
+        is emitted to the handler.
+
+        :param handler_type: The :class:`logging.FileHandler` type to defer the file opening of.
+
+        :returns: The deferred open subclass of the handler type.
+    """
+    deferred_type = DEFERRED_OPEN_HANDLER_TYPES.get(handler_type)
+
+    if deferred_type is None:
+
+        def __init__(self, *args, **kwargs):
+            kwargs["delay"] = True
+            handler_type.__init__(self, *args, **kwargs)
+            return
+
+        deferred_type = type("DeferredOpen" + handler_type.__name__, (handler_type,), { "__init__": __init__ })
+        DEFERRED_OPEN_HANDLER_TYPES[handler_type] = deferred_type
+
+    return deferred_type
+
+def find_deferred_log_handlers() -> List[logging.FileHandler]:
+    """
+        Returns the file handlers that are installed but have not opened their files yet.  The files
+        can be opened concurrently by calling :func:`open_log_file` for each handler.
+    """
+    deferred_handlers = []
+
+    for _, handler in iter_log_handlers():
+        if isinstance(handler, logging.FileHandler) and handler.stream is None and handler not in deferred_handlers:
+            deferred_handlers.append(handler)
+
+    return deferred_handlers
+
+def find_added_log_handlers(snapshot: Dict[str, List[logging.Handler]]) -> List[Tuple[logging.Logger, logging.Handler]]:
+    """
+        Returns the (logger, handler) pairs of the handlers that were attached to the loggers after
+        the snapshot was taken.
+
+        :param snapshot: A snapshot of the handlers that was taken with :func:`capture_log_handlers`.
+    """
+    added = []
+
+    for logger, handler in iter_log_handlers():
+        previous_handlers = snapshot.get(logger.name, [])
+        if handler not in previous_handlers:
+            added.append((logger, handler))
+
+    return added
+
+def flush_log_handlers():
+    """
+        Flushes every handler attached to the root logger and to the named loggers.
+    """
+    for _, handler in iter_log_handlers():
+        try:
+            handler.flush()
+        except Exception: # pylint: disable=broad-except
+            pass
+
+    return
+
+def get_runtime_log_handlers() -> List[logging.Handler]:
+    """
+        Returns the handlers that were installed by the runtime activation and the runtime features.
+    """
+    with RUNTIME_LOG_HANDLERS_LOCK:
+        handlers = list(RUNTIME_LOG_HANDLERS)
+    return handlers
+
+def iter_log_handlers() -> Iterator[Tuple[logging.Logger, logging.Handler]]:
+    """
+        Iterates the (logger, handler) pairs for the handlers attached to the root logger and to
+        every named logger.
+    """
+    for logger in iter_loggers():
+        for handler in list(logger.handlers):
+            yield logger, handler
+
+    return
+
+def iter_loggers() -> Iterator[logging.Logger]:
+    """
+        Iterates the root logger and every named logger that has been created.
+    """
+    root_logger = logging.getLogger()
+    yield root_logger
+
+    logger_dict = dict(root_logger.manager.loggerDict)
+    for logger in logger_dict.values():
+        if isinstance(logger, logging.Logger):
+            yield logger
+
+    return
+
+def open_log_file(handler: logging.FileHandler):
+    """
+        Opens the file of a file handler that was created without opening its file.  The file is
+        opened while holding the handler lock, so a record emitted at the same time is not lost.
+    """
+    handler.acquire()
+    try:
+        if handler.stream is None:
+            handler.stream = handler._open() # pylint: disable=protected-access
+    finally:
+        handler.release()
+
+    return
+
+def register_runtime_log_handler(handler: logging.Handler):
+    """
+        Registers a handler that was installed by the runtime activation or a runtime feature, so the
+        reloaded log levels are applied to it.
+    """
+    with RUNTIME_LOG_HANDLERS_LOCK:
+        if handler not in RUNTIME_LOG_HANDLERS:
+            RUNTIME_LOG_HANDLERS.append(handler)
+    return
+
+def reopen_log_files(rotate: bool = False) -> int:
+    """
+        Reopens the files of the file handlers, so a log file that was moved away by an external log
+        rotation is recreated.  Each handler is flushed and reopened while holding the handler lock,
+        so no records are lost while the file is swapped.
+
+        :param rotate: Roll over the rotating file handlers instead of reopening their files.
+
+        :returns: The number of handlers whose files were reopened or rotated.
+    """
+    reopen_count = 0
+
+    for _, handler in iter_log_handlers():
+        if not isinstance(handler, logging.FileHandler):
+            continue
+
+        handler.acquire()
+        try:
+            if rotate and isinstance(handler, logging.handlers.BaseRotatingHandler):
+                handler.doRollover()
+                reopen_count += 1
+            elif handler.stream is not None:
+                handler.stream.flush()
+                handler.stream.close()
+                handler.stream = handler._open() # pylint: disable=protected-access
+                reopen_count += 1
+        finally:
+            handler.release()
+
+    return reopen_count
+
+def resolve_log_level(level: Union[int, str]) -> int:
+    """
+        Resolves a logging level name, such as 'DEBUG', or a level number to a level number.
+    """
+    if isinstance(level, int):
+        return level
+
+    levelno = logging.getLevelName(str(level).strip().upper())
+    if not isinstance(levelno, int):
+        errmsg = "Unknown logging level. level={}".format(level)
+        raise ValueError(errmsg)
+
+    return levelno
+
+def teardown_log_handlers(snapshot: Dict[str, List[logging.Handler]], handlers: Optional[Iterable[logging.Handler]] = None) -> int:
+    """
+        Removes and closes the runtime handlers that were attached to the loggers after the snapshot
+        was taken.  Handlers that were added by the application or a test harness after the snapshot
+        are left in place.
+
+        :param snapshot: A snapshot of the handlers that was taken with :func:`capture_log_handlers`.
+        :param handlers: The handlers that may be torn down, defaults to the handlers registered with
+                         :func:`register_runtime_log_handler`.
+
+        :returns: The number of handlers that were torn down.
+    """
+    if handlers is None:
+        handlers = get_runtime_log_handlers()
+    else:
+        handlers = list(handlers)
+
+    teardown_count = 0
+
+    for logger, handler in find_added_log_handlers(snapshot):
+        if handler not in handlers:
+            continue
+
+        logger.removeHandler(handler)
+        unregister_runtime_log_handler(handler)
+
+        try:
+            handler.flush()
+            handler.close()
+        except Exception: # pylint: disable=broad-except
+            pass
+
+        teardown_count += 1
+
+    return teardown_count
+
+def unregister_runtime_log_handler(handler: logging.Handler):
+    """
+        Removes a handler from the handlers registered with :func:`register_runtime_log_handler`.
+    """
+    with RUNTIME_LOG_HANDLERS_LOCK:
+        if handler in RUNTIME_LOG_HANDLERS:
+            RUNTIME_LOG_HANDLERS.remove(handler)
+    return
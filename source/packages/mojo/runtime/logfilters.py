@@ -0,0 +1,297 @@
+"""
+.. module:: logfilters
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the logging filters that are used to rate limit and deduplicate
+               high volume logging so a flood of identical messages does not rotate away the useful
+               records in the log files.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import Dict, List, Optional, Tuple
+
+import logging
+import threading
+import time
+
+# The attribute that marks the summary records emitted by the filters so they are never filtered.
+SUMMARY_RECORD_ATTRIBUTE = "mjr_suppression_summary"
+
+# The attribute that caches the decisions of the filters on a record.  Logging calls the filters of
+# each handler a record reaches, a filter that is shared by several handlers makes its decision the
+# first time it sees the record and the other handlers reuse it.
+DECISION_RECORD_ATTRIBUTE = "mjr_filter_decisions"
+
+RATE_LIMIT_MAX_KEYS = 10000
+
+
+def emit_summary_record(name: str, levelno: int, msg: str, *args):
+    """
+        Emits a summary record through the named logger.  The record is marked so it passes through
+        the rate limit and duplicate filters.
+    """
+    logger = logging.getLogger(name)
+    record = logger.makeRecord(name, levelno, "(logfilters)", 0, msg, args, None)
+    setattr(record, SUMMARY_RECORD_ATTRIBUTE, True)
+    logger.handle(record)
+    return
+
+
+class SharedDecisionFilter(logging.Filter):
+    """
+        Base class for the filters that keep state across records.  The decision for a record is made
+        once by :meth:`decide` and cached on the record, so sharing the filter between handlers does
+        not count the record once per handler.
+    """
+
+    def __init__(self, exempt_level: int = logging.CRITICAL):
+        super().__init__()
+        self._exempt_level = exempt_level
+        return
+
+    def decide(self, record: logging.LogRecord) -> bool:
+        raise NotImplementedError("SharedDecisionFilter.decide must be overridden.")
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self._exempt_level or getattr(record, SUMMARY_RECORD_ATTRIBUTE, False):
+            return True
+
+        decisions = record.__dict__.get(DECISION_RECORD_ATTRIBUTE)
+        if decisions is None:
+            decisions = {}
+            record.__dict__[DECISION_RECORD_ATTRIBUTE] = decisions
+
+        allowed = decisions.get(id(self))
+        if allowed is None:
+            allowed = self.decide(record)
+            decisions[id(self)] = allowed
+
+        return allowed
+
+
+class RateLimitFilter(SharedDecisionFilter):
+    """
+        The :class:`RateLimitFilter` limits the rate of the records for each combination of logger,
+        level and message template with a token bucket.  The message template is the unformatted
+        message, so the records are never formatted to be checked.  Each bucket allows a burst of
+        records and then the records are allowed at the rate, the records over the limit are counted
+        and a summary record with the number of suppressed records is emitted for each bucket every
+        summary interval.
+
+        Records at or above the exempt level are never limited.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, summary_interval: float = 30.0,
+                 exempt_level: int = logging.CRITICAL):
+        super().__init__(exempt_level=exempt_level)
+        self._rate = rate
+        self._burst = burst
+        self._summary_interval = summary_interval
+
+        # Each bucket is a list of [tokens, last refill time, suppressed count].
+        self._buckets: Dict[Tuple[str, int, str], list] = {}
+        self._lock = threading.Lock()
+        self._next_summary = time.monotonic() + summary_interval
+        return
+
+    def decide(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        key = (record.name, record.levelno, record.msg if isinstance(record.msg, str) else str(record.msg))
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= RATE_LIMIT_MAX_KEYS:
+                    self._drop_idle_buckets(now)
+                bucket = [float(self._burst), now, 0]
+                self._buckets[key] = bucket
+
+            tokens = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+            bucket[1] = now
+
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                allowed = True
+            else:
+                bucket[0] = tokens
+                bucket[2] += 1
+                allowed = False
+
+            summaries = None
+            if now >= self._next_summary:
+                summaries = self._collect_summaries(now)
+
+        if summaries:
+            self._emit_summaries(summaries)
+
+        return allowed
+
+    def flush(self):
+        """
+            Emits the summary records for the records that have been suppressed since the last summary.
+        """
+        with self._lock:
+            summaries = self._collect_summaries(time.monotonic())
+
+        self._emit_summaries(summaries)
+        return
+
+    def _collect_summaries(self, now: float) -> List[Tuple[Tuple[str, int, str], int]]:
+        summaries = []
+
+        for key, bucket in self._buckets.items():
+            if bucket[2] > 0:
+                summaries.append((key, bucket[2]))
+                bucket[2] = 0
+
+        self._next_summary = now + self._summary_interval
+
+        return summaries
+
+    def _drop_idle_buckets(self, now: float):
+        for key, bucket in list(self._buckets.items()):
+            if bucket[2] == 0 and bucket[0] + (now - bucket[1]) * self._rate >= self._burst:
+                del self._buckets[key]
+        return
+
+    def _emit_summaries(self, summaries: List[Tuple[Tuple[str, int, str], int]]):
+        for (name, levelno, template), suppressed in summaries:
+            emit_summary_record(name, levelno, "Suppressed %d messages like '%s' over the rate limit of %s/s.",
+                                suppressed, template, self._rate)
+        return
+
+
+class DuplicateFilter(SharedDecisionFilter):
+    """
+        The :class:`DuplicateFilter` suppresses records that repeat the previous record exactly, with
+        the same logger, level, message template and arguments, within the repeat window.  When a
+        different record arrives or the window expires, a summary record with the number of repeats
+        is emitted before the next record.
+
+        Records at or above the exempt level are never suppressed.
+    """
+
+    def __init__(self, window: float = 30.0, exempt_level: int = logging.CRITICAL):
+        super().__init__(exempt_level=exempt_level)
+        self._window = window
+
+        self._lock = threading.Lock()
+        self._last_key = None
+        self._last_time = 0.0
+        self._repeats = 0
+        return
+
+    def decide(self, record: logging.LogRecord) -> bool:
+        now = time.monotonic()
+        key = (record.name, record.levelno, record.msg, record.args)
+
+        summary = None
+
+        with self._lock:
+            try:
+                duplicate = key == self._last_key and (now - self._last_time) < self._window
+            except Exception: # pylint: disable=broad-except
+                # Arguments that cannot be compared are never treated as duplicates.
+                duplicate = False
+
+            if duplicate:
+                self._repeats += 1
+            else:
+                if self._repeats > 0:
+                    summary = (self._last_key, self._repeats)
+                self._last_key = key
+                self._last_time = now
+                self._repeats = 0
+
+        if summary is not None:
+            self._emit_summary(*summary)
+
+        return not duplicate
+
+    def flush(self):
+        """
+            Emits the summary record for the repeats of the last record, if it was repeated.
+        """
+        summary = None
+
+        with self._lock:
+            if self._repeats > 0:
+                summary = (self._last_key, self._repeats)
+                self._repeats = 0
+
+        if summary is not None:
+            self._emit_summary(*summary)
+
+        return
+
+    def _emit_summary(self, key: tuple, repeats: int):
+        name, levelno, template, _ = key
+        emit_summary_record(name, levelno, "Suppressed %d identical messages like '%s'.", repeats, template)
+        return
+
+
+INSTALLED_LOG_FILTERS: List[Tuple[logging.Handler, logging.Filter]] = []
+
+
+def install_log_filters(rate: Optional[float] = None, burst: int = 20, dedup: bool = False,
+                        summary_interval: float = 30.0, handlers: Optional[List[logging.Handler]] = None) -> List[logging.Filter]:
+    """
+        Installs the rate limit and duplicate filters on the logging handlers.  The filters are shared by
+        the handlers, each record is counted once and a record that is suppressed for one handler is
+        suppressed for all of them.
+
+        :param rate: The number of records per second allowed for each logger, level and message
+                     template, or None for no rate limit.
+        :param burst: The number of records allowed in a burst before the rate limit applies.
+        :param dedup: Install the duplicate filter.
+        :param summary_interval: The number of seconds between the summary records of the suppressed records.
+        :param handlers: The handlers to install the filters on, defaults to the handlers installed by the
+                         runtime, the handlers of the application are never filtered by default.
+
+        :returns: The filters that were installed.
+    """
+    filters = []
+    if dedup:
+        filters.append(DuplicateFilter(window=summary_interval))
+    if rate is not None:
+        filters.append(RateLimitFilter(rate=rate, burst=burst, summary_interval=summary_interval))
+
+    if handlers is None:
+        from mojo.runtime.logcontrol import get_runtime_log_handlers
+        handlers = get_runtime_log_handlers()
+
+    for handler in handlers:
+        for lfilter in filters:
+            handler.addFilter(lfilter)
+            INSTALLED_LOG_FILTERS.append((handler, lfilter))
+
+    return filters
+
+def uninstall_log_filters():
+    """
+        Emits the pending summary records and removes the filters installed by :func:`install_log_filters`
+        from the handlers they were installed on, filters added to the handlers by the application are
+        left in place.
+    """
+    global INSTALLED_LOG_FILTERS
+
+    installed = INSTALLED_LOG_FILTERS
+    INSTALLED_LOG_FILTERS = []
+
+    flushed = []
+    for _, lfilter in installed:
+        if lfilter not in flushed:
+            lfilter.flush()
+            flushed.append(lfilter)
+
+    for handler, lfilter in installed:
+        handler.removeFilter(lfilter)
+
+    return
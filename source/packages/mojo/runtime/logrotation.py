@@ -0,0 +1,307 @@
+"""
+.. module:: logrotation
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`CompressingRotatingFileHandler` which is used to
+               compress the rotated log files on a background thread.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import Optional, Union
+
+import gzip
+import os
+import threading
+
+from logging.handlers import RotatingFileHandler
+
+from mojo.runtime.enumerations import LogCompression
+
+COMPRESSION_CHUNK_SIZE = 1024 * 1024
+
+COMPRESSION_SUFFIXES = {
+    LogCompression.Gzip: ".gz",
+    LogCompression.Zstd: ".zst"
+}
+
+LOG_COMPRESSION: Union[LogCompression, str] = LogCompression.Auto
+LOG_RETENTION_BYTES: Optional[int] = None
+
+
+def configure_log_compression(compression: Union[LogCompression, str] = LogCompression.Auto,
+                              retention_bytes: Optional[int] = None):
+    """
+        Configures the compression and retention used by the :class:`CompressingRotatingFileHandler`
+        objects that are created without explicit settings, such as the handlers created by the
+        logging activation.  Calling the function without arguments restores the defaults.
+
+        :param compression: The compression for the rotated log files.
+        :param retention_bytes: The maximum number of bytes of compressed log files to keep.
+    """
+    global LOG_COMPRESSION
+    global LOG_RETENTION_BYTES
+
+    LOG_COMPRESSION = compression
+    LOG_RETENTION_BYTES = retention_bytes
+
+    return
+
+def is_zstd_available() -> bool:
+    """
+        Returns True if zstd compression is available, either from the standard library or from
+        the optional 'zstandard' package.
+    """
+    available = True
+
+    try:
+        from compression import zstd # pylint: disable=unused-import,import-outside-toplevel
+    except ImportError:
+        try:
+            import zstandard # pylint: disable=unused-import,import-outside-toplevel
+        except ImportError:
+            available = False
+
+    return available
+
+def open_compressed_writer(path: str, compression: LogCompression):
+    """
+        Opens a binary file object that compresses the bytes written to it into a file.
+
+        :param path: The path of the compressed file.
+        :param compression: The compression to use, gzip or zstd.
+    """
+    if compression == LogCompression.Zstd:
+        try:
+            from compression import zstd # pylint: disable=import-outside-toplevel
+            writer = zstd.open(path, "wb")
+        except ImportError:
+            import zstandard # pylint: disable=import-outside-toplevel
+            writer = zstandard.ZstdCompressor().stream_writer(open(path, "wb"))
+    else:
+        writer = gzip.open(path, "wb", compresslevel=6)
+
+    return writer
+
+def resolve_log_compression(compression: Union[LogCompression, str]) -> LogCompression:
+    """
+        Resolves a requested compression to the compression that is available.  zstd is used for
+        'auto' when it is available and gzip is used whenever zstd is not available.
+    """
+    compression = LogCompression(compression)
+
+    if compression in (LogCompression.Auto, LogCompression.Zstd):
+        compression = LogCompression.Zstd if is_zstd_available() else LogCompression.Gzip
+
+    return compression
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """
+        The :class:`CompressingRotatingFileHandler` rotates log files with the same naming as the
+        :class:`RotatingFileHandler`, 'name.log.1' is the newest segment and 'name.log.(backupCount)'
+        the oldest, and hands the rotated segments to a background thread that compresses them to
+        'name.log.1.gz' or 'name.log.1.zst'.
+
+        The logging thread only renames files during a rollover, it never waits for a compression.
+        The compressing thread follows a segment by its inode, so a segment that is shifted by
+        another rollover while it is being compressed is stored under its new index.  Once a segment
+        is compressed, the oldest compressed segments are removed until the total size of the
+        compressed segments is within the retention limit.
+    """
+
+    def __init__(self, filename, mode='a', maxBytes=0, backupCount=0, encoding=None, delay=False, errors=None,
+                 compression: Optional[Union[LogCompression, str]] = None, retention_bytes: Optional[int] = None):
+        super().__init__(filename, mode=mode, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding,
+                         delay=delay, errors=errors)
+
+        if compression is None:
+            compression = LOG_COMPRESSION
+            if retention_bytes is None:
+                retention_bytes = LOG_RETENTION_BYTES
+
+        self._compression = resolve_log_compression(compression)
+        self._suffix = COMPRESSION_SUFFIXES[self._compression]
+        self._retention_bytes = retention_bytes
+
+        # The segment lock is held while the segments are renamed or removed, never while a
+        # segment is being compressed.
+        self._segment_lock = threading.Lock()
+
+        self._work_event = threading.Event()
+        self._idle_event = threading.Event()
+        self._stop_event = threading.Event()
+
+        # Segments left uncompressed by a previous process are compressed when the handler starts.
+        self._idle_event.set()
+        if self._has_uncompressed_segments():
+            self._idle_event.clear()
+            self._work_event.set()
+
+        self._worker = threading.Thread(target=self._compression_loop, name="mjr-log-compressor", daemon=True)
+        self._worker.start()
+        return
+
+    @property
+    def compression(self) -> LogCompression:
+        return self._compression
+
+    @property
+    def retention_bytes(self) -> Optional[int]:
+        return self._retention_bytes
+
+    def close(self):
+        """
+            Closes the log file and signals the compressing thread to stop.  The thread is not waited
+            for, a segment it has not compressed is compressed the next time the log is opened.
+        """
+        self._stop_event.set()
+        self._work_event.set()
+        super().close()
+        return
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if self.backupCount > 0:
+            with self._segment_lock:
+                for oldest in (self._segment_name(self.backupCount), self._segment_name(self.backupCount, True)):
+                    if os.path.exists(oldest):
+                        os.remove(oldest)
+
+                for index in range(self.backupCount - 1, 0, -1):
+                    for compressed in (False, True):
+                        source = self._segment_name(index, compressed)
+                        if os.path.exists(source):
+                            os.rename(source, self._segment_name(index + 1, compressed))
+
+                if os.path.exists(self.baseFilename):
+                    os.rename(self.baseFilename, self._segment_name(1))
+
+                self._idle_event.clear()
+                self._work_event.set()
+
+        if not self.delay:
+            self.stream = self._open()
+
+        return
+
+    def wait_for_compression(self, timeout: Optional[float] = None) -> bool:
+        """
+            Waits for the compressing thread to compress all of the rotated segments.
+
+            :param timeout: The maximum number of seconds to wait.
+
+            :returns: True if all of the rotated segments were compressed.
+        """
+        return self._idle_event.wait(timeout)
+
+    def _compress_next_segment(self) -> bool:
+        """
+            Compresses the newest uncompressed segment.
+
+            :returns: True if a segment was compressed.
+        """
+        source_file = None
+
+        with self._segment_lock:
+            for index in range(1, self.backupCount + 1):
+                try:
+                    source_file = open(self._segment_name(index), 'rb')
+                    break
+                except FileNotFoundError:
+                    continue
+
+        if source_file is None:
+            return False
+
+        compressed = False
+
+        with source_file:
+            source_stat = os.fstat(source_file.fileno())
+            temp_path = "{}.{}{}.tmp".format(self.baseFilename, os.getpid(), self._suffix)
+
+            try:
+                with open_compressed_writer(temp_path, self._compression) as writer:
+                    while not self._stop_event.is_set():
+                        chunk = source_file.read(COMPRESSION_CHUNK_SIZE)
+                        if len(chunk) == 0:
+                            compressed = True
+                            break
+                        writer.write(chunk)
+            except OSError:
+                compressed = False
+
+        with self._segment_lock:
+            index = self._find_segment(source_stat) if compressed else None
+            if index is not None:
+                os.replace(temp_path, self._segment_name(index, True))
+                os.remove(self._segment_name(index))
+            elif os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return compressed
+
+    def _compression_loop(self):
+
+        while not self._stop_event.is_set():
+            self._work_event.wait()
+            self._work_event.clear()
+
+            while not self._stop_event.is_set() and self._compress_next_segment():
+                self._enforce_retention()
+
+            with self._segment_lock:
+                if not self._work_event.is_set():
+                    self._idle_event.set()
+
+        return
+
+    def _enforce_retention(self):
+        if self._retention_bytes is None:
+            return
+
+        with self._segment_lock:
+            retained = 0
+            for index in range(1, self.backupCount + 1):
+                segment = self._segment_name(index, True)
+                try:
+                    retained += os.path.getsize(segment)
+                except OSError:
+                    continue
+
+                if retained > self._retention_bytes:
+                    os.remove(segment)
+
+        return
+
+    def _find_segment(self, source_stat: os.stat_result) -> Optional[int]:
+        found = None
+
+        for index in range(1, self.backupCount + 1):
+            try:
+                segment_stat = os.stat(self._segment_name(index))
+            except OSError:
+                continue
+            if segment_stat.st_ino == source_stat.st_ino and segment_stat.st_dev == source_stat.st_dev:
+                found = index
+                break
+
+        return found
+
+    def _has_uncompressed_segments(self) -> bool:
+        return any(os.path.exists(self._segment_name(index)) for index in range(1, self.backupCount + 1))
+
+    def _segment_name(self, index: int, compressed: bool = False) -> str:
+        segment = "{}.{}".format(self.baseFilename, index)
+        if compressed:
+            segment += self._suffix
+        return segment
@@ -0,0 +1,311 @@
+"""
+.. module:: memorydiag
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`MemoryDiagnostics` object which is used to take
+               tracemalloc snapshots of the allocations of the process and write them to the
+               diagnostics directory.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import List, Optional
+
+import os
+import threading
+import tracemalloc
+
+from datetime import datetime
+
+from mojo.runtime.sighandlers import SignalHandlerSlot
+
+MEMORY_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>")
+]
+
+# Once a snapshot has been taken because the RSS limit was crossed, the next one is taken when
+# the RSS has grown by this factor over the RSS at the previous capture.
+RSS_THRESHOLD_REARM_FACTOR = 1.10
+
+
+class MemoryDiagnostics:
+    """
+        The :class:`MemoryDiagnostics` traces the memory allocations of the process with tracemalloc
+        and writes snapshots of the top allocation sites to a directory.  Each snapshot file also
+        contains the difference from the previous snapshot, so the allocation sites that keep growing
+        between checkpoints stand out.
+
+        When an RSS limit is set, a watcher thread takes a snapshot automatically when the resident
+        set size of the process crosses the limit and again each time it grows by another 10%.
+    """
+
+    def __init__(self, snapshot_dir: str, frames: int = 1, top_n: int = 25, rss_limit: Optional[int] = None,
+                 rss_interval: float = 1.0):
+        self._snapshot_dir = snapshot_dir
+        self._frames = frames
+        self._top_n = top_n
+        self._rss_limit = rss_limit
+        self._rss_interval = rss_interval
+
+        self._lock = threading.Lock()
+        self._started_tracing = False
+        self._previous = None
+        self._previous_label = None
+        self._sequence = 0
+
+        self._watcher = None
+        self._stop_event = threading.Event()
+        return
+
+    @property
+    def snapshot_dir(self) -> str:
+        return self._snapshot_dir
+
+    def start(self):
+        """
+            Starts tracing the memory allocations, takes the baseline snapshot and starts the RSS
+            watcher when an RSS limit is set.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self._frames)
+            self._started_tracing = True
+
+        self.take_snapshot("activation")
+
+        if self._rss_limit is not None:
+            self._stop_event.clear()
+            self._watcher = threading.Thread(target=self._rss_watcher_loop, name="mjr-memory-watcher", daemon=True)
+            self._watcher.start()
+
+        return
+
+    def stop(self, timeout: Optional[float] = 5.0) -> Optional[str]:
+        """
+            Stops the RSS watcher, takes the exit snapshot and stops tracing if it was started by this object.
+
+            :param timeout: The maximum number of seconds to wait for the RSS watcher thread.
+
+            :returns: The path of the exit snapshot file.
+        """
+        if self._watcher is not None:
+            self._stop_event.set()
+            self._watcher.join(timeout)
+            self._watcher = None
+
+        snapshot_file = self.take_snapshot("exit")
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        return snapshot_file
+
+    def take_snapshot(self, label: str = "checkpoint") -> Optional[str]:
+        """
+            Takes a snapshot of the traced allocations and writes the top allocation sites and the
+            difference from the previous snapshot to the snapshot directory.
+
+            :param label: A label for the snapshot that is used in the name of the snapshot file.
+
+            :returns: The path of the snapshot file or None if allocations are not being traced.
+        """
+        if not tracemalloc.is_tracing():
+            return None
+
+        with self._lock:
+            snapshot = tracemalloc.take_snapshot().filter_traces(MEMORY_SNAPSHOT_FILTERS)
+            traced_current, traced_peak = tracemalloc.get_traced_memory()
+
+            self._sequence += 1
+            timestamp = datetime.now()
+
+            lines = [
+                "# Memory snapshot '{}' pid={} time={}".format(label, os.getpid(), timestamp.isoformat()),
+                "# traced_current={} traced_peak={} rss={}".format(traced_current, traced_peak, get_process_rss()),
+                "",
+                "## Top {} allocation sites".format(self._top_n)
+            ]
+            lines.extend([str(stat) for stat in snapshot.statistics("lineno")[:self._top_n]])
+
+            if self._previous is not None:
+                lines.append("")
+                lines.append("## Top {} differences from snapshot '{}'".format(self._top_n, self._previous_label))
+                lines.extend([str(stat) for stat in snapshot.compare_to(self._previous, "lineno")[:self._top_n]])
+
+            os.makedirs(self._snapshot_dir, exist_ok=True)
+
+            filename = "memory-{}-{:03d}-{}.txt".format(os.getpid(), self._sequence, label)
+            snapshot_file = os.path.join(self._snapshot_dir, filename)
+            with open(snapshot_file, 'w') as sf:
+                sf.write("\n".join(lines))
+                sf.write("\n")
+
+            self._previous = snapshot
+            self._previous_label = label
+
+        return snapshot_file
+
+    def _rss_watcher_loop(self):
+
+        threshold = self._rss_limit
+        while not self._stop_event.wait(self._rss_interval):
+            rss = get_process_rss()
+            if rss is not None and rss >= threshold:
+                try:
+                    self.take_snapshot("rss-threshold")
+                except OSError:
+                    pass
+                threshold = int(rss * RSS_THRESHOLD_REARM_FACTOR)
+
+        return
+
+
+MEMORY_DIAGNOSTICS: Optional[MemoryDiagnostics] = None
+MEMORY_DIAGNOSTICS_LOCK = threading.RLock()
+
+
+def get_memory_diagnostics() -> Optional[MemoryDiagnostics]:
+    """
+        Returns the memory diagnostics of the current process or None if memory tracing is not running.
+    """
+    return MEMORY_DIAGNOSTICS
+
+def get_process_rss() -> Optional[int]:
+    """
+        Returns the resident set size of the current process in bytes, or None when it cannot be read.
+    """
+    rss = None
+
+    try:
+        with open("/proc/self/statm", 'rb') as sf:
+            rss = int(sf.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            # The resident set size is only available as the peak on these platforms.
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            rss = maxrss if os.uname().sysname == "Darwin" else maxrss * 1024
+        except (ImportError, AttributeError):
+            pass
+
+    return rss
+
+def install_memory_signal_handler(signum: Optional[int] = None) -> bool:
+    """
+        Installs a signal handler that takes a memory snapshot, SIGUSR1 by default.  The snapshot is
+        taken on a separate thread so the interrupted code is not re-entered by the signal handler.
+
+        :param signum: The signal to take snapshots with.
+
+        :returns: True if the handler was installed, when called from a thread other than the main
+                  thread the install is deferred until :func:`mojo.runtime.sighandlers.install_pending_signal_handlers`
+                  is called.
+    """
+    installed = MEMORY_DIAGNOSTICS_SIGNAL.install(signum)
+    return installed
+
+def list_memory_snapshots(snapshot_dir: str) -> List[str]:
+    """
+        Returns the paths of the memory snapshot files in a directory in the order they were taken.
+    """
+    snapshot_files = []
+
+    if os.path.isdir(snapshot_dir):
+        snapshot_files = [
+            os.path.join(snapshot_dir, fname) for fname in sorted(os.listdir(snapshot_dir))
+            if fname.startswith("memory-") and fname.endswith(".txt")
+        ]
+
+    return snapshot_files
+
+def reset_memory_diagnostics():
+    """
+        Stops the memory diagnostics and restores the signal handler that was replaced.  This is
+        used when the runtime is deactivated.
+    """
+    stop_memory_diagnostics()
+    uninstall_memory_signal_handler()
+    return
+
+def start_memory_diagnostics(snapshot_dir: str, frames: int = 1, top_n: int = 25,
+                             rss_limit: Optional[int] = None) -> MemoryDiagnostics:
+    """
+        Starts tracing the memory allocations of the current process.
+
+        :param snapshot_dir: The directory the snapshot files are written to.
+        :param frames: The number of frames of the traceback stored for each allocation.
+        :param top_n: The number of allocation sites written to each snapshot file.
+        :param rss_limit: The resident set size in bytes that triggers a snapshot automatically.
+
+        :returns: The memory diagnostics of the current process.
+    """
+    global MEMORY_DIAGNOSTICS
+
+    with MEMORY_DIAGNOSTICS_LOCK:
+        stop_memory_diagnostics()
+
+        memdiag = MemoryDiagnostics(snapshot_dir, frames=frames, top_n=top_n, rss_limit=rss_limit)
+        memdiag.start()
+
+        MEMORY_DIAGNOSTICS = memdiag
+
+    return memdiag
+
+def stop_memory_diagnostics() -> Optional[str]:
+    """
+        Takes the exit snapshot and stops tracing the memory allocations of the current process.
+
+        :returns: The path of the exit snapshot file or None if memory tracing was not running.
+    """
+    global MEMORY_DIAGNOSTICS
+
+    snapshot_file = None
+
+    with MEMORY_DIAGNOSTICS_LOCK:
+        if MEMORY_DIAGNOSTICS is not None:
+            memdiag = MEMORY_DIAGNOSTICS
+            MEMORY_DIAGNOSTICS = None
+
+            snapshot_file = memdiag.stop()
+
+    return snapshot_file
+
+def take_memory_snapshot(label: str = "checkpoint") -> Optional[str]:
+    """
+        Takes a memory snapshot checkpoint when memory tracing is running.
+
+        :param label: A label for the snapshot that is used in the name of the snapshot file.
+
+        :returns: The path of the snapshot file or None if memory tracing is not running.
+    """
+    snapshot_file = None
+
+    memdiag = MEMORY_DIAGNOSTICS
+    if memdiag is not None:
+        snapshot_file = memdiag.take_snapshot(label)
+
+    return snapshot_file
+
+def uninstall_memory_signal_handler():
+    """
+        Restores the signal handler that was replaced by :func:`install_memory_signal_handler`.
+    """
+    MEMORY_DIAGNOSTICS_SIGNAL.uninstall()
+    return
+
+def _snapshot_on_signal(signum, frame): # pylint: disable=unused-argument
+    snapshot_thread = threading.Thread(target=take_memory_snapshot, args=("signal",), name="mjr-memory-snapshot", daemon=True)
+    snapshot_thread.start()
+    return
+
+
+MEMORY_DIAGNOSTICS_SIGNAL = SignalHandlerSlot("memory diagnostics", "SIGUSR1", _snapshot_on_signal)
@@ -12,7 +12,11 @@ __copyright__ = "Copyright 2020, Myron W Walker"
 __credits__ = []
 
 
-from typing import List
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
+
+import logging
+import os
+import threading
 
 from datetime import datetime
 
@@ -21,12 +25,212 @@ from mojo.collections.wellknown import ContextSingleton
 
 from mojo.config.optionoverrides import MOJO_CONFIG_OPTION_OVERRIDES
 
-from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES
+from mojo.errors.exceptions import ConfigurationError
+
+from mojo.xmods.xlogging.levels import LOG_LEVEL_NAMES
+
+from mojo.runtime.enumerations import OptionValueType
+from mojo.runtime.optionspecs import RUNTIME_OPTION_SPECS
+from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES, bump_runtime_info_version, parse_byte_count
+from mojo.runtime.variablenames import MOJO_RUNTIME_VARNAMES
 
 ctx = ContextSingleton()
 
+
+def _validate_byte_count(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, int):
+        rtnval = value
+    elif isinstance(value, str):
+        rtnval = parse_byte_count(value)
+    else:
+        raise TypeError("Expected a byte count as an int or str, got {}.".format(type(value).__name__))
+    if rtnval is not None and rtnval < 0:
+        raise ValueError("A byte count cannot be negative.")
+    return rtnval
+
+def _validate_datetime(value: Any) -> datetime:
+    if not isinstance(value, datetime):
+        raise TypeError("Expected a datetime, got {}.".format(type(value).__name__))
+    return value
+
+def _validate_log_level(value: Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError("Expected a logging level name as a str, got {}.".format(type(value).__name__))
+    rtnval = value.strip().upper()
+    if rtnval not in LOG_LEVEL_NAMES:
+        raise ValueError("Unknown logging level '{}', expected one of {}.".format(value, ", ".join(LOG_LEVEL_NAMES)))
+    return rtnval
+
+def _validate_str(value: Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError("Expected a str, got {}.".format(type(value).__name__))
+    return value
+
+def _validate_str_list(value: Any) -> List[str]:
+    if isinstance(value, str):
+        value = [item.strip() for item in value.split(",") if len(item.strip()) > 0]
+    if not isinstance(value, (list, tuple)) or not all([isinstance(item, str) for item in value]):
+        raise TypeError("Expected a list of str, got {}.".format(type(value).__name__))
+    rtnval = list(value)
+    return rtnval
+
+
+# The functions that validate and normalize an override value of each of the option value types.
+OVERRIDE_VALIDATORS: Dict[OptionValueType, Callable[[Any], Any]] = {
+    OptionValueType.ByteCount: _validate_byte_count,
+    OptionValueType.DateTime: _validate_datetime,
+    OptionValueType.LogLevel: _validate_log_level,
+    OptionValueType.Str: _validate_str,
+    OptionValueType.StrList: _validate_str_list
+}
+
+# The context paths that mirror the values of the overridable runtime variables, the variables
+# that are not listed are not mirrored in the context.
+OVERRIDE_CONTEXT_PATHS = {
+    MOJO_RUNTIME_VARNAMES.MJR_BUILD_BRANCH: ContextPaths.BUILD_BRANCH,
+    MOJO_RUNTIME_VARNAMES.MJR_BUILD_FLAVOR: ContextPaths.BUILD_FLAVOR,
+    MOJO_RUNTIME_VARNAMES.MJR_BUILD_NAME: ContextPaths.BUILD_NAME,
+    MOJO_RUNTIME_VARNAMES.MJR_BUILD_RELEASE: ContextPaths.BUILD_RELEASE,
+    MOJO_RUNTIME_VARNAMES.MJR_BUILD_URL: ContextPaths.BUILD_URL,
+    MOJO_RUNTIME_VARNAMES.MJR_DEBUG_BREAKPOINTS: ContextPaths.DEBUG_BREAKPOINTS,
+    MOJO_RUNTIME_VARNAMES.MJR_DEBUG_DEBUGGER: ContextPaths.DEBUG_DEBUGGER,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_ID: ContextPaths.JOB_ID,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_INITIATOR: ContextPaths.JOB_INITIATOR,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_LABEL: ContextPaths.JOB_LABEL,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_NAME: ContextPaths.JOB_NAME,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_OWNER: ContextPaths.JOB_OWNER,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_SEED: ContextPaths.JOB_SEED,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_TAG: ContextPaths.JOB_TAG,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_TYPE: ContextPaths.JOB_TYPE,
+    MOJO_RUNTIME_VARNAMES.MJR_LOG_LEVEL_CONSOLE: ContextPaths.LOGGING_LEVEL_CONSOLE,
+    MOJO_RUNTIME_VARNAMES.MJR_LOG_LEVEL_FILE: ContextPaths.LOGGING_LEVEL_LOGFILE,
+    MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_DIRECTORY: ContextPaths.OUTPUT_DIRECTORY,
+    MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_ID: ContextPaths.PIPELINE_ID,
+    MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_INSTANCE: ContextPaths.PIPELINE_INSTANCE,
+    MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_NAME: ContextPaths.PIPELINE_NAME,
+    MOJO_RUNTIME_VARNAMES.MJR_RUN_ID: ContextPaths.RUNID,
+    MOJO_RUNTIME_VARNAMES.MJR_SHARED_STORE_DIRECTORY: ContextPaths.SHARED_STORE_DIRECTORY,
+    MOJO_RUNTIME_VARNAMES.MJR_STARTTIME: ContextPaths.STARTTIME,
+    MOJO_RUNTIME_VARNAMES.MJR_TESTROOT: ContextPaths.TESTROOT,
+}
+
+# The table of the runtime variables that can be overridden, it is generated from the option specs
+# in :mod:`mojo.runtime.optionspecs` and maps each variable to the context path that mirrors its
+# value, or None, and to the function that validates and normalizes an override value.
+OVERRIDE_TABLE = {
+    spec.var_name: (OVERRIDE_CONTEXT_PATHS.get(spec.var_name, None), OVERRIDE_VALIDATORS[spec.value_type])
+    for spec in RUNTIME_OPTION_SPECS
+}
+
+# The variables that are part of the cached job and pipeline info snapshots.
+RUNTIME_INFO_VARIABLES = frozenset([
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_ID,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_INITIATOR,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_LABEL,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_NAME,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_OWNER,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_SEED,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_TAG,
+    MOJO_RUNTIME_VARNAMES.MJR_JOB_TYPE,
+    MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_ID,
+    MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_INSTANCE,
+    MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_NAME,
+    MOJO_RUNTIME_VARNAMES.MJR_RUN_ID
+])
+
+# The variables that the memoized directory paths in :mod:`mojo.runtime.paths` are derived from.
+PATH_CACHE_VARIABLES = frozenset([
+    MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_DIRECTORY,
+    MOJO_RUNTIME_VARNAMES.MJR_SHARED_STORE_DIRECTORY
+])
+
+# The variables that the base directory of the temporary file allocator in :mod:`mojo.runtime.tempalloc`
+# is derived from.
+TEMP_ALLOCATOR_VARIABLES = frozenset([
+    MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_DIRECTORY
+])
+
+# The value recorded for the rollback of the context entries that did not exist before an override.
+OVERRIDE_CONTEXT_ENTRY_ABSENT = object()
+
+OVERRIDE_LOCK = threading.RLock()
+
+OVERRIDE_LISTENERS: List[Callable[[FrozenSet[str]], None]] = []
+OVERRIDE_LISTENERS_LOCK = threading.Lock()
+
+
 class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
 
+    @staticmethod
+    def apply_overrides(overrides: Dict[str, Any]) -> FrozenSet[str]:
+        """
+            Validates and applies a set of overrides as a single transaction.  Every value is
+            validated before any value is applied, and if applying a value fails the values that
+            were already applied are rolled back.  After the overrides are committed, the override
+            listeners are notified once with the set of variables whose values changed.
+
+            :param overrides: A dictionary of runtime variable names, such as 'MJR_JOB_NAME', to
+                              the value to override the variable with.
+
+            :returns: The set of the variable names whose values were changed.
+        """
+        validated = {}
+        errmsg_lines = []
+
+        for var_name, var_value in overrides.items():
+            if var_name not in OVERRIDE_TABLE:
+                errmsg_lines.append("    {}: not an overridable runtime variable".format(var_name))
+                continue
+
+            _, validate = OVERRIDE_TABLE[var_name]
+            try:
+                validated[var_name] = validate(var_value)
+            except (TypeError, ValueError) as verr:
+                errmsg_lines.append("    {}: {}".format(var_name, verr))
+
+        if len(errmsg_lines) > 0:
+            errmsg_lines.insert(0, "Invalid runtime variable overrides were provided.")
+            errmsg = os.linesep.join(errmsg_lines)
+            raise ConfigurationError(errmsg)
+
+        changed = set()
+
+        with OVERRIDE_LOCK:
+            rollback = []
+            try:
+                for var_name, var_value in validated.items():
+                    ctx_path, _ = OVERRIDE_TABLE[var_name]
+
+                    prev_value = getattr(MOJO_RUNTIME_VARIABLES, var_name, None)
+                    prev_ctx_value = OVERRIDE_CONTEXT_ENTRY_ABSENT
+                    if ctx_path is not None:
+                        prev_ctx_value = ctx.lookup(ctx_path, default=OVERRIDE_CONTEXT_ENTRY_ABSENT)
+
+                    rollback.append((var_name, ctx_path, prev_value, prev_ctx_value))
+
+                    if ctx_path is not None:
+                        ctx.insert(ctx_path, var_value)
+                    setattr(MOJO_RUNTIME_VARIABLES, var_name, var_value)
+
+                    if prev_value != var_value:
+                        changed.add(var_name)
+            except Exception:
+                for var_name, ctx_path, prev_value, prev_ctx_value in reversed(rollback):
+                    if ctx_path is not None:
+                        # The entries that were created by the override are removed instead of being set to None.
+                        if prev_ctx_value is not OVERRIDE_CONTEXT_ENTRY_ABSENT:
+                            ctx.insert(ctx_path, prev_ctx_value)
+                        elif ctx.lookup(ctx_path, default=OVERRIDE_CONTEXT_ENTRY_ABSENT) is not OVERRIDE_CONTEXT_ENTRY_ABSENT:
+                            ctx.remove(ctx_path)
+                    setattr(MOJO_RUNTIME_VARIABLES, var_name, prev_value)
+                raise
+
+        changed = frozenset(changed)
+        if len(changed) > 0:
+            _commit_override_changes(changed)
+
+        return changed
+
     @staticmethod
     def override_build_release(release: str):
         """
@@ -37,6 +241,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.BUILD_RELEASE, release)
         MOJO_RUNTIME_VARIABLES.MJR_BUILD_RELEASE = release
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_BUILD_RELEASE]))
         return
 
     @staticmethod
@@ -49,6 +254,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.BUILD_BRANCH, branch_name)
         MOJO_RUNTIME_VARIABLES.MJR_BUILD_BRANCH = branch_name
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_BUILD_BRANCH]))
         return
 
     @staticmethod
@@ -61,6 +267,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.BUILD_FLAVOR, build_flavor)
         MOJO_RUNTIME_VARIABLES.MJR_BUILD_FLAVOR = build_flavor
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_BUILD_FLAVOR]))
         return
 
     @staticmethod
@@ -73,6 +280,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.BUILD_NAME, build_name)
         MOJO_RUNTIME_VARIABLES.MJR_BUILD_NAME = build_name
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_BUILD_NAME]))
         return
 
     @staticmethod
@@ -85,6 +293,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.BUILD_URL, build_url)
         MOJO_RUNTIME_VARIABLES.MJR_BUILD_URL = build_url
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_BUILD_URL]))
         return
 
     @staticmethod
@@ -97,6 +306,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.DEBUG_BREAKPOINTS, breakpoints)
         MOJO_RUNTIME_VARIABLES.MJR_DEBUG_BREAKPOINTS = breakpoints
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_DEBUG_BREAKPOINTS]))
         return
 
     @staticmethod
@@ -109,6 +319,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.DEBUG_DEBUGGER, debugger)
         MOJO_RUNTIME_VARIABLES.MJR_DEBUG_DEBUGGER = debugger
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_DEBUG_DEBUGGER]))
         return
 
     @staticmethod
@@ -121,6 +332,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.JOB_ID, job_id)
         MOJO_RUNTIME_VARIABLES.MJR_JOB_ID = job_id
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_JOB_ID]))
         return
 
     @staticmethod
@@ -134,6 +346,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
 
         ctx.insert(ContextPaths.JOB_INITIATOR, job_initiator)
         MOJO_RUNTIME_VARIABLES.MJR_JOB_INITIATOR = job_initiator
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_JOB_INITIATOR]))
 
         return
 
@@ -148,6 +361,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
 
         ctx.insert(ContextPaths.JOB_LABEL, job_label)
         MOJO_RUNTIME_VARIABLES.MJR_JOB_LABEL = job_label
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_JOB_LABEL]))
 
         return
 
@@ -162,6 +376,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
 
         ctx.insert(ContextPaths.JOB_NAME, job_name)
         MOJO_RUNTIME_VARIABLES.MJR_JOB_NAME = job_name
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_JOB_NAME]))
 
         return
 
@@ -176,6 +391,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
 
         ctx.insert(ContextPaths.JOB_OWNER, job_owner)
         MOJO_RUNTIME_VARIABLES.MJR_JOB_OWNER = job_owner
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_JOB_OWNER]))
 
         return
     
@@ -190,6 +406,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
 
         ctx.insert(ContextPaths.JOB_SEED, job_seed)
         MOJO_RUNTIME_VARIABLES.MJR_JOB_SEED = job_seed
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_JOB_SEED]))
 
         return
 
@@ -204,6 +421,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
 
         ctx.insert(ContextPaths.JOB_TAG, job_tag)
         MOJO_RUNTIME_VARIABLES.MJR_JOB_TAG = job_tag
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_JOB_TAG]))
 
         return
 
@@ -218,6 +436,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
 
         ctx.insert(ContextPaths.JOB_TYPE, job_type)
         MOJO_RUNTIME_VARIABLES.MJR_JOB_TYPE = job_type
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_JOB_TYPE]))
 
         return
 
@@ -231,6 +450,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.LOGGING_LEVEL_CONSOLE, level)
         MOJO_RUNTIME_VARIABLES.MJR_LOG_LEVEL_CONSOLE = level
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_LOG_LEVEL_CONSOLE]))
         return
 
     @staticmethod
@@ -243,6 +463,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.LOGGING_LEVEL_LOGFILE, level)
         MOJO_RUNTIME_VARIABLES.MJR_LOG_LEVEL_FILE = level
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_LOG_LEVEL_FILE]))
         return
 
     @staticmethod
@@ -255,6 +476,23 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.OUTPUT_DIRECTORY, output_directory)
         MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_DIRECTORY = output_directory
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_DIRECTORY]))
+        return
+
+    @staticmethod
+    def override_output_quota(soft_limit: Optional[int], hard_limit: Optional[int]):
+        """
+            This override function provides a mechanism overriding the MJR_OUTPUT_QUOTA_SOFT
+            and MJR_OUTPUT_QUOTA_HARD variables.  The override must be applied before the
+            runtime is activated.
+
+            :param soft_limit: The byte count after which the soft quota warning is emitted.
+            :param hard_limit: The byte count that writes to the output directory cannot exceed.
+        """
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_SOFT = soft_limit
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_HARD = hard_limit
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_QUOTA_SOFT,
+                                            MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_QUOTA_HARD]))
         return
 
     @staticmethod
@@ -267,6 +505,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.PIPELINE_ID, pipeline_id)
         MOJO_RUNTIME_VARIABLES.MJR_PIPELINE_ID = pipeline_id
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_ID]))
         return
 
     @staticmethod
@@ -279,18 +518,20 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.PIPELINE_NAME, pipeline_name)
         MOJO_RUNTIME_VARIABLES.MJR_PIPELINE_NAME = pipeline_name
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_NAME]))
         return
 
     @staticmethod
-    def override_pipeline_name(pipeline_instance: str):
+    def override_pipeline_instance(pipeline_instance: str):
         """
-            This override function provides a mechanism overriding the MJR_PIPELINE_NAME
+            This override function provides a mechanism overriding the MJR_PIPELINE_INSTANCE
             variable and context configuration setting.
 
             :param pipeline_instance: A uuid string that represents the instance of a given pipeline.
         """
         ctx.insert(ContextPaths.PIPELINE_INSTANCE, pipeline_instance)
         MOJO_RUNTIME_VARIABLES.MJR_PIPELINE_INSTANCE = pipeline_instance
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_INSTANCE]))
         return
 
     @staticmethod
@@ -303,6 +544,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.RUNID, run_id)
         MOJO_RUNTIME_VARIABLES.MJR_RUN_ID = run_id
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_RUN_ID]))
         return
 
     @staticmethod
@@ -315,6 +557,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.SHARED_STORE_DIRECTORY, store_dir)
         MOJO_RUNTIME_VARIABLES.MJR_SHARED_STORE_DIRECTORY = store_dir
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_SHARED_STORE_DIRECTORY]))
         return
 
     @staticmethod
@@ -327,6 +570,7 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         ctx.insert(ContextPaths.STARTTIME, starttime)
         MOJO_RUNTIME_VARIABLES.MJR_STARTTIME = starttime
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_STARTTIME]))
         return
 
     @staticmethod
@@ -339,4 +583,56 @@ class MOJO_RUNTIME_OPTION_OVERRIDES(MOJO_CONFIG_OPTION_OVERRIDES):
         """
         MOJO_RUNTIME_VARIABLES.MJR_TESTROOT = testroot
         ctx.insert(ContextPaths.TESTROOT, testroot)
+        _commit_override_changes(frozenset([MOJO_RUNTIME_VARNAMES.MJR_TESTROOT]))
         return
+
+
+def register_override_listener(listener: Callable[[FrozenSet[str]], None]):
+    """
+        Registers a function that is called with the set of runtime variable names that were changed
+        each time overrides are committed.  This allows caches that are derived from the runtime
+        variables to refresh only when the variables they depend on change.
+
+        :param listener: The function to call with the frozenset of changed variable names.
+    """
+    with OVERRIDE_LISTENERS_LOCK:
+        if listener not in OVERRIDE_LISTENERS:
+            OVERRIDE_LISTENERS.append(listener)
+    return
+
+def unregister_override_listener(listener: Callable[[FrozenSet[str]], None]):
+    """
+        Unregisters a function that was registered with :func:`register_override_listener`.
+    """
+    with OVERRIDE_LISTENERS_LOCK:
+        if listener in OVERRIDE_LISTENERS:
+            OVERRIDE_LISTENERS.remove(listener)
+    return
+
+def _commit_override_changes(changed: FrozenSet[str]):
+    """
+        Refreshes the runtime caches that depend on the changed variables and then notifies
+        the override listeners of the change.
+    """
+    if not RUNTIME_INFO_VARIABLES.isdisjoint(changed):
+        bump_runtime_info_version()
+
+    if not PATH_CACHE_VARIABLES.isdisjoint(changed):
+        from mojo.runtime.paths import reset_path_caches
+        reset_path_caches()
+
+    if not TEMP_ALLOCATOR_VARIABLES.isdisjoint(changed):
+        from mojo.runtime.tempalloc import reset_temp_file_allocator
+        reset_temp_file_allocator(cleanup=False)
+
+    with OVERRIDE_LISTENERS_LOCK:
+        listeners = list(OVERRIDE_LISTENERS)
+
+    for listener in listeners:
+        try:
+            listener(changed)
+        except Exception: # pylint: disable=broad-except
+            logger = logging.getLogger()
+            logger.exception("An override listener raised an exception.")
+
+    return
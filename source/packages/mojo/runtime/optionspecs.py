@@ -0,0 +1,68 @@
+"""
+.. module:: optionspecs
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the declarative table of the overridable runtime variables.  The
+               command line options of :mod:`mojo.runtime.cliopts` and the override table of
+               :mod:`mojo.runtime.optionoverrides` are both generated from this table.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, List, NamedTuple, Optional
+
+from mojo.runtime.enumerations import OptionValueType
+from mojo.runtime.variablenames import MOJO_RUNTIME_VARNAMES
+
+# NOTE: This module is imported by :mod:`mojo.runtime.cliopts` before the runtime is activated, so it
+# must only import the modules that declare constants, the variable names and the enumerations.
+
+
+class RuntimeOptionSpec(NamedTuple):
+    """
+        Describes an overridable runtime variable.
+    """
+    var_name: str
+    value_type: OptionValueType
+    help: str
+    metavar: Optional[str] = None
+
+
+# The specs of the overridable runtime variables, each spec is keyed by a variable name from
+# :class:`mojo.runtime.variablenames.MOJO_RUNTIME_VARNAMES`, so renaming a variable fails when
+# the table is imported instead of leaving the options, the overrides and the variables out of sync.
+RUNTIME_OPTION_SPECS: List[RuntimeOptionSpec] = [
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_BUILD_BRANCH, OptionValueType.Str, "The name of the branch the build came from."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_BUILD_FLAVOR, OptionValueType.Str, "The flavor of the build associated with the job."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_BUILD_NAME, OptionValueType.Str, "The build version of the build."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_BUILD_RELEASE, OptionValueType.Str, "The name of the release associated with the build."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_BUILD_URL, OptionValueType.Str, "The url associated with the build."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_DEBUG_BREAKPOINTS, OptionValueType.StrList, "A comma separated list of wellknown breakpoints to activate.", "NAMES"),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_DEBUG_DEBUGGER, OptionValueType.Str, "The name of the debugger to setup."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_JOB_ID, OptionValueType.Str, "The unique id of the job."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_JOB_INITIATOR, OptionValueType.Str, "The name of the initiator of the job."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_JOB_LABEL, OptionValueType.Str, "The label the job was run under."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_JOB_NAME, OptionValueType.Str, "The name of the job."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_JOB_OWNER, OptionValueType.Str, "The name of the owner of the job."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_JOB_SEED, OptionValueType.Str, "The seed used for randomization in the job."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_JOB_TAG, OptionValueType.Str, "The tags for the job."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_JOB_TYPE, OptionValueType.Str, "The type of the job."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_LOG_LEVEL_CONSOLE, OptionValueType.LogLevel, "The console logging level.", "LEVEL"),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_LOG_LEVEL_FILE, OptionValueType.LogLevel, "The file logging level.", "LEVEL"),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_DIRECTORY, OptionValueType.Str, "The directory that output will be written under.", "DIR"),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_QUOTA_HARD, OptionValueType.ByteCount, "The byte count the output cannot exceed, e.g. '10G'.", "BYTES"),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_QUOTA_SOFT, OptionValueType.ByteCount, "The byte count after which a quota warning is emitted.", "BYTES"),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_ID, OptionValueType.Str, "The unique id of the pipeline."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_INSTANCE, OptionValueType.Str, "The unique id of the instance of the pipeline."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_PIPELINE_NAME, OptionValueType.Str, "The name of the pipeline."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_RUN_ID, OptionValueType.Str, "The unique id of the automation run."),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_SHARED_STORE_DIRECTORY, OptionValueType.Str, "The shared storage directory.", "DIR"),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_STARTTIME, OptionValueType.DateTime, "The start time of the run in ISO 8601 format.", "TIME"),
+    RuntimeOptionSpec(MOJO_RUNTIME_VARNAMES.MJR_TESTROOT, OptionValueType.Str, "The full path of the root of the tests folder.", "DIR"),
+]
+
+RUNTIME_OPTION_SPEC_TABLE: Dict[str, RuntimeOptionSpec] = { spec.var_name: spec for spec in RUNTIME_OPTION_SPECS }
@@ -14,14 +14,24 @@ __credits__ = []
 # pylint: disable=global-statement
 
 from cgitb import lookup
-from typing import List, Optional
+from typing import IO, List, Optional, Set
 
 import os
-import tempfile
+import threading
 
 from mojo.collections.contextpaths import ContextPaths
 from mojo.collections.wellknown import ContextSingleton
 
+from mojo.runtime.quotas import get_output_quota, open_output_file, QuotaTrackedFile
+from mojo.runtime.runtimecontext import get_current_runtime_context
+from mojo.runtime.sharedio import shared_makedirs
+from mojo.runtime.tempalloc import get_temp_file_allocator
+
+# The output directories that are known to exist, so the path getters that are called repeatedly
+# do not check or create the same directories again, which is costly on shared storage.
+CREATED_OUTPUT_DIRECTORIES: Set[str] = set()
+CREATED_OUTPUT_DIRECTORIES_LOCK = threading.Lock()
+
 DIR_CACHE_DIRECTORY = None
 DIR_DIAGNOSTICS_DIRECTORY = None
 DIR_RESULTS_DIRECTORY = None
@@ -95,6 +105,28 @@ def ensure_directory_is_package(package_dir: str, package_title: Optional[str] =
             initf.write('"""\n')
     return
 
+def ensure_output_directory(directory: str):
+    """
+        Ensures a directory in the output directory exists.  When the output directory is shared
+        across compute resources, the directory is created on the shared I/O executor so a stalled
+        filer causes a timeout instead of hanging the caller.  The directories that were ensured
+        are remembered until the path caches are reset, so repeated calls do not touch the filesystem.
+
+        :param directory: The full path of the directory to create.
+    """
+    if directory not in CREATED_OUTPUT_DIRECTORIES:
+        if utilizing_shared_output_path():
+            shared_makedirs(directory)
+        elif not os.path.isdir(directory):
+            # Other threads and processes may be creating the same directory, exist_ok makes
+            # losing the race to create a directory benign.
+            os.makedirs(directory, exist_ok=True)
+
+        with CREATED_OUTPUT_DIRECTORIES_LOCK:
+            CREATED_OUTPUT_DIRECTORIES.add(directory)
+
+    return
+
 def get_directory_for_cached_files(create=True) -> str:
     """
         Returns the path to the {home}/cache directory.
@@ -107,8 +139,8 @@ def get_directory_for_cached_files(create=True) -> str:
 
         runtime_home_dir = get_expanded_path(ctx.lookup(ContextPaths.RUNTIME_HOME_DIRECTORY))
         DIR_CACHE_DIRECTORY = os.path.join(runtime_home_dir, "cache")
-        if create and not os.path.exists(DIR_CACHE_DIRECTORY):
-            os.makedirs(DIR_CACHE_DIRECTORY)
+        if create:
+            os.makedirs(DIR_CACHE_DIRECTORY, exist_ok=True)
 
     return DIR_CACHE_DIRECTORY
 
@@ -192,17 +224,33 @@ def get_path_for_artifacts(label: str) -> str:
 
         :returns: A path that is descendant from (testresultdir)/artifacts
     """
+    get_output_quota().check()
+
     trdir = get_path_for_output()
     afdir = os.path.join(trdir, "artifacts", label)
 
-    if not os.path.exists(afdir):
-        os.makedirs(afdir)
+    ensure_output_directory(afdir)
 
     return afdir
 
 def get_path_for_output(create=True) -> str:
     """
-        Returns the timestamped path where test results and artifacts are deposited to
+        Returns the timestamped path where test results and artifacts are deposited to.  When
+        an isolated runtime context is current, the output directory of the runtime context
+        is returned.
+    """
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.get_path_for_output(create=create)
+    else:
+        rtnval = get_path_for_process_output(create=create)
+
+    return rtnval
+
+def get_path_for_process_output(create=True) -> str:
+    """
+        Returns the output directory of the process-wide runtime, ignoring any isolated
+        runtime context that is current.
     """
     global DIR_RESULTS_DIRECTORY
 
@@ -210,11 +258,27 @@ def get_path_for_output(create=True) -> str:
         ctx = ContextSingleton()
 
         DIR_RESULTS_DIRECTORY = get_expanded_path(ctx.lookup(ContextPaths.OUTPUT_DIRECTORY))
-        if create and not os.path.exists(DIR_RESULTS_DIRECTORY):
-            os.makedirs(DIR_RESULTS_DIRECTORY)
+        if create:
+            ensure_output_directory(DIR_RESULTS_DIRECTORY)
 
     return DIR_RESULTS_DIRECTORY
 
+def get_path_for_output_destination() -> str:
+    """
+        Returns the path that the output directory is finally written to.  This is the same path
+        as returned by :func:`get_path_for_output` unless output staging is enabled, in which case
+        it is the destination the staged output is written back to.
+    """
+    from mojo.runtime.staging import get_output_stager
+
+    stager = get_output_stager()
+    if stager is not None:
+        dest_dir = stager.destination_dir
+    else:
+        dest_dir = get_path_for_output()
+
+    return dest_dir
+
 
 def get_path_for_shared_store(create=True) -> str:
     """
@@ -229,8 +293,7 @@ def get_path_for_shared_store(create=True) -> str:
         DIR_SHARED_STORE_DIRECTORY = ctx.lookup(ContextPaths.SHARED_STORE_DIRECTORY)
         if create:
             fullpath = get_expanded_path(DIR_SHARED_STORE_DIRECTORY)
-            if not os.path.exists(fullpath):
-                os.makedirs(fullpath)
+            shared_makedirs(fullpath)
     
     return DIR_SHARED_STORE_DIRECTORY
 
@@ -252,8 +315,7 @@ def get_path_for_diagnostics(label: str) -> str:
     trdir = get_path_for_output()
     diagnostics_dir = os.path.join(trdir, "diagnostics", label)
 
-    if not os.path.exists(diagnostics_dir):
-        os.makedirs(diagnostics_dir)
+    ensure_output_directory(diagnostics_dir)
 
     return diagnostics_dir
 
@@ -271,6 +333,11 @@ def get_path_for_testresults() -> str:
 
     global DIR_TESTRESULTS_DIRECTORY
 
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        rtnval = rtctx.get_path_for_output()
+        return rtnval
+
     if DIR_TESTRESULTS_DIRECTORY is None:
         ctx = ContextSingleton()
 
@@ -278,27 +345,39 @@ def get_path_for_testresults() -> str:
 
         DIR_TESTRESULTS_DIRECTORY = tr_dir
 
-        if not os.path.exists(DIR_TESTRESULTS_DIRECTORY):
-            os.makedirs(DIR_TESTRESULTS_DIRECTORY)
+        ensure_output_directory(DIR_TESTRESULTS_DIRECTORY)
 
     return DIR_TESTRESULTS_DIRECTORY
 
 def get_path_for_testcase_by_products(test_id: str) -> str:
     """
-        Returns a path to the tc-by-products
+        Returns a path in the form (testresultdir)/tc-by-products/(test_id)
+
+        :param test_id: The id of the test the by-products are produced by.
+
+        :returns: A path that is descendant from (testresultdir)/tc-by-products
     """
 
     global DIR_TESTCASE_BYPRODUCTS_DIRECTORY
 
-    if DIR_TESTCASE_BYPRODUCTS_DIRECTORY is None:
+    get_output_quota().check()
+
+    rtctx = get_current_runtime_context()
+    if rtctx is not None:
+        byproducts_root = os.path.join(rtctx.get_path_for_output(), "tc-by-products")
+    else:
+        # Only the tc-by-products root is memoized, the directory for each test is a
+        # different leaf below the root.
+        if DIR_TESTCASE_BYPRODUCTS_DIRECTORY is None:
+            trdir = get_path_for_testresults()
+            DIR_TESTCASE_BYPRODUCTS_DIRECTORY = os.path.join(trdir, "tc-by-products")
+        byproducts_root = DIR_TESTCASE_BYPRODUCTS_DIRECTORY
 
-        trdir = get_path_for_testresults()
-        DIR_TESTCASE_BYPRODUCTS_DIRECTORY = os.path.join(trdir, "tc-by-products", test_id)
+    tcdir = os.path.join(byproducts_root, test_id)
 
-        if not os.path.exists(DIR_TESTCASE_BYPRODUCTS_DIRECTORY):
-            os.makedirs(DIR_TESTCASE_BYPRODUCTS_DIRECTORY)
+    ensure_output_directory(tcdir)
 
-    return DIR_TESTCASE_BYPRODUCTS_DIRECTORY
+    return tcdir
 
 def get_summary_html_template_source() -> str:
     """
@@ -323,8 +402,8 @@ def get_summary_static_resource_dest_dir(create=True) -> str:
     ctx = ContextSingleton()
     res_dir = get_expanded_path(ctx.lookup(ContextPaths.DIR_RESULTS_RESOURCE_DEST))
 
-    if create and not os.path.exists(res_dir):
-        os.makedirs(res_dir)
+    if create:
+        os.makedirs(res_dir, exist_ok=True)
 
     return res_dir
 
@@ -343,18 +422,19 @@ def get_temporary_directory() -> str:
     """
     temp_dir = os.path.join(get_path_for_output(), "temp")
 
-    if not os.path.exists(temp_dir):
-        os.makedirs(temp_dir)
+    ensure_output_directory(temp_dir)
 
     return temp_dir
 
 def get_temporary_file(suffix: str = '', prefix: str = '') -> str:
     """
-        Returns the path of a temporary file in the output directory.
+        Returns the path of a new temporary file.  The file is created empty so the name is
+        reserved and cannot be handed out again by another thread or process.  The file is
+        removed along with the rest of the temp root of the process when the runtime exits.
     """
-    tempdir = get_temporary_directory()
+    get_output_quota().check()
 
-    tmpfile = tempfile.mktemp(suffix=suffix, prefix=prefix, dir=tempdir)
+    tmpfile = get_temp_file_allocator().allocate_name(suffix=suffix, prefix=prefix)
 
     return tmpfile
 
@@ -370,6 +450,66 @@ def normalize_name_for_path(name: str) -> str:
     norm_name = name.translate(TRANSLATE_TABLE_NORMALIZE_FOR_PATH).replace(" ", "")
     return norm_name
 
+def open_temporary_file(suffix: str = '', prefix: str = '', mode: str = 'w+b', **kwargs) -> IO:
+    """
+        Creates and opens a new temporary file.  The file is removed along with the rest of the
+        temp root of the process when the runtime exits.
+
+        :param suffix: The suffix of the file name.
+        :param prefix: The prefix of the file name.
+        :param mode: The mode to open the file with.
+
+        :returns: The open file object, the path of the file is available from its 'name'.
+    """
+    get_output_quota().check()
+
+    tmpfobj = get_temp_file_allocator().open_file(suffix=suffix, prefix=prefix, mode=mode, **kwargs)
+
+    return tmpfobj
+
+def open_artifact_file(label: str, filename: str, mode: str = 'w', **kwargs) -> QuotaTrackedFile:
+    """
+        Opens a file in the (testresultdir)/artifacts/(label) directory for writing.  The bytes
+        written to the file are accounted against the output quota.
+
+        :param label: A label to associate with the collection of artifacts.
+        :param filename: The name of the artifact file.
+        :param mode: The mode to open the file with.
+
+        :returns: A file object that accounts for the bytes written against the output quota.
+    """
+    afdir = get_path_for_artifacts(label)
+    affile = os.path.join(afdir, filename)
+
+    afobj = open_output_file(affile, mode, **kwargs)
+
+    return afobj
+
+def reset_path_caches():
+    """
+        Clears the memoized directory paths so they are resolved again from the context the
+        next time they are requested.  This is used when the runtime is deactivated or when
+        the output directory is overridden.
+    """
+    global DIR_CACHE_DIRECTORY
+    global DIR_DIAGNOSTICS_DIRECTORY
+    global DIR_RESULTS_DIRECTORY
+    global DIR_SHARED_STORE_DIRECTORY
+    global DIR_TESTRESULTS_DIRECTORY
+    global DIR_TESTCASE_BYPRODUCTS_DIRECTORY
+
+    DIR_CACHE_DIRECTORY = None
+    DIR_DIAGNOSTICS_DIRECTORY = None
+    DIR_RESULTS_DIRECTORY = None
+    DIR_SHARED_STORE_DIRECTORY = None
+    DIR_TESTRESULTS_DIRECTORY = None
+    DIR_TESTCASE_BYPRODUCTS_DIRECTORY = None
+
+    with CREATED_OUTPUT_DIRECTORIES_LOCK:
+        CREATED_OUTPUT_DIRECTORIES.clear()
+
+    return
+
 def utilizing_shared_output_path() -> bool:
     """
         Returns a boolean value indicating the runtime is configured to use a shared output
@@ -0,0 +1,316 @@
+"""
+.. module:: profiler
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`SamplingProfiler` object which is used to sample the
+               stacks of all of the threads of the process and write them in collapsed stack format.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from types import CodeType, FrameType
+from typing import Dict, List, Optional
+
+import os
+import sys
+import threading
+import time
+
+from collections import Counter
+from datetime import datetime
+
+from mojo.runtime.sighandlers import SignalHandlerSlot
+
+PROFILER_MAX_DEPTH = 128
+
+
+class SamplingProfiler:
+    """
+        The :class:`SamplingProfiler` runs a background thread that periodically samples the stacks of
+        all of the threads of the process with `sys._current_frames` and aggregates them in memory
+        by their collapsed stack.  When the profiler is stopped, the stacks are written to a file in
+        the collapsed stack format used by flamegraph tools, one stack per line followed by the number
+        of samples of the stack.
+
+        The cost of the profiler is bounded by its maximum overhead.  When taking a sample costs more
+        than the maximum overhead allows at the sampling interval, the interval is lengthened.
+    """
+
+    def __init__(self, profile_dir: str, interval: float = 0.01, max_overhead: float = 0.02):
+        self._profile_dir = profile_dir
+        self._interval = interval
+        self._max_overhead = max_overhead
+
+        self._stacks = Counter()
+        self._code_labels: Dict[CodeType, str] = {}
+        self._thread_names: Dict[int, str] = {}
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._sample_count = 0
+        self._sample_time = 0.0
+        return
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def sample_count(self) -> int:
+        return self._sample_count
+
+    @property
+    def sample_time(self) -> float:
+        """
+            The number of seconds the sampler thread has spent taking samples.
+        """
+        return self._sample_time
+
+    def get_collapsed_stacks(self) -> List[str]:
+        """
+            Returns the collapsed stacks that have been sampled, one line per stack.
+        """
+        lines = ["{} {}".format(stack, count) for stack, count in sorted(self._stacks.items())]
+        return lines
+
+    def start(self):
+        """
+            Starts the sampler thread of the profiler.
+        """
+        self._stacks.clear()
+        self._sample_count = 0
+        self._sample_time = 0.0
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sampler_loop, name="mjr-profiler", daemon=True)
+        self._thread.start()
+        return
+
+    def stop(self, timeout: Optional[float] = 5.0) -> Optional[str]:
+        """
+            Stops the sampler thread and writes the collapsed stacks to the profile directory.
+
+            :param timeout: The maximum number of seconds to wait for the sampler thread.
+
+            :returns: The path of the profile file that was written or None if nothing was sampled.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+        profile_file = None
+
+        if self._sample_count > 0:
+            os.makedirs(self._profile_dir, exist_ok=True)
+
+            timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            profile_file = os.path.join(self._profile_dir, "profile-{}-{}.folded".format(os.getpid(), timestamp))
+
+            with open(profile_file, 'w') as pf:
+                for line in self.get_collapsed_stacks():
+                    pf.write(line)
+                    pf.write("\n")
+
+        return profile_file
+
+    def take_sample(self):
+        """
+            Samples the stacks of all of the threads of the process except the sampler thread.
+        """
+        sampler_ident = threading.get_ident()
+
+        frames = sys._current_frames() # pylint: disable=protected-access
+
+        # The thread names only need to be refreshed when a thread that has not been seen shows up.
+        if any(ident not in self._thread_names for ident in frames):
+            self._thread_names = { th.ident: th.name for th in threading.enumerate() }
+
+        for ident, frame in frames.items():
+            if ident == sampler_ident:
+                continue
+
+            thread_name = self._thread_names.get(ident, "thread-{}".format(ident))
+            stack = self._collapse_frame(frame)
+            self._stacks["{};{}".format(thread_name, stack) if stack else thread_name] += 1
+
+        self._sample_count += 1
+        return
+
+    def _collapse_frame(self, frame: FrameType) -> str:
+        labels = []
+
+        code_labels = self._code_labels
+        depth = 0
+        while frame is not None and depth < PROFILER_MAX_DEPTH:
+            code = frame.f_code
+            label = code_labels.get(code)
+            if label is None:
+                qualname = getattr(code, "co_qualname", code.co_name)
+                label = "{}:{}:{}".format(code.co_filename, qualname, code.co_firstlineno).replace(";", ":")
+                code_labels[code] = label
+            labels.append(label)
+            frame = frame.f_back
+            depth += 1
+
+        labels.reverse()
+        stack = ";".join(labels)
+
+        return stack
+
+    def _sampler_loop(self):
+
+        wait_time = self._interval
+        while not self._stop_event.wait(wait_time):
+            start = time.perf_counter()
+
+            try:
+                self.take_sample()
+            except Exception: # pylint: disable=broad-except
+                # A failed sample is skipped rather than stopping the profiler.
+                pass
+
+            sample_time = time.perf_counter() - start
+            self._sample_time += sample_time
+
+            # Lengthen the interval when sampling costs more than the maximum overhead allows.
+            wait_time = max(self._interval, sample_time / self._max_overhead - sample_time)
+
+        return
+
+
+SAMPLING_PROFILER: Optional[SamplingProfiler] = None
+SAMPLING_PROFILER_CONFIG = {
+    "profile_dir": None,
+    "interval": 0.01,
+    "max_overhead": 0.02
+}
+SAMPLING_PROFILER_LOCK = threading.RLock()
+
+
+def configure_sampling_profiler(profile_dir: Optional[str], interval: float = 0.01, max_overhead: float = 0.02):
+    """
+        Configures the directory and sampling interval used when the sampling profiler is started.
+
+        :param profile_dir: The directory the collapsed stack files are written to, when None the
+                            'profiles' folder of the diagnostics directory is used.
+        :param interval: The number of seconds between samples.
+        :param max_overhead: The maximum fraction of time the profiler spends sampling.
+    """
+    with SAMPLING_PROFILER_LOCK:
+        SAMPLING_PROFILER_CONFIG["profile_dir"] = profile_dir
+        SAMPLING_PROFILER_CONFIG["interval"] = interval
+        SAMPLING_PROFILER_CONFIG["max_overhead"] = max_overhead
+
+    return
+
+def get_sampling_profiler() -> Optional[SamplingProfiler]:
+    """
+        Returns the running sampling profiler or None if the profiler is not running.
+    """
+    return SAMPLING_PROFILER
+
+def install_profiler_signal_handler(signum: Optional[int] = None) -> bool:
+    """
+        Installs a signal handler that toggles the sampling profiler, SIGUSR2 by default.  The first
+        signal starts the profiler and the next signal stops it and writes the profile.  The profiler
+        is toggled on a separate thread, not inside the signal handler.
+
+        :param signum: The signal to toggle the profiler with.
+
+        :returns: True if the handler was installed, when called from a thread other than the main
+                  thread the install is deferred until :func:`mojo.runtime.sighandlers.install_pending_signal_handlers`
+                  is called.
+    """
+    installed = SAMPLING_PROFILER_SIGNAL.install(signum)
+    return installed
+
+def reset_sampling_profiler():
+    """
+        Stops the sampling profiler, restores the signal handler that was replaced by the profiler
+        and clears the profiler configuration.  This is used when the runtime is deactivated.
+    """
+    stop_sampling_profiler()
+    uninstall_profiler_signal_handler()
+    configure_sampling_profiler(None)
+    return
+
+def start_sampling_profiler() -> SamplingProfiler:
+    """
+        Starts the sampling profiler with the configured directory and interval.
+
+        :returns: The running sampling profiler.
+    """
+    global SAMPLING_PROFILER
+
+    with SAMPLING_PROFILER_LOCK:
+        if SAMPLING_PROFILER is None:
+            if SAMPLING_PROFILER_CONFIG["profile_dir"] is None:
+                from mojo.runtime.paths import get_path_for_diagnostics
+                SAMPLING_PROFILER_CONFIG["profile_dir"] = get_path_for_diagnostics("profiles")
+
+            profiler = SamplingProfiler(SAMPLING_PROFILER_CONFIG["profile_dir"], interval=SAMPLING_PROFILER_CONFIG["interval"],
+                                        max_overhead=SAMPLING_PROFILER_CONFIG["max_overhead"])
+            profiler.start()
+
+            SAMPLING_PROFILER = profiler
+
+    return SAMPLING_PROFILER
+
+def stop_sampling_profiler() -> Optional[str]:
+    """
+        Stops the sampling profiler and writes the profile.
+
+        :returns: The path of the profile file that was written or None if nothing was written.
+    """
+    global SAMPLING_PROFILER
+
+    profile_file = None
+
+    with SAMPLING_PROFILER_LOCK:
+        if SAMPLING_PROFILER is not None:
+            profiler = SAMPLING_PROFILER
+            SAMPLING_PROFILER = None
+
+            profile_file = profiler.stop()
+
+    return profile_file
+
+def toggle_sampling_profiler() -> Optional[str]:
+    """
+        Starts the sampling profiler if it is not running or stops it if it is running.
+
+        :returns: The path of the profile file when the profiler was stopped, otherwise None.
+    """
+    profile_file = None
+
+    with SAMPLING_PROFILER_LOCK:
+        if SAMPLING_PROFILER is None:
+            start_sampling_profiler()
+        else:
+            profile_file = stop_sampling_profiler()
+
+    return profile_file
+
+def uninstall_profiler_signal_handler():
+    """
+        Restores the signal handler that was replaced by :func:`install_profiler_signal_handler`.
+    """
+    SAMPLING_PROFILER_SIGNAL.uninstall()
+    return
+
+def _toggle_on_signal(signum, frame): # pylint: disable=unused-argument
+    # The profile is written on a separate thread so the interrupted code is not re-entered while
+    # it is holding the profiler lock or a lock used to write the profile file.
+    toggle_thread = threading.Thread(target=toggle_sampling_profiler, name="mjr-profiler-toggle", daemon=True)
+    toggle_thread.start()
+    return
+
+
+SAMPLING_PROFILER_SIGNAL = SignalHandlerSlot("sampling profiler", "SIGUSR2", _toggle_on_signal)
@@ -0,0 +1,314 @@
+"""
+.. module:: quotas
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`OutputQuota` object which is used to account for
+               the bytes written into the output directory and to enforce the output quotas.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, Optional, Union
+
+import json
+import logging
+import os
+import threading
+
+from datetime import datetime
+
+from mojo.runtime.exceptions import OutputQuotaExceededError
+
+QUOTA_DIAGNOSTICS_LABEL = "quota"
+QUOTA_EVENTS_FILENAME = "quota-events.jsonl"
+
+
+class OutputQuota:
+    """
+        The :class:`OutputQuota` object keeps a running count of the bytes that have been written
+        into the output directory through the runtime APIs.  The count is kept in memory so the
+        current usage can be queried without walking the output directory.
+
+        * When a write causes the usage to cross the soft limit, a warning is logged and a quota
+          event is written to the diagnostics directory.
+        * When a write would cause the usage to cross the hard limit, an :class:`OutputQuotaExceededError`
+          is raised before any bytes are written.
+
+        .. note:: The accounting is per process and only includes the writes that are made through
+                  :func:`open_output_file` and :func:`mojo.runtime.paths.open_artifact_file`, the
+                  writes to the log files of the file handlers installed by activation and the
+                  writes that are reported with :meth:`reserve`.  The following are not tracked:
+
+                  * Files written directly to the directories returned by the `get_path_for_*`
+                    functions, these should be opened with :func:`open_output_file` or reported
+                    with :meth:`reserve`.
+                  * The binary log stream and ring buffer, the trace, profile, telemetry and memory
+                    diagnostics files written by the runtime features.
+                  * Output written by other processes, such as the shards of other nodes.
+                  * Bytes of files that are removed, such as rotated log files, unless they are
+                    given back with :meth:`release`.
+
+                  Writes to the log files are counted but never refused, so logging keeps working
+                  once the hard limit is reached.
+    """
+
+    def __init__(self, soft_limit: Optional[int] = None, hard_limit: Optional[int] = None):
+        self._soft_limit = soft_limit
+        self._hard_limit = hard_limit
+        self._bytes_written = 0
+        self._soft_limit_reported = False
+        self._lock = threading.Lock()
+        return
+
+    @property
+    def bytes_written(self) -> int:
+        return self._bytes_written
+
+    @property
+    def hard_limit(self) -> Optional[int]:
+        return self._hard_limit
+
+    @property
+    def soft_limit(self) -> Optional[int]:
+        return self._soft_limit
+
+    def check(self):
+        """
+            Raises an :class:`OutputQuotaExceededError` if the hard limit of the quota has already
+            been reached.  This is used by the path APIs to prevent new output locations from being
+            handed out once the output directory is full.
+        """
+        if self._hard_limit is not None and self._bytes_written >= self._hard_limit:
+            errmsg_lines = [
+                "The hard quota for the output directory has been reached.",
+                "    HARD LIMIT: {}".format(self._hard_limit),
+                "    BYTES WRITTEN: {}".format(self._bytes_written)
+            ]
+            errmsg = os.linesep.join(errmsg_lines)
+            raise OutputQuotaExceededError(errmsg)
+
+        return
+
+    def release(self, nbytes: int):
+        """
+            Gives back bytes that were previously reserved, such as when a file in the output
+            directory is removed.
+
+            :param nbytes: The number of bytes to give back to the quota.
+        """
+        with self._lock:
+            self._bytes_written = max(0, self._bytes_written - nbytes)
+
+        return
+
+    def reserve(self, nbytes: int, path: Optional[str] = None, enforce: bool = True):
+        """
+            Reserves bytes against the quota before they are written.
+
+            :param nbytes: The number of bytes that are about to be written.
+            :param path: The path of the file the bytes are going to be written to.
+            :param enforce: Refuse the write when it would exceed the hard limit, when False the bytes
+                            are counted even past the hard limit.
+
+            :raises OutputQuotaExceededError: If the write would exceed the hard limit.
+        """
+        soft_limit_crossed = False
+
+        with self._lock:
+            proposed = self._bytes_written + nbytes
+
+            if enforce and self._hard_limit is not None and proposed > self._hard_limit:
+                errmsg_lines = [
+                    "Writing to the output directory would exceed the hard output quota.",
+                    "    HARD LIMIT: {}".format(self._hard_limit),
+                    "    BYTES WRITTEN: {}".format(self._bytes_written),
+                    "    BYTES REQUESTED: {}".format(nbytes),
+                    "    PATH: {}".format(path)
+                ]
+                errmsg = os.linesep.join(errmsg_lines)
+                raise OutputQuotaExceededError(errmsg)
+
+            self._bytes_written = proposed
+
+            if self._soft_limit is not None and not self._soft_limit_reported and proposed > self._soft_limit:
+                self._soft_limit_reported = True
+                soft_limit_crossed = True
+
+        if soft_limit_crossed:
+            self._report_soft_limit_crossed(proposed, path)
+
+        return
+
+    def _report_soft_limit_crossed(self, bytes_written: int, path: Optional[str]):
+        """
+            Logs a warning and writes a diagnostics event for the crossing of the soft limit.
+        """
+        logger = logging.getLogger()
+
+        warnmsg = "The output directory has exceeded its soft quota. soft_limit={} bytes_written={} path={}".format(
+            self._soft_limit, bytes_written, path
+        )
+        logger.warning(warnmsg)
+
+        event = {
+            "event": "soft-limit-exceeded",
+            "timestamp": datetime.now().isoformat(),
+            "pid": os.getpid(),
+            "soft_limit": self._soft_limit,
+            "hard_limit": self._hard_limit,
+            "bytes_written": bytes_written,
+            "path": path
+        }
+
+        try:
+            from mojo.runtime.paths import get_path_for_diagnostics
+
+            diag_dir = get_path_for_diagnostics(QUOTA_DIAGNOSTICS_LABEL)
+            events_file = os.path.join(diag_dir, QUOTA_EVENTS_FILENAME)
+            with open(events_file, 'a') as ef:
+                ef.write(json.dumps(event))
+                ef.write("\n")
+        except OSError as oserr:
+            logger.warning("Unable to write the output quota diagnostics event. err={}".format(oserr))
+
+        return
+
+
+class QuotaTrackedFile:
+    """
+        A thin wrapper around a file object that reserves the bytes for each write against
+        an :class:`OutputQuota` before the write is performed.  When the quota is not enforced,
+        the bytes are counted after they are written and the write is never refused.
+    """
+
+    def __init__(self, fileobj, quota: OutputQuota, path: str, enforce: bool = True):
+        self._fileobj = fileobj
+        self._quota = quota
+        self._path = path
+        self._enforce = enforce
+        return
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def write(self, data: Union[bytes, str]) -> int:
+
+        if isinstance(data, str):
+            if data.isascii():
+                nbytes = len(data)
+            else:
+                nbytes = len(data.encode("utf-8"))
+        else:
+            nbytes = len(data)
+
+        if self._enforce:
+            self._quota.reserve(nbytes, path=self._path)
+            rtnval = self._fileobj.write(data)
+        else:
+            rtnval = self._fileobj.write(data)
+            self._quota.reserve(nbytes, path=self._path, enforce=False)
+
+        return rtnval
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ex_type, ex_inst, ex_tb):
+        self._fileobj.close()
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self._fileobj, name)
+
+
+OUTPUT_QUOTA = OutputQuota()
+QUOTA_TRACKED_HANDLER_TYPES: Dict[type, type] = {}
+
+
+def configure_output_quota(soft_limit: Optional[int] = None, hard_limit: Optional[int] = None) -> OutputQuota:
+    """
+        Configures the limits of the output quota for the current process.  This resets the
+        accounting of the bytes written.
+
+        :param soft_limit: The number of bytes after which a warning and diagnostic event are emitted.
+        :param hard_limit: The number of bytes which the output directory writes cannot exceed.
+
+        :returns: The newly configured output quota.
+    """
+    global OUTPUT_QUOTA
+
+    if soft_limit is not None and hard_limit is not None and soft_limit > hard_limit:
+        errmsg = "The soft output quota cannot be larger than the hard output quota. soft_limit={} hard_limit={}".format(
+            soft_limit, hard_limit
+        )
+        raise ValueError(errmsg)
+
+    OUTPUT_QUOTA = OutputQuota(soft_limit=soft_limit, hard_limit=hard_limit)
+
+    return OUTPUT_QUOTA
+
+def get_output_quota() -> OutputQuota:
+    """
+        Returns the output quota for the current process.
+    """
+    return OUTPUT_QUOTA
+
+def get_output_usage() -> int:
+    """
+        Returns the number of bytes that have been accounted as written to the output directory.
+    """
+    rtnval = OUTPUT_QUOTA.bytes_written
+    return rtnval
+
+def open_output_file(filename: str, mode: str = 'w', **kwargs) -> QuotaTrackedFile:
+    """
+        Opens a file in the output directory for writing and returns a file object that
+        accounts for the bytes written against the output quota.
+
+        :param filename: The full path of the file to open.
+        :param mode: The mode to open the file with.
+
+        :returns: A :class:`QuotaTrackedFile` that wraps the opened file.
+    """
+    quota = OUTPUT_QUOTA
+    quota.check()
+
+    fileobj = open(filename, mode, **kwargs)
+
+    tracked = QuotaTrackedFile(fileobj, quota, filename)
+
+    return tracked
+
+def quota_tracked_handler_type(handler_type: type) -> type:
+    """
+        Returns a subclass of a file handler type whose log files count the bytes written against the
+        output quota.  The log writes are never refused, a log file keeps being written after the hard
+        limit is reached.
+
+        :param handler_type: The :class:`logging.FileHandler` type to track the writes of.
+
+        :returns: The quota tracked subclass of the handler type.
+    """
+    tracked_type = QUOTA_TRACKED_HANDLER_TYPES.get(handler_type)
+
+    if tracked_type is None:
+
+        def _open(self):
+            stream = handler_type._open(self) # pylint: disable=protected-access
+            tracked = QuotaTrackedFile(stream, get_output_quota(), self.baseFilename, enforce=False)
+            return tracked
+
+        tracked_type = type("QuotaTracked" + handler_type.__name__, (handler_type,), { "_open": _open })
+        QUOTA_TRACKED_HANDLER_TYPES[handler_type] = tracked_type
+
+    return tracked_type
@@ -0,0 +1,282 @@
+"""
+.. module:: reload
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`RuntimeReloader` object which is used to reload the
+               log levels and a declared subset of the runtime variables of a running process.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import Dict, FrozenSet, Iterable, Optional
+
+import json
+import logging
+import os
+import threading
+
+from mojo.runtime.sighandlers import SignalHandlerSlot
+
+# The runtime variables that can be changed by a reload of a running process.
+RELOADABLE_VARIABLES = frozenset([
+    "MJR_DEBUG_BREAKPOINTS",
+    "MJR_DEBUG_DEBUGGER",
+    "MJR_LOG_LEVEL_CONSOLE",
+    "MJR_LOG_LEVEL_FILE"
+])
+
+RELOAD_LOCK = threading.Lock()
+
+
+class RuntimeReloader:
+    """
+        The :class:`RuntimeReloader` reloads the runtime configuration of a running process when the
+        process receives SIGHUP or when the contents of a reload file change.
+
+        The reload file contains assignments of the reloadable runtime variables, either as a JSON
+        object or as 'NAME=VALUE' lines.  A reload applies the variables in the file as runtime
+        overrides, applies the log levels to the handlers that are already installed and reopens the
+        log files, so debug logging can be turned on for a running service without a restart.
+    """
+
+    def __init__(self, reload_file: Optional[str] = None, poll_interval: float = 2.0,
+                 reloadable: Iterable[str] = RELOADABLE_VARIABLES):
+        self._reload_file = reload_file
+        self._poll_interval = poll_interval
+        self._reloadable = frozenset(reloadable)
+
+        self._file_state = None
+        self._reload_count = 0
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._signal = SignalHandlerSlot("runtime reload", "SIGHUP", self._reload_on_signal)
+        return
+
+    @property
+    def reload_count(self) -> int:
+        return self._reload_count
+
+    @property
+    def reload_file(self) -> Optional[str]:
+        return self._reload_file
+
+    def install_signal_handler(self, signum: Optional[int] = None) -> bool:
+        """
+            Installs a signal handler that triggers a reload, SIGHUP by default.  The reload is run on a
+            separate thread so the interrupted code is not re-entered while it is holding a logging lock.
+
+            :param signum: The signal to trigger reloads with.
+
+            :returns: True if the handler was installed, when called from a thread other than the main
+                      thread the install is deferred until :func:`mojo.runtime.sighandlers.install_pending_signal_handlers`
+                      is called.
+        """
+        installed = self._signal.install(signum)
+        return installed
+
+    def reload(self) -> FrozenSet[str]:
+        """
+            Reloads the runtime configuration from the reload file, applies the log levels to the
+            installed handlers and reopens the log files.
+
+            :returns: The set of the runtime variables that were changed by the reload.
+        """
+        with RELOAD_LOCK:
+            values = {}
+            if self._reload_file is not None and os.path.exists(self._reload_file):
+                self._file_state = self._get_file_state()
+                values = read_reload_file(self._reload_file)
+
+            changed = reload_runtime_configuration(values, reloadable=self._reloadable)
+            self._reload_count += 1
+
+        return changed
+
+    def start(self):
+        """
+            Starts the thread that watches the reload file for changes.
+        """
+        if self._reload_file is not None:
+            self._file_state = self._get_file_state()
+
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._watch_loop, name="mjr-reload-watcher", daemon=True)
+            self._thread.start()
+
+        return
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """
+            Stops the reload file watcher and restores the signal handler that was replaced.
+
+            :param timeout: The maximum number of seconds to wait for the watcher thread.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+        self.uninstall_signal_handler()
+        return
+
+    def uninstall_signal_handler(self):
+        """
+            Restores the signal handler that was replaced by :meth:`install_signal_handler`.
+        """
+        self._signal.uninstall()
+        return
+
+    def _get_file_state(self):
+        try:
+            fstat = os.stat(self._reload_file)
+            file_state = (fstat.st_mtime_ns, fstat.st_size)
+        except OSError:
+            file_state = None
+        return file_state
+
+    def _reload_safely(self):
+        try:
+            changed = self.reload()
+            logger = logging.getLogger()
+            logger.info("The runtime configuration was reloaded. changed=%s", sorted(changed))
+        except Exception as err: # pylint: disable=broad-except
+            logger = logging.getLogger()
+            logger.error("Failed to reload the runtime configuration. error=%s", err)
+        return
+
+    def _reload_on_signal(self, signum, frame): # pylint: disable=unused-argument
+        reload_thread = threading.Thread(target=self._reload_safely, name="mjr-reload", daemon=True)
+        reload_thread.start()
+        return
+
+    def _watch_loop(self):
+
+        while not self._stop_event.wait(self._poll_interval):
+            file_state = self._get_file_state()
+            if file_state is not None and file_state != self._file_state:
+                self._reload_safely()
+
+        return
+
+
+RUNTIME_RELOADER: Optional[RuntimeReloader] = None
+
+
+def get_runtime_reloader() -> Optional[RuntimeReloader]:
+    """
+        Returns the runtime reloader of the current process or None if reloading is not enabled.
+    """
+    return RUNTIME_RELOADER
+
+def read_reload_file(reload_file: str) -> Dict[str, str]:
+    """
+        Reads the variable assignments from a reload file.  The file can be a JSON object or a list of
+        'NAME=VALUE' lines, blank lines and lines starting with '#' are ignored.
+
+        :param reload_file: The path of the reload file.
+
+        :returns: A dictionary of variable names to values.
+    """
+    with open(reload_file, 'r') as rf:
+        content = rf.read()
+
+    if content.lstrip().startswith("{"):
+        values = json.loads(content)
+    else:
+        values = {}
+        for lineno, line in enumerate(content.splitlines(), start=1):
+            line = line.strip()
+            if len(line) == 0 or line.startswith("#"):
+                continue
+            if "=" not in line:
+                errmsg = "Invalid line in reload file, expected NAME=VALUE. file={} line={}".format(reload_file, lineno)
+                raise ValueError(errmsg)
+            var_name, var_value = line.split("=", 1)
+            values[var_name.strip()] = var_value.strip()
+
+    return values
+
+def reload_runtime_configuration(values: Dict[str, str], reloadable: Iterable[str] = RELOADABLE_VARIABLES,
+                                 reopen_logs: bool = True) -> FrozenSet[str]:
+    """
+        Applies reloaded runtime variables to a running process.  The variables are applied as a single
+        override transaction, then the current log levels are applied to the installed handlers and
+        the log files are reopened.
+
+        :param values: A dictionary of variable names to values.
+        :param reloadable: The variables that are allowed to be changed by a reload.
+        :param reopen_logs: Reopen the log files after the log levels are applied.
+
+        :returns: The set of the runtime variables that were changed.
+    """
+    from mojo.runtime.logcontrol import apply_log_levels, flush_log_handlers, reopen_log_files
+    from mojo.runtime.optionoverrides import MOJO_RUNTIME_OPTION_OVERRIDES
+    from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES
+
+    not_reloadable = sorted([var_name for var_name in values if var_name not in reloadable])
+    if len(not_reloadable) > 0:
+        errmsg_lines = [
+            "The reload contains variables that cannot be reloaded.",
+            "    {}".format(", ".join(not_reloadable))
+        ]
+        errmsg = os.linesep.join(errmsg_lines)
+        raise ValueError(errmsg)
+
+    changed = MOJO_RUNTIME_OPTION_OVERRIDES.apply_overrides(values)
+
+    # The in-flight records are written out before the handlers are changed.
+    flush_log_handlers()
+
+    apply_log_levels(console_level=MOJO_RUNTIME_VARIABLES.MJR_LOG_LEVEL_CONSOLE,
+                     file_level=MOJO_RUNTIME_VARIABLES.MJR_LOG_LEVEL_FILE)
+
+    if reopen_logs:
+        reopen_log_files()
+
+    return changed
+
+def start_runtime_reloader(reload_file: Optional[str] = None, use_signal: bool = True,
+                           poll_interval: float = 2.0) -> RuntimeReloader:
+    """
+        Starts reloading the runtime configuration of the current process on SIGHUP and when the
+        reload file changes.
+
+        :param reload_file: The reload file to watch and read the variables from.
+        :param use_signal: Install the SIGHUP signal handler.
+        :param poll_interval: The number of seconds between checks of the reload file.
+
+        :returns: The runtime reloader for the current process.
+    """
+    global RUNTIME_RELOADER
+
+    stop_runtime_reloader()
+
+    reloader = RuntimeReloader(reload_file=reload_file, poll_interval=poll_interval)
+    if use_signal:
+        reloader.install_signal_handler()
+    reloader.start()
+
+    RUNTIME_RELOADER = reloader
+
+    return reloader
+
+def stop_runtime_reloader():
+    """
+        Stops the runtime reloader for the current process.
+    """
+    global RUNTIME_RELOADER
+
+    if RUNTIME_RELOADER is not None:
+        reloader = RUNTIME_RELOADER
+        RUNTIME_RELOADER = None
+
+        reloader.stop()
+
+    return
@@ -0,0 +1,204 @@
+"""
+.. module:: runtimecontext
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`RuntimeContext` object which is used to run
+               multiple isolated jobs concurrently in the same process.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Callable, Iterator, Optional
+
+import contextvars
+import os
+import threading
+import uuid
+
+from contextlib import contextmanager
+
+CURRENT_RUNTIME_CONTEXT: contextvars.ContextVar = contextvars.ContextVar("mjr_runtime_context", default=None)
+
+
+class RuntimeContext:
+    """
+        The :class:`RuntimeContext` holds the job identity and output directory of an isolated job.
+        While a runtime context is current for a thread or asyncio task, the job and pipeline getters
+        in :mod:`mojo.runtime.integration` and the output path getters in :mod:`mojo.runtime.paths`
+        resolve against the runtime context instead of the process-wide runtime.
+
+        Any job or pipeline field that is not provided is inherited from the process-wide runtime
+        variables, except for the job id which defaults to a new unique id.
+    """
+
+    def __init__(self, job_id: Optional[str] = None, output_directory: Optional[str] = None, run_id: Optional[str] = None,
+                 job_initiator: Optional[str] = None, job_label: Optional[str] = None, job_name: Optional[str] = None,
+                 job_owner: Optional[str] = None, job_type: Optional[str] = None, job_venue: Optional[str] = None,
+                 pipeline_id: Optional[str] = None, pipeline_instance: Optional[str] = None, pipeline_name: Optional[str] = None):
+
+        from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES
+
+        if job_id is None:
+            job_id = str(uuid.uuid4())
+
+        self._job_id = job_id
+        self._run_id = run_id if run_id is not None else MOJO_RUNTIME_VARIABLES.MJR_RUN_ID
+
+        self._job_initiator = job_initiator if job_initiator is not None else MOJO_RUNTIME_VARIABLES.MJR_JOB_INITIATOR
+        self._job_label = job_label if job_label is not None else MOJO_RUNTIME_VARIABLES.MJR_JOB_LABEL
+        self._job_name = job_name if job_name is not None else MOJO_RUNTIME_VARIABLES.MJR_JOB_NAME
+        self._job_owner = job_owner if job_owner is not None else MOJO_RUNTIME_VARIABLES.MJR_JOB_OWNER
+        self._job_type = job_type if job_type is not None else MOJO_RUNTIME_VARIABLES.MJR_JOB_TYPE
+        self._job_venue = job_venue if job_venue is not None else MOJO_RUNTIME_VARIABLES.MJR_JOB_VENUE
+
+        self._pipeline_id = pipeline_id if pipeline_id is not None else MOJO_RUNTIME_VARIABLES.MJR_PIPELINE_ID
+        self._pipeline_instance = pipeline_instance if pipeline_instance is not None else MOJO_RUNTIME_VARIABLES.MJR_PIPELINE_INSTANCE
+        self._pipeline_name = pipeline_name if pipeline_name is not None else MOJO_RUNTIME_VARIABLES.MJR_PIPELINE_NAME
+
+        if output_directory is not None:
+            output_directory = os.path.abspath(os.path.expandvars(os.path.expanduser(output_directory)))
+
+        self._output_directory = output_directory
+        self._job_info = None
+        self._pipeline_info = None
+        self._output_directory_created = False
+        self._lock = threading.Lock()
+        return
+
+    @property
+    def job_id(self) -> str:
+        return self._job_id
+
+    @property
+    def job_initiator(self) -> str:
+        return self._job_initiator
+
+    @property
+    def job_label(self) -> str:
+        return self._job_label
+
+    @property
+    def job_name(self) -> str:
+        return self._job_name
+
+    @property
+    def job_owner(self) -> str:
+        return self._job_owner
+
+    @property
+    def job_type(self) -> str:
+        return self._job_type
+
+    @property
+    def job_venue(self) -> str:
+        return self._job_venue
+
+    @property
+    def pipeline_id(self) -> str:
+        return self._pipeline_id
+
+    @property
+    def pipeline_instance(self) -> str:
+        return self._pipeline_instance
+
+    @property
+    def pipeline_name(self) -> str:
+        return self._pipeline_name
+
+    @property
+    def run_id(self) -> str:
+        return self._run_id
+
+    def get_job_info(self) -> "JobInfo":
+        """
+            Returns the :class:`JobInfo` snapshot with the job fields of the runtime context.
+        """
+        if self._job_info is None:
+            from mojo.runtime.integration import JobInfo
+
+            self._job_info = JobInfo(id=self._job_id, initiator=self._job_initiator, label=self._job_label,
+                                     name=self._job_name, owner=self._job_owner, type=self._job_type,
+                                     venue=self._job_venue)
+
+        return self._job_info
+
+    def get_pipeline_info(self) -> "PipelineInfo":
+        """
+            Returns the :class:`PipelineInfo` snapshot with the pipeline fields of the runtime context.
+        """
+        if self._pipeline_info is None:
+            from mojo.runtime.integration import PipelineInfo
+
+            self._pipeline_info = PipelineInfo(id=self._pipeline_id, instance=self._pipeline_instance,
+                                               name=self._pipeline_name)
+
+        return self._pipeline_info
+
+    def get_path_for_output(self, create: bool = True) -> str:
+        """
+            Returns the output directory of the runtime context.  When an output directory was not
+            provided, the output directory is the 'jobs/(job_id)' directory under the process output
+            directory.
+        """
+        if self._output_directory is None:
+            from mojo.runtime.paths import get_path_for_process_output
+
+            with self._lock:
+                if self._output_directory is None:
+                    process_output = get_path_for_process_output(create=create)
+                    self._output_directory = os.path.join(process_output, "jobs", self._job_id)
+
+        if create and not self._output_directory_created:
+            with self._lock:
+                if not self._output_directory_created:
+                    os.makedirs(self._output_directory, exist_ok=True)
+                    self._output_directory_created = True
+
+        return self._output_directory
+
+    def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+            Runs a function with this runtime context as the current runtime context.  This is
+            used to run the work of an isolated job on a thread pool.
+        """
+        run_ctx = contextvars.copy_context()
+        rtnval = run_ctx.run(_run_in_runtime_context, self, func, args, kwargs)
+        return rtnval
+
+
+def get_current_runtime_context() -> Optional[RuntimeContext]:
+    """
+        Returns the runtime context that is current for the calling thread or asyncio task, or None
+        if the caller is using the process-wide runtime.
+    """
+    rtnval = CURRENT_RUNTIME_CONTEXT.get()
+    return rtnval
+
+@contextmanager
+def isolated_runtime(runtime_context: Optional[RuntimeContext] = None, **kwargs) -> Iterator[RuntimeContext]:
+    """
+        A context manager that makes a runtime context current for the calling thread or asyncio task.
+        Tasks that are created inside the block inherit the runtime context.
+
+        :param runtime_context: The runtime context to make current, if not provided a new runtime
+                                context is created from the keyword arguments.
+    """
+    if runtime_context is None:
+        runtime_context = RuntimeContext(**kwargs)
+
+    token = CURRENT_RUNTIME_CONTEXT.set(runtime_context)
+    try:
+        yield runtime_context
+    finally:
+        CURRENT_RUNTIME_CONTEXT.reset(token)
+
+    return
+
+def _run_in_runtime_context(runtime_context: RuntimeContext, func: Callable, args: tuple, kwargs: dict) -> Any:
+    CURRENT_RUNTIME_CONTEXT.set(runtime_context)
+    rtnval = func(*args, **kwargs)
+    return rtnval
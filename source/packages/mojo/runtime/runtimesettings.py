@@ -11,7 +11,7 @@ __copyright__ = "Copyright 2023, Myron W Walker"
 __credits__ = []
 
 
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from mojo.startup.presencesettings import MOJO_PRESENCE_DEFAULTS
 from mojo.startup.wellknown import StartupConfigSingleton
@@ -21,6 +21,8 @@ from mojo.config.configurationsettings import (
     establish_config_settings
 )
 
+from mojo.runtime.enumerations import ActivationProfile
+
 default_config = {}
 
 startup_config = StartupConfigSingleton()
@@ -32,20 +34,36 @@ class MOJO_RUNTIME_DEFAULTS(MOJO_CONFIG_DEFAULTS):
     MJR_LOGGER_NAME = "MJR"
     MJR_SERVICE_NAME = None
 
+    # The (soft, hard) byte limits for the output directory quota of each activation
+    # profile.  A limit of `None` means the limit is not enforced.  The defaults only set
+    # soft limits, so crossing them is reported without failing the job.  The defaults can
+    # be replaced with the `output_quota_limits` parameter of `initialize_runtime`, and the
+    # MJR_OUTPUT_QUOTA_SOFT and MJR_OUTPUT_QUOTA_HARD variables take precedence over them.
+    MJR_OUTPUT_QUOTA_LIMITS = {
+        ActivationProfile.Command: (1024 ** 3, None),
+        ActivationProfile.Console: (1024 ** 3, None),
+        ActivationProfile.Orchestration: (20 * 1024 ** 3, None),
+        ActivationProfile.Service: (2 * 1024 ** 3, None),
+        ActivationProfile.TestRun: (10 * 1024 ** 3, None)
+    }
+
 
 RUNTIME_SETTINGS_ESTABLISHED = False
 
 def establish_runtime_settings(*, name: Optional[str]=None, home_dir: Optional[str]=None, settings_file: Optional[str]=None,
                                extension_modules: Optional[str]=None, logger_name: Optional[str]=None, default_configuration: dict=None,
-                               service_name: Optional[str]=None, **other):
+                               service_name: Optional[str]=None,
+                               output_quota_limits: Optional[Dict[ActivationProfile, Tuple[Optional[int], Optional[int]]]]=None,
+                               **other):
     
     global RUNTIME_SETTINGS_ESTABLISHED
 
     if not RUNTIME_SETTINGS_ESTABLISHED:
         RUNTIME_SETTINGS_ESTABLISHED = True
 
-        establish_config_settings(name=name, home_dir=home_dir, settings_file=settings_file, extension_modules=extension_modules,
-                                  default_configuration=default_configuration, **other)
+        establish_config_settings(name=name, home_dir=home_dir, settings_file=settings_file,
+                                  extension_modules=extension_modules, default_configuration=default_configuration,
+                                  **other)
 
         if logger_name is not None:
             MOJO_RUNTIME_DEFAULTS.MJR_LOGGER_NAME = logger_name
@@ -55,4 +73,10 @@ def establish_runtime_settings(*, name: Optional[str]=None, home_dir: Optional[s
         if service_name is not None:
             MOJO_RUNTIME_DEFAULTS.MJR_SERVICE_NAME = service_name
 
+        if output_quota_limits is not None:
+            quota_limits = dict(MOJO_RUNTIME_DEFAULTS.MJR_OUTPUT_QUOTA_LIMITS)
+            for profile, limits in output_quota_limits.items():
+                quota_limits[ActivationProfile(profile)] = tuple(limits)
+            MOJO_RUNTIME_DEFAULTS.MJR_OUTPUT_QUOTA_LIMITS = quota_limits
+
     return
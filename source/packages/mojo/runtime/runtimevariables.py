@@ -15,6 +15,7 @@ __credits__ = []
 from typing import List, Optional
 
 import os
+import threading
 
 from datetime import datetime
 from uuid import uuid4
@@ -30,9 +31,12 @@ from mojo.xmods.xdatetime import (
 )
 from mojo.xmods.xlogging.levels import LogLevel
 
-from mojo.runtime.enumerations import JobType
+from mojo.runtime.enumerations import (
+    JobType, LogCompression, OutputLayout, OutputStripingPolicy, ShardMergeMode, WatchdogPolicy
+)
 
 from mojo.runtime.runtimesettings import MOJO_RUNTIME_DEFAULTS
+from mojo.runtime.striping import parse_output_roots
 from mojo.runtime.variablenames import MOJO_RUNTIME_VARNAMES
 
 
@@ -45,6 +49,36 @@ def normalize_variable_whitespace(lval):
     return lval
 
 
+def parse_byte_count(sval: str) -> int:
+    """
+        Parses a count of bytes that can be expressed with an optional K, M, G or T
+        binary unit suffix, such as '512M' or '10G'.
+    """
+    multipliers = {
+        "K": 1024,
+        "M": 1024 ** 2,
+        "G": 1024 ** 3,
+        "T": 1024 ** 4
+    }
+
+    normalized = sval.strip().upper()
+    if normalized.endswith("B"):
+        normalized = normalized[:-1]
+
+    multiplier = 1
+    if len(normalized) > 0 and normalized[-1] in multipliers:
+        multiplier = multipliers[normalized[-1]]
+        normalized = normalized[:-1]
+
+    try:
+        count = int(float(normalized) * multiplier)
+    except ValueError:
+        errmsg = "Invalid byte count value. value={}".format(sval)
+        raise ValueError(errmsg) from None
+
+    return count
+
+
 class DefaultValue:
     NotSet = "(not-set)"
 
@@ -58,10 +92,50 @@ class MOJO_RUNTIME_VARIABLES(MOJO_CONFIG_VARIABLES):
     MJR_LOGGER_NAME = MOJO_RUNTIME_DEFAULTS.MJR_LOGGER_NAME
 
     MJR_OUTPUT_DIRECTORY = None
+    MJR_OUTPUT_QUOTA_HARD = None
+    MJR_OUTPUT_QUOTA_SOFT = None
+    MJR_OUTPUT_ROOTS = None
+    MJR_OUTPUT_STAGING_DIRECTORY = None
+    MJR_OUTPUT_STAGING_FLUSH_INTERVAL = 30.0
+    MJR_OUTPUT_STAGING_FLUSH_TIMEOUT = 300.0
+    MJR_OUTPUT_STAGING_WORKERS = 4
+    MJR_OUTPUT_STRIPING_POLICY = OutputStripingPolicy.RoundRobin
 
     MJR_HAS_SHARED_OUTPUT_DIRECTORY = False
+    MJR_SHARED_OUTPUT_LAYOUT = OutputLayout.Flat
+    MJR_SHARD_MERGE_MODE = ShardMergeMode.Manifest
     MJR_SHARED_STORE_DIRECTORY = None
 
+    MJR_SCRATCH_DIRECTORY = None
+
+    MJR_SHARED_IO_MAX_STALLED = 4
+    MJR_SHARED_IO_RETRIES = 3
+    MJR_SHARED_IO_TIMEOUT = 30.0
+    MJR_SHARED_IO_WORKERS = 4
+
+    MJR_TELEMETRY_ENABLED = False
+    MJR_TELEMETRY_INTERVAL = 1.0
+
+    MJR_TRACING_ENABLED = False
+
+    MJR_WATCHDOG_CAPTURE_MEMORY = False
+    MJR_WATCHDOG_CAPTURE_PROFILE = False
+    MJR_WATCHDOG_POLICY = WatchdogPolicy.Dump
+    MJR_WATCHDOG_TIMEOUT = None
+
+    MJR_PROFILER_ENABLED = False
+    MJR_PROFILER_INTERVAL = 0.01
+    MJR_PROFILER_SIGNAL = False
+
+    MJR_RELOAD_FILE = None
+    MJR_RELOAD_POLL_INTERVAL = 2.0
+    MJR_RELOAD_SIGNAL = False
+
+    MJR_MEMORY_RSS_LIMIT = None
+    MJR_MEMORY_SIGNAL = False
+    MJR_MEMORY_TRACE_FRAMES = 1
+    MJR_MEMORY_TRACING = False
+
     MJR_ACTIVATION_PROFILE = None
 
     MJR_AUTOMATION_POD = DefaultValue.NotSet
@@ -96,6 +170,15 @@ class MOJO_RUNTIME_VARIABLES(MOJO_CONFIG_VARIABLES):
     MJR_LOG_LEVEL_CONSOLE = LogLevel.WARNING
     MJR_LOG_LEVEL_FILE = LogLevel.DEBUG
 
+    MJR_LOG_BINARY_ENABLED = False
+    MJR_LOG_BINARY_RING_RECORDS = 4096
+    MJR_LOG_COMPRESSION = None
+    MJR_LOG_DEDUP = False
+    MJR_LOG_RATE_BURST = 20
+    MJR_LOG_RATE_LIMIT = None
+    MJR_LOG_RETENTION_BYTES = None
+    MJR_LOG_SUMMARY_INTERVAL = 30.0
+
     MJR_RESULTS_STATIC_SUMMARY_TEMPLATE = None
     MJR_RESULTS_STATIC_RESOURCE_DEST_DIR = None
     MJR_RESULTS_STATIC_RESOURCE_SRC_DIR = None
@@ -104,6 +187,30 @@ class MOJO_RUNTIME_VARIABLES(MOJO_CONFIG_VARIABLES):
 
     MJR_TESTROOT = None
 
+# The runtime info version is bumped whenever a job, pipeline or run field is changed so the cached
+# job and pipeline info snapshots in :mod:`mojo.runtime.integration` know to rebuild.
+RUNTIME_INFO_VERSION = 0
+RUNTIME_INFO_VERSION_LOCK = threading.Lock()
+
+
+def bump_runtime_info_version() -> int:
+    """
+        Increments the runtime info version, invalidating the cached job and pipeline info snapshots.
+
+        :returns: The new runtime info version.
+    """
+    global RUNTIME_INFO_VERSION
+
+    with RUNTIME_INFO_VERSION_LOCK:
+        RUNTIME_INFO_VERSION += 1
+        version = RUNTIME_INFO_VERSION
+
+    return version
+
+def get_runtime_info_version() -> int:
+    rtnval = RUNTIME_INFO_VERSION
+    return rtnval
+
 def get_runtime_seed() -> str:
     rtnval = MOJO_RUNTIME_VARIABLES.MJR_JOB_SEED
     return rtnval
@@ -131,16 +238,176 @@ def resolve_runtime_variables():
         MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_DIRECTORY = environ[MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_DIRECTORY]
     ctx.insert(ContextPaths.OUTPUT_DIRECTORY, MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_DIRECTORY)
 
+    MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_SOFT = None
+    if MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_QUOTA_SOFT in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_SOFT = parse_byte_count(environ[MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_QUOTA_SOFT])
+
+    MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_HARD = None
+    if MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_QUOTA_HARD in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_QUOTA_HARD = parse_byte_count(environ[MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_QUOTA_HARD])
+
+    MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_ROOTS = None
+    if MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_ROOTS in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_ROOTS = parse_output_roots(environ[MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_ROOTS])
+
+    MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_DIRECTORY = None
+    if MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STAGING_DIRECTORY in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_DIRECTORY = environ[MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STAGING_DIRECTORY]
+
+    MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_FLUSH_INTERVAL = 30.0
+    if MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STAGING_FLUSH_INTERVAL in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_FLUSH_INTERVAL = float(environ[MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STAGING_FLUSH_INTERVAL])
+
+    MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_FLUSH_TIMEOUT = 300.0
+    if MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STAGING_FLUSH_TIMEOUT in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_FLUSH_TIMEOUT = float(environ[MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STAGING_FLUSH_TIMEOUT])
+
+    MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_WORKERS = 4
+    if MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STAGING_WORKERS in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STAGING_WORKERS = int(environ[MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STAGING_WORKERS])
+
+    MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STRIPING_POLICY = OutputStripingPolicy.RoundRobin
+    if MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STRIPING_POLICY in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_OUTPUT_STRIPING_POLICY = OutputStripingPolicy(environ[MOJO_RUNTIME_VARNAMES.MJR_OUTPUT_STRIPING_POLICY])
+
     MOJO_RUNTIME_VARIABLES.MJR_SHARED_STORE_DIRECTORY = None
     if MOJO_RUNTIME_VARNAMES.MJR_SHARED_STORE_DIRECTORY in environ:
         MOJO_RUNTIME_VARIABLES.MJR_SHARED_STORE_DIRECTORY = environ[MOJO_RUNTIME_VARNAMES.MJR_SHARED_STORE_DIRECTORY]
     ctx.insert(ContextPaths.SHARED_STORE_DIRECTORY, MOJO_RUNTIME_VARIABLES.MJR_SHARED_STORE_DIRECTORY)
+
+    MOJO_RUNTIME_VARIABLES.MJR_SCRATCH_DIRECTORY = None
+    if MOJO_RUNTIME_VARNAMES.MJR_SCRATCH_DIRECTORY in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_SCRATCH_DIRECTORY = environ[MOJO_RUNTIME_VARNAMES.MJR_SCRATCH_DIRECTORY]
+
+    MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_MAX_STALLED = 4
+    if MOJO_RUNTIME_VARNAMES.MJR_SHARED_IO_MAX_STALLED in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_MAX_STALLED = int(environ[MOJO_RUNTIME_VARNAMES.MJR_SHARED_IO_MAX_STALLED])
+
+    MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_RETRIES = 3
+    if MOJO_RUNTIME_VARNAMES.MJR_SHARED_IO_RETRIES in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_RETRIES = int(environ[MOJO_RUNTIME_VARNAMES.MJR_SHARED_IO_RETRIES])
+
+    MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_TIMEOUT = 30.0
+    if MOJO_RUNTIME_VARNAMES.MJR_SHARED_IO_TIMEOUT in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_TIMEOUT = float(environ[MOJO_RUNTIME_VARNAMES.MJR_SHARED_IO_TIMEOUT])
+
+    MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_WORKERS = 4
+    if MOJO_RUNTIME_VARNAMES.MJR_SHARED_IO_WORKERS in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_SHARED_IO_WORKERS = int(environ[MOJO_RUNTIME_VARNAMES.MJR_SHARED_IO_WORKERS])
+
+    MOJO_RUNTIME_VARIABLES.MJR_TELEMETRY_ENABLED = False
+    if MOJO_RUNTIME_VARNAMES.MJR_TELEMETRY_ENABLED in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_TELEMETRY_ENABLED = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_TELEMETRY_ENABLED])
+
+    MOJO_RUNTIME_VARIABLES.MJR_TELEMETRY_INTERVAL = 1.0
+    if MOJO_RUNTIME_VARNAMES.MJR_TELEMETRY_INTERVAL in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_TELEMETRY_INTERVAL = float(environ[MOJO_RUNTIME_VARNAMES.MJR_TELEMETRY_INTERVAL])
+
+    MOJO_RUNTIME_VARIABLES.MJR_TRACING_ENABLED = False
+    if MOJO_RUNTIME_VARNAMES.MJR_TRACING_ENABLED in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_TRACING_ENABLED = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_TRACING_ENABLED])
+
+    MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_CAPTURE_MEMORY = False
+    if MOJO_RUNTIME_VARNAMES.MJR_WATCHDOG_CAPTURE_MEMORY in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_CAPTURE_MEMORY = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_WATCHDOG_CAPTURE_MEMORY])
+
+    MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_CAPTURE_PROFILE = False
+    if MOJO_RUNTIME_VARNAMES.MJR_WATCHDOG_CAPTURE_PROFILE in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_CAPTURE_PROFILE = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_WATCHDOG_CAPTURE_PROFILE])
+
+    MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_POLICY = WatchdogPolicy.Dump
+    if MOJO_RUNTIME_VARNAMES.MJR_WATCHDOG_POLICY in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_POLICY = WatchdogPolicy(environ[MOJO_RUNTIME_VARNAMES.MJR_WATCHDOG_POLICY])
+
+    MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_TIMEOUT = None
+    if MOJO_RUNTIME_VARNAMES.MJR_WATCHDOG_TIMEOUT in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_WATCHDOG_TIMEOUT = float(environ[MOJO_RUNTIME_VARNAMES.MJR_WATCHDOG_TIMEOUT])
+
+    MOJO_RUNTIME_VARIABLES.MJR_PROFILER_ENABLED = False
+    if MOJO_RUNTIME_VARNAMES.MJR_PROFILER_ENABLED in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_PROFILER_ENABLED = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_PROFILER_ENABLED])
+
+    MOJO_RUNTIME_VARIABLES.MJR_PROFILER_INTERVAL = 0.01
+    if MOJO_RUNTIME_VARNAMES.MJR_PROFILER_INTERVAL in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_PROFILER_INTERVAL = float(environ[MOJO_RUNTIME_VARNAMES.MJR_PROFILER_INTERVAL])
+
+    MOJO_RUNTIME_VARIABLES.MJR_PROFILER_SIGNAL = False
+    if MOJO_RUNTIME_VARNAMES.MJR_PROFILER_SIGNAL in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_PROFILER_SIGNAL = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_PROFILER_SIGNAL])
+
+    MOJO_RUNTIME_VARIABLES.MJR_MEMORY_RSS_LIMIT = None
+    if MOJO_RUNTIME_VARNAMES.MJR_MEMORY_RSS_LIMIT in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_MEMORY_RSS_LIMIT = parse_byte_count(environ[MOJO_RUNTIME_VARNAMES.MJR_MEMORY_RSS_LIMIT])
+
+    MOJO_RUNTIME_VARIABLES.MJR_MEMORY_SIGNAL = False
+    if MOJO_RUNTIME_VARNAMES.MJR_MEMORY_SIGNAL in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_MEMORY_SIGNAL = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_MEMORY_SIGNAL])
+
+    MOJO_RUNTIME_VARIABLES.MJR_MEMORY_TRACE_FRAMES = 1
+    if MOJO_RUNTIME_VARNAMES.MJR_MEMORY_TRACE_FRAMES in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_MEMORY_TRACE_FRAMES = int(environ[MOJO_RUNTIME_VARNAMES.MJR_MEMORY_TRACE_FRAMES])
+
+    MOJO_RUNTIME_VARIABLES.MJR_MEMORY_TRACING = False
+    if MOJO_RUNTIME_VARNAMES.MJR_MEMORY_TRACING in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_MEMORY_TRACING = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_MEMORY_TRACING])
+
+    MOJO_RUNTIME_VARIABLES.MJR_LOG_BINARY_ENABLED = False
+    if MOJO_RUNTIME_VARNAMES.MJR_LOG_BINARY_ENABLED in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_LOG_BINARY_ENABLED = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_LOG_BINARY_ENABLED])
+
+    MOJO_RUNTIME_VARIABLES.MJR_LOG_BINARY_RING_RECORDS = 4096
+    if MOJO_RUNTIME_VARNAMES.MJR_LOG_BINARY_RING_RECORDS in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_LOG_BINARY_RING_RECORDS = int(environ[MOJO_RUNTIME_VARNAMES.MJR_LOG_BINARY_RING_RECORDS])
+
+    MOJO_RUNTIME_VARIABLES.MJR_LOG_COMPRESSION = None
+    if MOJO_RUNTIME_VARNAMES.MJR_LOG_COMPRESSION in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_LOG_COMPRESSION = LogCompression(environ[MOJO_RUNTIME_VARNAMES.MJR_LOG_COMPRESSION])
+
+    MOJO_RUNTIME_VARIABLES.MJR_LOG_DEDUP = False
+    if MOJO_RUNTIME_VARNAMES.MJR_LOG_DEDUP in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_LOG_DEDUP = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_LOG_DEDUP])
+
+    MOJO_RUNTIME_VARIABLES.MJR_LOG_RATE_BURST = 20
+    if MOJO_RUNTIME_VARNAMES.MJR_LOG_RATE_BURST in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_LOG_RATE_BURST = int(environ[MOJO_RUNTIME_VARNAMES.MJR_LOG_RATE_BURST])
+
+    MOJO_RUNTIME_VARIABLES.MJR_LOG_RATE_LIMIT = None
+    if MOJO_RUNTIME_VARNAMES.MJR_LOG_RATE_LIMIT in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_LOG_RATE_LIMIT = float(environ[MOJO_RUNTIME_VARNAMES.MJR_LOG_RATE_LIMIT])
+
+    MOJO_RUNTIME_VARIABLES.MJR_LOG_RETENTION_BYTES = None
+    if MOJO_RUNTIME_VARNAMES.MJR_LOG_RETENTION_BYTES in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_LOG_RETENTION_BYTES = parse_byte_count(environ[MOJO_RUNTIME_VARNAMES.MJR_LOG_RETENTION_BYTES])
+
+    MOJO_RUNTIME_VARIABLES.MJR_LOG_SUMMARY_INTERVAL = 30.0
+    if MOJO_RUNTIME_VARNAMES.MJR_LOG_SUMMARY_INTERVAL in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_LOG_SUMMARY_INTERVAL = float(environ[MOJO_RUNTIME_VARNAMES.MJR_LOG_SUMMARY_INTERVAL])
+
+    MOJO_RUNTIME_VARIABLES.MJR_RELOAD_FILE = None
+    if MOJO_RUNTIME_VARNAMES.MJR_RELOAD_FILE in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_RELOAD_FILE = environ[MOJO_RUNTIME_VARNAMES.MJR_RELOAD_FILE]
+
+    MOJO_RUNTIME_VARIABLES.MJR_RELOAD_POLL_INTERVAL = 2.0
+    if MOJO_RUNTIME_VARNAMES.MJR_RELOAD_POLL_INTERVAL in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_RELOAD_POLL_INTERVAL = float(environ[MOJO_RUNTIME_VARNAMES.MJR_RELOAD_POLL_INTERVAL])
+
+    MOJO_RUNTIME_VARIABLES.MJR_RELOAD_SIGNAL = False
+    if MOJO_RUNTIME_VARNAMES.MJR_RELOAD_SIGNAL in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_RELOAD_SIGNAL = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_RELOAD_SIGNAL])
     
     MOJO_RUNTIME_VARIABLES.MJR_HAS_SHARED_OUTPUT_DIRECTORY = False
     if MOJO_RUNTIME_VARNAMES.MJR_HAS_SHARED_OUTPUT_DIRECTORY in environ:
         MOJO_RUNTIME_VARIABLES.MJR_HAS_SHARED_OUTPUT_DIRECTORY = parse_bool(environ[MOJO_RUNTIME_VARNAMES.MJR_HAS_SHARED_OUTPUT_DIRECTORY])
     ctx.insert(ContextPaths.OUTPUT_DIRECTORY_IS_SHARED, MOJO_RUNTIME_VARIABLES.MJR_HAS_SHARED_OUTPUT_DIRECTORY)
 
+    MOJO_RUNTIME_VARIABLES.MJR_SHARED_OUTPUT_LAYOUT = OutputLayout.Flat
+    if MOJO_RUNTIME_VARNAMES.MJR_SHARED_OUTPUT_LAYOUT in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_SHARED_OUTPUT_LAYOUT = OutputLayout(environ[MOJO_RUNTIME_VARNAMES.MJR_SHARED_OUTPUT_LAYOUT])
+
+    MOJO_RUNTIME_VARIABLES.MJR_SHARD_MERGE_MODE = ShardMergeMode.Manifest
+    if MOJO_RUNTIME_VARNAMES.MJR_SHARD_MERGE_MODE in environ:
+        MOJO_RUNTIME_VARIABLES.MJR_SHARD_MERGE_MODE = ShardMergeMode(environ[MOJO_RUNTIME_VARNAMES.MJR_SHARD_MERGE_MODE])
+
     MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE = None
     if MOJO_RUNTIME_VARNAMES.MJR_ACTIVATION_PROFILE in environ:
         MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE = environ[MOJO_RUNTIME_VARNAMES.MJR_ACTIVATION_PROFILE]
@@ -275,4 +542,6 @@ def resolve_runtime_variables():
     if MOJO_RUNTIME_VARNAMES.MJR_TESTROOT in environ:
         MOJO_RUNTIME_VARIABLES.MJR_TESTROOT = environ[MOJO_RUNTIME_VARNAMES.MJR_TESTROOT]
 
-    return
\ No newline at end of file
+    bump_runtime_info_version()
+
+    return
@@ -0,0 +1,332 @@
+"""
+.. module:: sharding
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the functions that implement the sharded layout of a shared
+               output directory and the merge step that builds the unified view of the shards.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, Iterator, Optional, Tuple
+
+import json
+import logging
+import os
+import shutil
+import socket
+import time
+
+from datetime import datetime
+
+from mojo.runtime.enumerations import ShardMergeMode
+
+SHARDS_DIRNAME = "shards"
+SHARD_COMPLETE_MARKER = ".mjr-shard-complete"
+SHARD_MANIFEST_FILENAME = "shard-manifest.jsonl"
+SHARD_MERGE_LOCK_FILENAME = ".mjr-shard-merge.lock"
+SHARD_MERGE_LOCK_POLL_INTERVAL = 0.1
+SHARD_MERGE_LOCK_TIMEOUT = 300.0
+
+TRANSLATE_TABLE_NORMALIZE_FOR_SHARD = str.maketrans(",.:;/\\ ", "_______")
+
+DIR_SHARD_DIRECTORY = None
+DIR_UNIFIED_DIRECTORY = None
+
+
+def complete_output_shard(mode: ShardMergeMode = ShardMergeMode.Manifest) -> bool:
+    """
+        Marks the shard of the current process complete and, when every shard of the unified output
+        directory is complete, merges the shards.  This is run when the process exits, so the last
+        process of the job to complete builds the unified view.  A process that completes after a
+        merge merges again, which updates the unified view with its shard.
+
+        :param mode: The mode used to build the unified view.
+
+        :returns: True if the shards were merged by the current process.
+    """
+    merged = False
+
+    unified_dir = DIR_UNIFIED_DIRECTORY
+
+    if DIR_SHARD_DIRECTORY is not None and os.path.isdir(DIR_SHARD_DIRECTORY):
+        mark_shard_complete()
+
+        if is_output_sharding_complete(unified_dir):
+            try:
+                merge_output_shards(unified_dir, mode=mode)
+                merged = True
+            except (OSError, TimeoutError) as err:
+                logger = logging.getLogger()
+                logger.error("Failed to merge the output shards, run merge_output_shards to merge them. unified_dir=%s error=%s",
+                             unified_dir, err)
+
+    return merged
+
+def configure_output_sharding(unified_dir: str, shard_name: Optional[str] = None) -> str:
+    """
+        Configures the current process to write its output under its own shard of a shared
+        output directory.
+
+        :param unified_dir: The shared output directory that the shards are created under.
+        :param shard_name: An optional name for the shard, defaults to the hostname and process id.
+
+        :returns: The path of the shard directory for the current process.
+    """
+    global DIR_SHARD_DIRECTORY
+    global DIR_UNIFIED_DIRECTORY
+
+    if shard_name is None:
+        shard_name = get_shard_name()
+
+    DIR_UNIFIED_DIRECTORY = unified_dir
+    DIR_SHARD_DIRECTORY = os.path.join(unified_dir, SHARDS_DIRNAME, shard_name)
+
+    return DIR_SHARD_DIRECTORY
+
+def get_path_for_shard() -> Optional[str]:
+    """
+        Returns the shard directory of the current process or None if the output directory is not sharded.
+    """
+    return DIR_SHARD_DIRECTORY
+
+def get_path_for_unified_output() -> Optional[str]:
+    """
+        Returns the unified output directory the shards are merged into or None if the output
+        directory is not sharded.
+    """
+    return DIR_UNIFIED_DIRECTORY
+
+def get_shard_name() -> str:
+    """
+        Returns the name of the shard for the current process, which is made up of the hostname
+        and the process id so that every process on every node has a unique shard.
+    """
+    hostname = socket.gethostname().translate(TRANSLATE_TABLE_NORMALIZE_FOR_SHARD)
+    shard_name = "{}-{}".format(hostname, os.getpid())
+    return shard_name
+
+def is_output_sharding_complete(unified_dir: str) -> bool:
+    """
+        Returns True if every shard of a unified output directory has been marked complete.
+
+        :param unified_dir: The unified output directory the shards were created under.
+    """
+    complete = False
+
+    shards_dir = os.path.join(unified_dir, SHARDS_DIRNAME)
+    if os.path.isdir(shards_dir):
+        complete = True
+        with os.scandir(shards_dir) as shard_entries:
+            for shard_entry in shard_entries:
+                if shard_entry.is_dir(follow_symlinks=False) and \
+                    not os.path.exists(os.path.join(shard_entry.path, SHARD_COMPLETE_MARKER)):
+                    complete = False
+                    break
+
+    return complete
+
+def iter_shard_files(unified_dir: str) -> Iterator[Tuple[str, str, os.stat_result]]:
+    """
+        Walks the shards of a unified output directory one directory at a time and yields a tuple
+        of (shard name, path relative to the shard, stat result) for each file.
+
+        :param unified_dir: The unified output directory the shards were created under.
+    """
+    shards_dir = os.path.join(unified_dir, SHARDS_DIRNAME)
+
+    if os.path.isdir(shards_dir):
+        with os.scandir(shards_dir) as shard_entries:
+            for shard_entry in shard_entries:
+                if not shard_entry.is_dir(follow_symlinks=False):
+                    continue
+
+                shard_name = shard_entry.name
+                shard_dir = shard_entry.path
+
+                for root, _, files in os.walk(shard_dir):
+                    for fname in files:
+                        if root == shard_dir and fname == SHARD_COMPLETE_MARKER:
+                            continue
+
+                        fullpath = os.path.join(root, fname)
+                        relpath = os.path.relpath(fullpath, shard_dir)
+                        fstat = os.stat(fullpath, follow_symlinks=False)
+
+                        yield shard_name, relpath, fstat
+
+    return
+
+def mark_shard_complete():
+    """
+        Writes the completion marker into the shard of the current process.  The merge step uses
+        the marker to report shards that are still being written.
+    """
+    if DIR_SHARD_DIRECTORY is not None and os.path.isdir(DIR_SHARD_DIRECTORY):
+        marker_file = os.path.join(DIR_SHARD_DIRECTORY, SHARD_COMPLETE_MARKER)
+        with open(marker_file, 'w') as mf:
+            mf.write(datetime.now().isoformat())
+
+    return
+
+def merge_output_shards(unified_dir: str, mode: ShardMergeMode = ShardMergeMode.Manifest,
+                        lock_timeout: float = SHARD_MERGE_LOCK_TIMEOUT) -> int:
+    """
+        Builds the unified view of the shards of a shared output directory.  The shards are streamed
+        one file at a time so the merge does not need to hold the list of files in memory.
+
+        * Manifest - Writes a manifest file with a line for each file in the shards.
+        * Symlink - Writes the manifest and creates a symlink in the unified directory for each file.
+        * Copy - Writes the manifest and copies each file into the unified directory.
+
+        When the same relative path exists in more than one shard, the path in the unified directory
+        is suffixed with the name of the shard.
+
+        The merge can be run again, the paths recorded in the manifest of the previous merge are
+        reused and the entries that already point at, or are a current copy of, their shard file are
+        left alone.  The merge holds a lock file in the unified directory so the processes of a job
+        that complete at the same time do not merge concurrently.
+
+        :param unified_dir: The unified output directory the shards were created under.
+        :param mode: The mode used to build the unified view.
+        :param lock_timeout: The maximum number of seconds to wait for the merge lock.
+
+        :returns: The number of files that were merged.
+    """
+    logger = logging.getLogger()
+
+    mode = ShardMergeMode(mode)
+
+    shards_dir = os.path.join(unified_dir, SHARDS_DIRNAME)
+    if os.path.isdir(shards_dir):
+        for shard_name in os.listdir(shards_dir):
+            marker_file = os.path.join(shards_dir, shard_name, SHARD_COMPLETE_MARKER)
+            if not os.path.exists(marker_file):
+                logger.warning("Merging an output shard that was not marked complete. shard={}".format(shard_name))
+
+    merged_count = 0
+
+    manifest_file = os.path.join(unified_dir, SHARD_MANIFEST_FILENAME)
+    manifest_partial = manifest_file + ".partial"
+
+    lock_file = _acquire_merge_lock(unified_dir, lock_timeout)
+    try:
+        previous_paths = _read_merged_paths(manifest_file)
+
+        with open(manifest_partial, 'w') as mf:
+            for shard_name, relpath, fstat in iter_shard_files(unified_dir):
+
+                unified_relpath = relpath
+
+                if mode != ShardMergeMode.Manifest:
+                    shard_file = os.path.join(shards_dir, shard_name, relpath)
+
+                    unified_relpath = previous_paths.get((shard_name, relpath), None)
+                    if unified_relpath is None:
+                        unified_relpath = relpath
+                        unified_file = os.path.join(unified_dir, unified_relpath)
+                        if os.path.lexists(unified_file) and not _is_merged_from(unified_file, shard_file, fstat, mode):
+                            unified_relpath = "{}.{}".format(relpath, shard_name)
+
+                    unified_file = os.path.join(unified_dir, unified_relpath)
+                    if not _is_merged_from(unified_file, shard_file, fstat, mode):
+                        _merge_shard_file(unified_file, shard_file, mode)
+
+                entry = {
+                    "path": unified_relpath,
+                    "shard": shard_name,
+                    "shard_path": relpath,
+                    "size": fstat.st_size,
+                    "mtime": fstat.st_mtime
+                }
+                mf.write(json.dumps(entry))
+                mf.write("\n")
+
+                merged_count += 1
+
+        os.replace(manifest_partial, manifest_file)
+
+    finally:
+        os.remove(lock_file)
+
+    return merged_count
+
+def reset_output_sharding():
+    """
+        Clears the sharding configuration of the current process.
+    """
+    global DIR_SHARD_DIRECTORY
+    global DIR_UNIFIED_DIRECTORY
+
+    DIR_SHARD_DIRECTORY = None
+    DIR_UNIFIED_DIRECTORY = None
+
+    return
+
+def _acquire_merge_lock(unified_dir: str, timeout: float) -> str:
+    lock_file = os.path.join(unified_dir, SHARD_MERGE_LOCK_FILENAME)
+
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            lock_fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(lock_fd, "{} {}".format(socket.gethostname(), os.getpid()).encode("utf-8"))
+            os.close(lock_fd)
+            break
+        except FileExistsError:
+            if time.monotonic() >= deadline:
+                errmsg = "Timed out waiting for the shard merge lock, remove the lock if its owner has exited. lock={}".format(
+                    lock_file)
+                raise TimeoutError(errmsg)
+            time.sleep(SHARD_MERGE_LOCK_POLL_INTERVAL)
+
+    return lock_file
+
+def _is_merged_from(unified_file: str, shard_file: str, fstat: os.stat_result, mode: ShardMergeMode) -> bool:
+    merged = False
+
+    if mode == ShardMergeMode.Symlink:
+        merged = os.path.islink(unified_file) and os.path.realpath(unified_file) == os.path.realpath(shard_file)
+    elif os.path.isfile(unified_file) and not os.path.islink(unified_file):
+        ustat = os.stat(unified_file)
+        merged = ustat.st_size == fstat.st_size and ustat.st_mtime_ns == fstat.st_mtime_ns
+
+    return merged
+
+def _merge_shard_file(unified_file: str, shard_file: str, mode: ShardMergeMode):
+    os.makedirs(os.path.dirname(unified_file), exist_ok=True)
+
+    # The entry is created under a temporary name and renamed over any stale entry.
+    unified_partial = "{}.mjr-partial-{}".format(unified_file, os.getpid())
+
+    if mode == ShardMergeMode.Symlink:
+        link_target = os.path.relpath(shard_file, os.path.dirname(unified_file))
+        os.symlink(link_target, unified_partial)
+    else:
+        shutil.copy2(shard_file, unified_partial)
+
+    os.replace(unified_partial, unified_file)
+
+    return
+
+def _read_merged_paths(manifest_file: str) -> Dict[Tuple[str, str], str]:
+    merged_paths = {}
+
+    try:
+        with open(manifest_file, 'r') as mf:
+            for line in mf:
+                entry = json.loads(line)
+                merged_paths[(entry["shard"], entry["shard_path"])] = entry["path"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError) as err:
+        logger = logging.getLogger()
+        logger.warning("Ignoring the unreadable manifest of the previous shard merge. manifest=%s error=%s", manifest_file, err)
+        merged_paths = {}
+
+    return merged_paths
@@ -0,0 +1,486 @@
+"""
+.. module:: sharedio
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`SharedIOExecutor` object which is used to run the
+               filesystem operations on shared storage paths without blocking the caller indefinitely.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Callable, Dict, List, Optional
+
+import asyncio
+import bisect
+import errno
+import logging
+import os
+import queue
+import threading
+import time
+
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from mojo.runtime.exceptions import SharedStorageTimeoutError
+
+RETRIABLE_ERRNOS = set([
+    errno.EAGAIN,
+    errno.EBUSY,
+    errno.EINTR,
+    errno.EIO,
+    errno.ETIMEDOUT,
+    getattr(errno, "ESTALE", errno.EIO)
+])
+
+LATENCY_BUCKET_BOUNDS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0]
+
+# The number of seconds an idle worker thread waits for work before it exits.
+SHARED_IO_WORKER_IDLE_TIMEOUT = 60.0
+
+
+class LatencyHistogram:
+    """
+        A fixed bucket histogram of the latencies of a shared storage operation.
+    """
+
+    def __init__(self, bounds: List[float] = LATENCY_BUCKET_BOUNDS):
+        self._bounds = list(bounds)
+        self._counts = [0] * (len(bounds) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._maximum = 0.0
+        self._timeouts = 0
+        self._lock = threading.Lock()
+        return
+
+    def record(self, latency: float):
+        index = bisect.bisect_left(self._bounds, latency)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._total += latency
+            if latency > self._maximum:
+                self._maximum = latency
+        return
+
+    def record_timeout(self):
+        with self._lock:
+            self._timeouts += 1
+        return
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+            Returns a dictionary with the bucket counts and the summary statistics of the histogram.
+        """
+        with self._lock:
+            buckets = {}
+            for bound, count in zip(self._bounds, self._counts):
+                buckets["<={}".format(bound)] = count
+            buckets[">{}".format(self._bounds[-1])] = self._counts[-1]
+
+            mean = 0.0
+            if self._count > 0:
+                mean = self._total / self._count
+
+            info = {
+                "count": self._count,
+                "mean": mean,
+                "max": self._maximum,
+                "timeouts": self._timeouts,
+                "buckets": buckets
+            }
+
+        return info
+
+
+class SharedIOExecutor:
+    """
+        The :class:`SharedIOExecutor` runs metadata operations for shared storage paths on a small pool
+        of worker threads with a timeout, so a stalled mount causes the caller to fail fast with a
+        :class:`SharedStorageTimeoutError` instead of hanging.  Operations that fail with a transient
+        error are retried with exponential backoff, operations that time out are not retried.
+
+        The pool runs up to `max_workers` attempts at a time.  A worker that is stuck in a stalled
+        filesystem call does not count against the pool, so it never holds up the operations on other
+        paths.  While a stuck attempt has not returned, the operations on its path and on the paths
+        below it fail immediately, and once `max_stalled` attempts are stuck every operation fails
+        immediately.  The worker threads are daemon threads that exit after they have been idle for
+        a while, so a stuck worker never holds up the exit of the process.
+
+        .. note:: A thread that is stuck in a stalled filesystem call cannot be interrupted, the
+                  caller is released but the thread remains until the call returns.
+    """
+
+    def __init__(self, max_workers: int = 4, max_stalled: int = 4, timeout: float = 30.0, retries: int = 3,
+                 backoff: float = 0.5, backoff_max: float = 8.0):
+        self._max_workers = max_workers
+        self._max_stalled = max_stalled
+        self._timeout = timeout
+        self._retries = retries
+        self._backoff = backoff
+        self._backoff_max = backoff_max
+
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._histograms_lock = threading.Lock()
+
+        # The attempts that timed out and have not returned, mapped to the path they operate on.
+        self._stalled: Dict[Future, Optional[str]] = {}
+        self._stalled_lock = threading.Lock()
+
+        self._work_queue = queue.SimpleQueue()
+        self._worker_count = 0
+        self._idle_count = 0
+        self._workers_lock = threading.Lock()
+        return
+
+    @property
+    def stalled_count(self) -> int:
+        return len(self._stalled)
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    @property
+    def worker_count(self) -> int:
+        return self._worker_count
+
+    def get_latency_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """
+            Returns a snapshot of the latency histograms of the operations run by the executor.
+        """
+        with self._histograms_lock:
+            histograms = dict(self._histograms)
+
+        snapshots = {}
+        for op_name, histogram in histograms.items():
+            snapshots[op_name] = histogram.snapshot()
+
+        return snapshots
+
+    def run(self, func: Callable, *args, op_name: Optional[str] = None, timeout: Optional[float] = None,
+            retries: Optional[int] = None) -> Any:
+        """
+            Runs a filesystem operation on a worker thread and blocks until it completes, until it
+            times out or until the retries of its transient errors are exhausted.
+
+            :param func: The filesystem operation to run.
+            :param op_name: The name of the operation used for the latency histograms.
+            :param timeout: The timeout in seconds for each attempt of the operation.
+            :param retries: The number of times to retry an operation that fails with a transient error.
+
+            :returns: The result of the operation.
+        """
+        op_name, timeout, retries = self._resolve_parameters(func, op_name, timeout, retries)
+        histogram = self._get_histogram(op_name)
+        path = self._get_operation_path(args)
+
+        last_error = None
+
+        for attempt in range(retries + 1):
+            if attempt > 0:
+                time.sleep(self._get_backoff(attempt))
+
+            future = self._start_attempt(op_name, path, histogram, func, *args)
+            try:
+                result = future.result(timeout=timeout)
+                return result
+            except FutureTimeoutError:
+                self._mark_stalled(future, path)
+                histogram.record_timeout()
+                self._raise_timeout(op_name, args, timeout)
+            except OSError as oserr:
+                if not self._is_retriable(oserr):
+                    raise
+                last_error = oserr
+
+        raise last_error
+
+    async def run_async(self, func: Callable, *args, op_name: Optional[str] = None, timeout: Optional[float] = None,
+                        retries: Optional[int] = None) -> Any:
+        """
+            Runs a filesystem operation on a worker thread and awaits its completion without blocking
+            the event loop.  The timeouts and retries behave the same as :meth:`run`.
+        """
+        op_name, timeout, retries = self._resolve_parameters(func, op_name, timeout, retries)
+        histogram = self._get_histogram(op_name)
+        path = self._get_operation_path(args)
+
+        last_error = None
+
+        for attempt in range(retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(self._get_backoff(attempt))
+
+            future = self._start_attempt(op_name, path, histogram, func, *args)
+            try:
+                result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=timeout)
+                return result
+            except asyncio.TimeoutError:
+                self._mark_stalled(future, path)
+                histogram.record_timeout()
+                self._raise_timeout(op_name, args, timeout)
+            except OSError as oserr:
+                if not self._is_retriable(oserr):
+                    raise
+                last_error = oserr
+
+        raise last_error
+
+    def exists(self, path: str, **kwargs) -> bool:
+        rtnval = self.run(os.path.exists, path, op_name="exists", **kwargs)
+        return rtnval
+
+    async def exists_async(self, path: str, **kwargs) -> bool:
+        rtnval = await self.run_async(os.path.exists, path, op_name="exists", **kwargs)
+        return rtnval
+
+    def makedirs(self, path: str, **kwargs):
+        self.run(_makedirs_exist_ok, path, op_name="makedirs", **kwargs)
+        return
+
+    async def makedirs_async(self, path: str, **kwargs):
+        await self.run_async(_makedirs_exist_ok, path, op_name="makedirs", **kwargs)
+        return
+
+    def shutdown(self):
+        """
+            Forgets the stalled attempts and stops the idle worker threads.  The workers that are
+            stuck in a stalled call exit when the call returns.
+        """
+        with self._stalled_lock:
+            self._stalled.clear()
+
+        with self._workers_lock:
+            for _ in range(self._worker_count):
+                self._work_queue.put(None)
+
+        return
+
+    def _check_stalled(self, op_name: str, path: Optional[str]):
+        with self._stalled_lock:
+            stalled_paths = list(self._stalled.values())
+
+        if len(stalled_paths) >= self._max_stalled:
+            errmsg_lines = [
+                "Too many shared storage operations are stalled, the operation was not started.",
+                "    OPERATION: {}".format(op_name),
+                "    PATH: {}".format(path),
+                "    STALLED: {}".format(len(stalled_paths))
+            ]
+            errmsg = os.linesep.join(errmsg_lines)
+            raise SharedStorageTimeoutError(errmsg)
+
+        if path is not None:
+            for stalled_path in stalled_paths:
+                if stalled_path is not None and (path == stalled_path or path.startswith(stalled_path + os.sep)):
+                    errmsg_lines = [
+                        "An earlier operation on the shared storage path is stalled, the operation was not started.",
+                        "    OPERATION: {}".format(op_name),
+                        "    PATH: {}".format(path),
+                        "    STALLED PATH: {}".format(stalled_path)
+                    ]
+                    errmsg = os.linesep.join(errmsg_lines)
+                    raise SharedStorageTimeoutError(errmsg)
+
+        return
+
+    def _get_backoff(self, attempt: int) -> float:
+        backoff = min(self._backoff * (2 ** (attempt - 1)), self._backoff_max)
+        return backoff
+
+    def _get_histogram(self, op_name: str) -> LatencyHistogram:
+        with self._histograms_lock:
+            if op_name in self._histograms:
+                histogram = self._histograms[op_name]
+            else:
+                histogram = LatencyHistogram()
+                self._histograms[op_name] = histogram
+        return histogram
+
+    def _get_operation_path(self, args: tuple) -> Optional[str]:
+        path = None
+        if len(args) > 0 and isinstance(args[0], (str, os.PathLike)):
+            path = os.path.abspath(os.fspath(args[0]))
+        return path
+
+    def _is_retriable(self, oserr: OSError) -> bool:
+        retriable = oserr.errno in RETRIABLE_ERRNOS
+        return retriable
+
+    def _mark_stalled(self, future: Future, path: Optional[str]):
+        # An attempt that timed out while it was waiting for a worker is cancelled, it never ran so
+        # it is not stalled.
+        if not future.cancel():
+            with self._stalled_lock:
+                # An attempt that returned right after its timeout is not stalled.
+                if not future.done():
+                    self._stalled[future] = path
+        return
+
+    def _raise_timeout(self, op_name: str, args: tuple, timeout: float):
+
+        errmsg_lines = [
+            "The shared storage operation did not complete in time.",
+            "    OPERATION: {}".format(op_name),
+            "    ARGS: {}".format(args),
+            "    TIMEOUT: {}".format(timeout)
+        ]
+        errmsg = os.linesep.join(errmsg_lines)
+
+        logger = logging.getLogger()
+        logger.error(errmsg)
+
+        raise SharedStorageTimeoutError(errmsg)
+
+    def _resolve_parameters(self, func: Callable, op_name: Optional[str], timeout: Optional[float], retries: Optional[int]):
+        if op_name is None:
+            op_name = getattr(func, "__name__", "operation")
+        if timeout is None:
+            timeout = self._timeout
+        if retries is None:
+            retries = self._retries
+        return op_name, timeout, retries
+
+    def _start_attempt(self, op_name: str, path: Optional[str], histogram: LatencyHistogram, func: Callable, *args) -> Future:
+
+        self._check_stalled(op_name, path)
+
+        future = Future()
+
+        with self._workers_lock:
+            self._work_queue.put((future, histogram, func, args))
+
+            # The stalled workers are not counted against the pool, so the operations that are
+            # queued behind a stalled worker still get a worker.
+            with self._stalled_lock:
+                stalled_count = len(self._stalled)
+
+            if self._work_queue.qsize() > self._idle_count and self._worker_count - stalled_count < self._max_workers:
+                self._worker_count += 1
+                self._idle_count += 1
+                worker = threading.Thread(target=self._worker_loop, name="mjr-sharedio-worker", daemon=True)
+                worker.start()
+
+        return future
+
+    def _worker_loop(self):
+
+        while True:
+            try:
+                work_item = self._work_queue.get(timeout=SHARED_IO_WORKER_IDLE_TIMEOUT)
+            except queue.Empty:
+                with self._workers_lock:
+                    # Work is only queued while holding the lock, so an empty queue here means no
+                    # operation is waiting for this worker.
+                    if self._work_queue.empty():
+                        self._worker_count -= 1
+                        self._idle_count -= 1
+                        break
+                continue
+
+            if work_item is None:
+                with self._workers_lock:
+                    self._worker_count -= 1
+                    self._idle_count -= 1
+                break
+
+            with self._workers_lock:
+                self._idle_count -= 1
+
+            future, histogram, func, args = work_item
+            if future.set_running_or_notify_cancel():
+                start = time.perf_counter()
+                try:
+                    result = func(*args)
+                    future.set_result(result)
+                except BaseException as err: # pylint: disable=broad-except
+                    future.set_exception(err)
+                finally:
+                    histogram.record(time.perf_counter() - start)
+                    with self._stalled_lock:
+                        self._stalled.pop(future, None)
+
+            with self._workers_lock:
+                self._idle_count += 1
+
+        return
+
+
+SHARED_IO_EXECUTOR: Optional[SharedIOExecutor] = None
+SHARED_IO_LOCK = threading.Lock()
+
+
+def configure_shared_io(max_workers: int = 4, max_stalled: int = 4, timeout: float = 30.0, retries: int = 3) -> SharedIOExecutor:
+    """
+        Configures the executor used for the operations on shared storage paths.
+
+        :param max_workers: The number of worker threads that run the operations.
+        :param max_stalled: The number of stalled operations after which every operation fails immediately.
+        :param timeout: The default timeout in seconds for each attempt of an operation.
+        :param retries: The default number of times to retry an operation.
+
+        :returns: The newly configured executor.
+    """
+    global SHARED_IO_EXECUTOR
+
+    with SHARED_IO_LOCK:
+        if SHARED_IO_EXECUTOR is not None:
+            SHARED_IO_EXECUTOR.shutdown()
+
+        SHARED_IO_EXECUTOR = SharedIOExecutor(max_workers=max_workers, max_stalled=max_stalled, timeout=timeout,
+                                              retries=retries)
+
+    return SHARED_IO_EXECUTOR
+
+def get_shared_io_executor() -> SharedIOExecutor:
+    """
+        Returns the executor used for the operations on shared storage paths, a default executor is
+        created if one has not been configured.
+    """
+    global SHARED_IO_EXECUTOR
+
+    with SHARED_IO_LOCK:
+        if SHARED_IO_EXECUTOR is None:
+            SHARED_IO_EXECUTOR = SharedIOExecutor()
+
+    return SHARED_IO_EXECUTOR
+
+def shared_exists(path: str, timeout: Optional[float] = None) -> bool:
+    """
+        Checks if a path on shared storage exists, failing with a :class:`SharedStorageTimeoutError`
+        if the storage does not respond in time.
+    """
+    rtnval = get_shared_io_executor().exists(path, timeout=timeout)
+    return rtnval
+
+async def shared_exists_async(path: str, timeout: Optional[float] = None) -> bool:
+    """
+        Checks if a path on shared storage exists without blocking the event loop.
+    """
+    rtnval = await get_shared_io_executor().exists_async(path, timeout=timeout)
+    return rtnval
+
+def shared_makedirs(path: str, timeout: Optional[float] = None):
+    """
+        Creates a directory on shared storage if it does not already exist, failing with a
+        :class:`SharedStorageTimeoutError` if the storage does not respond in time.
+    """
+    get_shared_io_executor().makedirs(path, timeout=timeout)
+    return
+
+async def shared_makedirs_async(path: str, timeout: Optional[float] = None):
+    """
+        Creates a directory on shared storage if it does not already exist without blocking the event loop.
+    """
+    await get_shared_io_executor().makedirs_async(path, timeout=timeout)
+    return
+
+def _makedirs_exist_ok(path: str):
+    os.makedirs(path, exist_ok=True)
+    return
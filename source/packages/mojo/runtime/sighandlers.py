@@ -0,0 +1,138 @@
+"""
+.. module:: sighandlers
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`SignalHandlerSlot` that is used by the runtime features
+               to install and restore their signal handlers.  Python only allows signal handlers to be
+               installed from the main thread, a slot that is installed from another thread, such as
+               the worker thread of :func:`mojo.runtime.activation.activate_runtime_async`, is deferred
+               until :func:`install_pending_signal_handlers` is called from the main thread.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Callable, List, Optional, Tuple
+
+import logging
+import signal
+import threading
+
+
+class SignalHandlerSlot:
+    """
+        The :class:`SignalHandlerSlot` installs the signal handler of a runtime feature and keeps the
+        handler it replaced so it can be restored.
+    """
+
+    def __init__(self, description: str, default_signal: str, handler: Callable):
+        """
+            :param description: The name of the feature used in the log messages.
+            :param default_signal: The name of the signal used when no signal number is given.
+            :param handler: The signal handler, it should hand the work off to another thread.
+        """
+        self._description = description
+        self._default_signal = default_signal
+        self._handler = handler
+        self._installed: Optional[Tuple[int, object]] = None
+        return
+
+    @property
+    def installed(self) -> bool:
+        return self._installed is not None
+
+    @property
+    def signum(self) -> Optional[int]:
+        signum = None
+        if self._installed is not None:
+            signum = self._installed[0]
+        return signum
+
+    def install(self, signum: Optional[int] = None) -> bool:
+        """
+            Installs the signal handler.  When called from a thread other than the main thread, the
+            install is deferred until :func:`install_pending_signal_handlers` is called.
+
+            :param signum: The signal to install the handler for, defaults to the default signal of the slot.
+
+            :returns: True if the handler was installed, False if it was deferred or the platform
+                      does not have the signal.
+        """
+        if signum is None:
+            signum = getattr(signal, self._default_signal, None)
+
+        installed = False
+
+        if signum is None:
+            logger = logging.getLogger()
+            logger.warning("The %s signal handler was not installed, the platform does not have %s.",
+                           self._description, self._default_signal)
+
+        elif threading.current_thread() is threading.main_thread():
+            self.uninstall()
+
+            previous_handler = signal.signal(signum, self._handler)
+            self._installed = (signum, previous_handler)
+            installed = True
+
+        else:
+            with PENDING_SIGNAL_HANDLERS_LOCK:
+                PENDING_SIGNAL_HANDLERS[:] = [(slot, snum) for slot, snum in PENDING_SIGNAL_HANDLERS if slot is not self]
+                PENDING_SIGNAL_HANDLERS.append((self, signum))
+
+            logger = logging.getLogger()
+            logger.info("The %s signal handler is deferred until install_pending_signal_handlers is called "
+                        "from the main thread. thread=%s", self._description, threading.current_thread().name)
+
+        return installed
+
+    def uninstall(self):
+        """
+            Restores the signal handler that was replaced by :meth:`install` and cancels a deferred install.
+        """
+        with PENDING_SIGNAL_HANDLERS_LOCK:
+            PENDING_SIGNAL_HANDLERS[:] = [(slot, snum) for slot, snum in PENDING_SIGNAL_HANDLERS if slot is not self]
+
+        if self._installed is not None:
+            if threading.current_thread() is threading.main_thread():
+                signum, previous_handler = self._installed
+                self._installed = None
+
+                signal.signal(signum, previous_handler if previous_handler is not None else signal.SIG_DFL)
+            else:
+                logger = logging.getLogger()
+                logger.warning("The %s signal handler was not restored, signal handlers can only be restored "
+                               "from the main thread. thread=%s", self._description, threading.current_thread().name)
+
+        return
+
+
+PENDING_SIGNAL_HANDLERS: List[Tuple[SignalHandlerSlot, int]] = []
+PENDING_SIGNAL_HANDLERS_LOCK = threading.Lock()
+
+
+def install_pending_signal_handlers() -> int:
+    """
+        Installs the signal handlers whose install was deferred because they were installed from a
+        thread other than the main thread.  This must be called from the main thread.
+
+        :returns: The number of signal handlers that were installed.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        errmsg = "Signal handlers can only be installed from the main thread. thread={}".format(
+            threading.current_thread().name)
+        raise RuntimeError(errmsg)
+
+    with PENDING_SIGNAL_HANDLERS_LOCK:
+        pending = list(PENDING_SIGNAL_HANDLERS)
+        PENDING_SIGNAL_HANDLERS.clear()
+
+    install_count = 0
+    for slot, signum in pending:
+        if slot.install(signum):
+            install_count += 1
+
+    return install_count
@@ -0,0 +1,483 @@
+"""
+.. module:: staging
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`OutputStager` object which is used to stage the
+               output directory on node-local storage and to write it back to its destination.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Dict, List, Optional, Tuple
+
+import json
+import logging
+import os
+import queue
+import shutil
+import socket
+import threading
+import time
+
+from concurrent.futures import Future, wait
+from datetime import datetime
+
+STAGING_MANIFEST_FILENAME = ".mjr-staging.json"
+
+
+class OutputStager:
+    """
+        The :class:`OutputStager` points the output directory at a node-local staging directory,
+        such as a tmpfs mount, and writes files back to the real destination of the output directory
+        in the background using a bounded pool of worker threads.  Files are written back when they
+        are committed with :meth:`commit_file`, and a watcher thread writes back the files that changed
+        and have not been modified for a flush interval, so the destination stays current while the
+        job runs.
+
+        The workers are daemon threads that are managed by the stager instead of a thread pool
+        executor, whose threads are joined at interpreter exit.  A copy that is stuck on a stalled
+        destination is abandoned when the final flush times out, so the timeout bounds the shutdown.
+
+        A manifest is written into the staging directory so the staged output of a job that
+        crashed can be found with :func:`find_staged_outputs` and written back with
+        :func:`recover_staged_output`.
+    """
+
+    def __init__(self, staging_dir: str, destination_dir: str, max_workers: int = 4,
+                 flush_interval: Optional[float] = None):
+        self._staging_dir = staging_dir
+        self._destination_dir = destination_dir
+        self._max_workers = max_workers
+        self._flush_interval = flush_interval
+
+        self._work_queue = queue.SimpleQueue()
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._pending: List[Future] = []
+        self._queued: Dict[str, Future] = {}
+        self._committed: Dict[str, Tuple[int, int]] = {}
+        self._errors: Dict[str, str] = {}
+
+        self._watcher = None
+        self._stop_event = threading.Event()
+        return
+
+    @property
+    def destination_dir(self) -> str:
+        return self._destination_dir
+
+    @property
+    def errors(self) -> List[str]:
+        with self._lock:
+            errors = list(self._errors.values())
+        return errors
+
+    @property
+    def staging_dir(self) -> str:
+        return self._staging_dir
+
+    def start(self, job_id: Optional[str] = None):
+        """
+            Creates the staging directory, writes the staging manifest and starts the write-back workers.
+
+            :param job_id: The identifier of the job that owns the staged output.
+        """
+        os.makedirs(self._staging_dir, exist_ok=True)
+
+        manifest = {
+            "destination": self._destination_dir,
+            "hostname": socket.gethostname(),
+            "job_id": job_id,
+            "pid": os.getpid(),
+            "started": datetime.now().isoformat(),
+            "flushed": False
+        }
+        self._write_manifest(manifest)
+
+        self.resume()
+
+        return
+
+    def resume(self):
+        """
+            Starts the write-back workers and the watcher for an existing staging directory without
+            rewriting the staging manifest.  This is used when recovering the staged output of another process.
+        """
+        # Each start gets its own work queue, so the workers abandoned by an earlier shutdown never
+        # pick up the new work.
+        self._work_queue = queue.SimpleQueue()
+
+        for windex in range(self._max_workers):
+            worker = threading.Thread(target=self._worker_loop, args=(self._work_queue,), name="mjr-staging-{}".format(windex),
+                                      daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        if self._flush_interval is not None and self._flush_interval > 0:
+            self._stop_event.clear()
+            self._watcher = threading.Thread(target=self._watch_loop, name="mjr-staging-watcher", daemon=True)
+            self._watcher.start()
+
+        return
+
+    def commit_file(self, path: str) -> Future:
+        """
+            Queues a completed file in the staging directory to be written back to the destination.
+
+            :param path: The path of the completed file, either full or relative to the staging directory.
+
+            :returns: A future that completes when the file has been written back.
+        """
+        if not os.path.isabs(path):
+            path = os.path.join(self._staging_dir, path)
+
+        relpath = os.path.relpath(path, self._staging_dir)
+        if relpath.startswith(os.pardir):
+            errmsg = "The file committed for write-back is not in the staging directory. path={} staging_dir={}".format(
+                path, self._staging_dir
+            )
+            raise ValueError(errmsg)
+
+        with self._lock:
+            if len(self._workers) == 0:
+                errmsg = "The output stager is not running. staging_dir={}".format(self._staging_dir)
+                raise RuntimeError(errmsg)
+
+            future = self._queued.get(relpath, None)
+            if future is None or future.done():
+                future = Future()
+                self._work_queue.put((future, relpath))
+                self._queued[relpath] = future
+                self._pending.append(future)
+
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+            Queues every file in the staging directory that has not been written back, or that
+            changed since it was written back, and waits for the write-back to complete.
+
+            :param timeout: The maximum number of seconds to wait for the write-back to complete.
+
+            :returns: True if all of the files were written back before the timeout.
+        """
+        self._commit_changed_files()
+
+        with self._lock:
+            pending = list(self._pending)
+
+        _, not_done = wait(pending, timeout=timeout)
+
+        with self._lock:
+            self._pending = [future for future in self._pending if not future.done()]
+            completed = len(not_done) == 0 and len(self._errors) == 0
+
+        return completed
+
+    def shutdown(self, timeout: Optional[float] = None, remove_staged: bool = True) -> bool:
+        """
+            Performs the final flush of the staging directory and stops the write-back workers.
+            The staging directory is only removed when all of the files were written back.
+
+            :param timeout: The maximum number of seconds to wait for the final flush.
+            :param remove_staged: Remove the staging directory after a successful flush.
+
+            :returns: True if all of the files were written back before the timeout.
+        """
+        if self._watcher is not None:
+            self._stop_event.set()
+            self._watcher.join()
+            self._watcher = None
+
+        completed = self.flush(timeout=timeout)
+
+        with self._lock:
+            workers = self._workers
+            self._workers = []
+
+            # The copies that have not started are cancelled, the copies that are still running
+            # are abandoned on their daemon threads so a stalled destination cannot hold up the exit.
+            if not completed:
+                for future in self._pending:
+                    future.cancel()
+
+        for _ in workers:
+            self._work_queue.put(None)
+
+        if completed:
+            for worker in workers:
+                worker.join()
+
+        if completed:
+            manifest = read_staging_manifest(self._staging_dir)
+            manifest["flushed"] = True
+            self._write_manifest(manifest)
+
+            if remove_staged:
+                shutil.rmtree(self._staging_dir, ignore_errors=True)
+        else:
+            logger = logging.getLogger()
+            logger.error("The staged output directory was not fully written back. staging_dir={} destination={}".format(
+                self._staging_dir, self._destination_dir))
+
+        return completed
+
+    def _commit_changed_files(self, settled_before: Optional[float] = None):
+        """
+            Commits the files in the staging directory that have not been written back or that changed
+            since they were written back.
+
+            :param settled_before: Only commit the files that were last modified before this time, so
+                                   files that are still being written are left for a later pass.
+        """
+        for root, _, files in os.walk(self._staging_dir):
+            for fname in files:
+                if root == self._staging_dir and fname == STAGING_MANIFEST_FILENAME:
+                    continue
+
+                fullpath = os.path.join(root, fname)
+                relpath = os.path.relpath(fullpath, self._staging_dir)
+
+                try:
+                    fstat = os.stat(fullpath)
+                except FileNotFoundError:
+                    continue
+
+                if settled_before is not None and fstat.st_mtime >= settled_before:
+                    continue
+
+                with self._lock:
+                    committed_stat = self._committed.get(relpath, None)
+
+                if committed_stat != (fstat.st_size, fstat.st_mtime_ns):
+                    self.commit_file(fullpath)
+
+        return
+
+    def _watch_loop(self):
+
+        while not self._stop_event.wait(self._flush_interval):
+            try:
+                self._commit_changed_files(settled_before=time.time() - self._flush_interval)
+            except Exception as err: # pylint: disable=broad-except
+                logger = logging.getLogger()
+                logger.error("The staging watcher failed to queue the write-back. staging_dir=%s error=%s",
+                             self._staging_dir, err)
+
+            with self._lock:
+                self._pending = [future for future in self._pending if not future.done()]
+
+        return
+
+    def _worker_loop(self, work_queue: queue.SimpleQueue):
+
+        while True:
+            work_item = work_queue.get()
+            if work_item is None:
+                break
+
+            future, relpath = work_item
+            if future.set_running_or_notify_cancel():
+                try:
+                    self._write_back_file(relpath)
+                    future.set_result(None)
+                except BaseException as err: # pylint: disable=broad-except
+                    future.set_exception(err)
+
+        return
+
+    def _write_back_file(self, relpath: str):
+        """
+            Copies a staged file to the destination.  The copy is written to a temporary name and
+            then renamed so a partially written file is never visible at the destination.
+        """
+        source = os.path.join(self._staging_dir, relpath)
+        destination = os.path.join(self._destination_dir, relpath)
+
+        try:
+            fstat = os.stat(source)
+
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+            destination_partial = "{}.mjr-partial-{}".format(destination, threading.get_ident())
+            shutil.copy2(source, destination_partial)
+            os.replace(destination_partial, destination)
+
+            with self._lock:
+                self._committed[relpath] = (fstat.st_size, fstat.st_mtime_ns)
+                # A file that failed to write back before is no longer an error once it is written back.
+                self._errors.pop(relpath, None)
+
+        except OSError as oserr:
+            errmsg = "Failed to write back staged file. source={} destination={} err={}".format(source, destination, oserr)
+            with self._lock:
+                self._errors[relpath] = errmsg
+            raise
+
+        return
+
+    def _write_manifest(self, manifest: dict):
+        manifest_file = os.path.join(self._staging_dir, STAGING_MANIFEST_FILENAME)
+        manifest_partial = manifest_file + ".partial"
+
+        with open(manifest_partial, 'w') as mf:
+            json.dump(manifest, mf, indent=4)
+        os.replace(manifest_partial, manifest_file)
+
+        return
+
+
+OUTPUT_STAGER: Optional[OutputStager] = None
+
+
+def find_staged_outputs(staging_root: str) -> List[dict]:
+    """
+        Finds the staged output directories under a staging root that have not been fully written
+        back to their destination.  This is used to find the output of jobs that crashed.
+
+        :param staging_root: The root directory that the staging directories were created under.
+
+        :returns: A list of the staging manifests, each with the 'staging_dir' and 'alive' items added.
+    """
+    found = []
+
+    if os.path.isdir(staging_root):
+        hostname = socket.gethostname()
+
+        for entry in sorted(os.listdir(staging_root)):
+            staging_dir = os.path.join(staging_root, entry)
+
+            manifest_file = os.path.join(staging_dir, STAGING_MANIFEST_FILENAME)
+            if not os.path.isfile(manifest_file):
+                continue
+
+            manifest = read_staging_manifest(staging_dir)
+            if manifest.get("flushed", False):
+                continue
+
+            alive = None
+            if manifest.get("hostname", None) == hostname:
+                alive = _is_process_alive(manifest.get("pid", None))
+
+            manifest["staging_dir"] = staging_dir
+            manifest["alive"] = alive
+            found.append(manifest)
+
+    return found
+
+def get_output_stager() -> Optional[OutputStager]:
+    """
+        Returns the output stager for the current process or None if the output directory is not staged.
+    """
+    return OUTPUT_STAGER
+
+def read_staging_manifest(staging_dir: str) -> dict:
+    """
+        Reads the staging manifest from a staging directory.
+
+        :param staging_dir: The staging directory to read the manifest from.
+    """
+    manifest_file = os.path.join(staging_dir, STAGING_MANIFEST_FILENAME)
+
+    with open(manifest_file, 'r') as mf:
+        manifest = json.load(mf)
+
+    return manifest
+
+def recover_staged_output(staging_dir: str, destination_dir: Optional[str] = None, remove_staged: bool = False) -> str:
+    """
+        Writes the output in a staging directory back to its destination.  This is used to recover the
+        staged output of a job that did not complete the final flush.
+
+        :param staging_dir: The staging directory to recover.
+        :param destination_dir: An optional destination that overrides the one in the staging manifest.
+        :param remove_staged: Remove the staging directory after the output has been recovered.
+
+        :returns: The destination the output was recovered to.
+    """
+    manifest = read_staging_manifest(staging_dir)
+
+    if destination_dir is None:
+        destination_dir = manifest["destination"]
+
+    stager = OutputStager(staging_dir, destination_dir)
+    stager.resume()
+
+    completed = stager.shutdown(remove_staged=remove_staged)
+    if not completed:
+        errmsg_lines = [
+            "Failed to recover the staged output. staging_dir={} destination={}".format(staging_dir, destination_dir),
+            "ERRORS:"
+        ]
+        for err in stager.errors:
+            errmsg_lines.append("    {}".format(err))
+
+        errmsg = os.linesep.join(errmsg_lines)
+        raise RuntimeError(errmsg)
+
+    return destination_dir
+
+def start_output_staging(staging_dir: str, destination_dir: str, max_workers: int = 4,
+                         job_id: Optional[str] = None, flush_interval: Optional[float] = None) -> OutputStager:
+    """
+        Starts the staging of the output directory for the current process.
+
+        :param staging_dir: The node-local directory that output is written to.
+        :param destination_dir: The directory the staged output is written back to.
+        :param max_workers: The maximum number of write-back worker threads.
+        :param job_id: The identifier of the job that owns the staged output.
+        :param flush_interval: The number of seconds between the background write-back of the changed
+                               files, or None to only write back committed files and the final flush.
+
+        :returns: The output stager for the current process.
+    """
+    global OUTPUT_STAGER
+
+    stager = OutputStager(staging_dir, destination_dir, max_workers=max_workers, flush_interval=flush_interval)
+    stager.start(job_id=job_id)
+
+    OUTPUT_STAGER = stager
+
+    return stager
+
+def stop_output_staging(timeout: Optional[float] = None) -> bool:
+    """
+        Performs the final flush of the staged output directory of the current process.  The
+        logging handlers are flushed first so the log files are current when they are written back.
+
+        :param timeout: The maximum number of seconds to wait for the final flush.
+
+        :returns: True if all of the staged output was written back.
+    """
+    global OUTPUT_STAGER
+
+    completed = True
+
+    if OUTPUT_STAGER is not None:
+        stager = OUTPUT_STAGER
+        OUTPUT_STAGER = None
+
+        from mojo.runtime.logcontrol import flush_log_handlers
+        flush_log_handlers()
+
+        completed = stager.shutdown(timeout=timeout)
+
+    return completed
+
+def _is_process_alive(pid: Optional[int]) -> Optional[bool]:
+    alive = None
+
+    if pid is not None:
+        try:
+            os.kill(pid, 0)
+            alive = True
+        except ProcessLookupError:
+            alive = False
+        except (PermissionError, OSError):
+            alive = True
+
+    return alive
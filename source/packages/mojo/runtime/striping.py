@@ -0,0 +1,144 @@
+"""
+.. module:: striping
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the functions used to spread the output directories of
+               jobs across a list of output roots which can reside on different volumes.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import List, Optional
+
+import hashlib
+import os
+import shutil
+
+from mojo.runtime.enumerations import OutputStripingPolicy
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+ROUND_ROBIN_COUNTER_FILENAME = "output-root-counter"
+
+
+def parse_output_roots(roots_value: str) -> List[str]:
+    """
+        Parses a list of output roots that are separated by the platform path separator.
+
+        :param roots_value: The string containing the list of output roots.
+
+        :returns: The list of output roots with any empty entries removed.
+    """
+    roots = []
+
+    for root in roots_value.split(os.pathsep):
+        root = root.strip()
+        if len(root) > 0:
+            roots.append(root)
+
+    return roots
+
+def select_output_root(roots: List[str], policy: OutputStripingPolicy, job_id: str,
+                       counter_file: Optional[str] = None) -> str:
+    """
+        Selects the output root that a job should write its output under.
+
+        :param roots: The list of output roots to select from.
+        :param policy: The policy to use to spread jobs across the output roots.
+        :param job_id: The identifier of the job that is selecting an output root.
+        :param counter_file: The file that holds the node wide round-robin counter. This is only
+                             used by the round-robin policy.
+
+        :returns: The selected output root.
+    """
+    if len(roots) == 0:
+        errmsg = "At least one output root must be provided to select an output root."
+        raise ValueError(errmsg)
+
+    policy = OutputStripingPolicy(policy)
+
+    selected = None
+
+    if len(roots) == 1:
+        selected = roots[0]
+
+    elif policy == OutputStripingPolicy.JobHash:
+        job_digest = hashlib.sha1(job_id.encode("utf-8")).hexdigest()
+        index = int(job_digest, 16) % len(roots)
+        selected = roots[index]
+
+    elif policy == OutputStripingPolicy.FreeSpace:
+        selected = _select_root_with_most_free_space(roots)
+
+    else:
+        if counter_file is None:
+            errmsg = "The round-robin output striping policy requires a counter file."
+            raise ValueError(errmsg)
+
+        counter = _next_round_robin_counter(counter_file)
+        index = counter % len(roots)
+        selected = roots[index]
+
+    return selected
+
+def _next_round_robin_counter(counter_file: str) -> int:
+    """
+        Increments the node wide round-robin counter and returns the value prior to
+        the increment.  The counter file is locked while it is updated so jobs that
+        are started at the same time get different counter values.
+    """
+    counter = 0
+
+    fd = os.open(counter_file, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+
+        content = os.read(fd, 64).strip()
+        if len(content) > 0:
+            try:
+                counter = int(content)
+            except ValueError:
+                counter = 0
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.ftruncate(fd, 0)
+        os.write(fd, str(counter + 1).encode("utf-8"))
+    finally:
+        os.close(fd)
+
+    return counter
+
+def _select_root_with_most_free_space(roots: List[str]) -> str:
+    """
+        Returns the output root whose volume has the most free space.  Roots that do not
+        exist yet are measured by their nearest existing parent directory.
+    """
+    selected = roots[0]
+    selected_free = -1
+
+    for root in roots:
+        probe = os.path.abspath(os.path.expanduser(root))
+        while not os.path.exists(probe):
+            parent = os.path.dirname(probe)
+            if parent == probe:
+                break
+            probe = parent
+
+        try:
+            usage = shutil.disk_usage(probe)
+        except OSError:
+            continue
+
+        if usage.free > selected_free:
+            selected = root
+            selected_free = usage.free
+
+    return selected
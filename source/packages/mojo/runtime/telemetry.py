@@ -0,0 +1,397 @@
+"""
+.. module:: telemetry
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`ResourceTelemetrySampler` object which is used to
+               record the resource usage of the process to the diagnostics directory.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import Dict, List, NamedTuple, Optional
+
+import json
+import os
+import struct
+import threading
+import time
+
+TELEMETRY_FILE_MAGIC = b"MJRTLM01"
+
+# timestamp, cpu_user, cpu_system, rss_bytes, read_bytes, write_bytes, open_fds, threads
+TELEMETRY_RECORD = struct.Struct("<dddQQQII")
+
+TELEMETRY_FLUSH_RECORDS = 64
+
+PROC_SELF_DIR = "/proc/self"
+
+
+class TelemetrySample(NamedTuple):
+    timestamp: float
+    cpu_user: float
+    cpu_system: float
+    rss_bytes: int
+    read_bytes: int
+    write_bytes: int
+    open_fds: int
+    threads: int
+
+
+class ProcessStatReader:
+    """
+        The :class:`ProcessStatReader` reads the resource usage of the current process.  On Linux the
+        statistics are read from /proc/self through file descriptors that are opened once and read
+        with pread, on other platforms the statistics that are available from the os and resource
+        modules are used.
+    """
+
+    def __init__(self):
+        self._pid = os.getpid()
+        self._stat_fd = None
+        self._io_fd = None
+        self._fd_dir = None
+        self._page_size = 4096
+        self._clock_ticks = 100
+
+        if os.path.isdir(PROC_SELF_DIR):
+            self._page_size = os.sysconf("SC_PAGE_SIZE")
+            self._clock_ticks = os.sysconf("SC_CLK_TCK")
+
+            self._stat_fd = os.open(os.path.join(PROC_SELF_DIR, "stat"), os.O_RDONLY)
+
+            # The io file is not readable in some containers, the io counters are recorded as zero.
+            try:
+                self._io_fd = os.open(os.path.join(PROC_SELF_DIR, "io"), os.O_RDONLY)
+                os.pread(self._io_fd, 1024, 0)
+            except OSError:
+                if self._io_fd is not None:
+                    os.close(self._io_fd)
+                self._io_fd = None
+
+            self._fd_dir = os.path.join(PROC_SELF_DIR, "fd")
+
+        return
+
+    def close(self):
+        """
+            Closes the /proc/self file descriptors held by the reader.
+        """
+        for fd in (self._stat_fd, self._io_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+        self._stat_fd = None
+        self._io_fd = None
+        return
+
+    def read(self) -> TelemetrySample:
+        """
+            Reads a sample of the resource usage of the current process.
+        """
+        if self._stat_fd is not None:
+            sample = self._read_proc()
+        else:
+            sample = self._read_portable()
+
+        return sample
+
+    def _read_proc(self) -> TelemetrySample:
+        timestamp = time.time()
+
+        stat_content = os.pread(self._stat_fd, 4096, 0)
+
+        # The command name is in parenthesis and can contain spaces, the fields after it are split on spaces.
+        fields = stat_content[stat_content.rfind(b")") + 2:].split()
+        cpu_user = int(fields[11]) / self._clock_ticks
+        cpu_system = int(fields[12]) / self._clock_ticks
+        threads = int(fields[17])
+        rss_bytes = int(fields[21]) * self._page_size
+
+        read_bytes = 0
+        write_bytes = 0
+        if self._io_fd is not None:
+            for line in os.pread(self._io_fd, 1024, 0).splitlines():
+                if line.startswith(b"read_bytes:"):
+                    read_bytes = int(line[11:])
+                elif line.startswith(b"write_bytes:"):
+                    write_bytes = int(line[12:])
+
+        try:
+            open_fds = len(os.listdir(self._fd_dir))
+        except OSError:
+            open_fds = 0
+
+        sample = TelemetrySample(timestamp, cpu_user, cpu_system, rss_bytes, read_bytes, write_bytes, open_fds, threads)
+
+        return sample
+
+    def _read_portable(self) -> TelemetrySample:
+        timestamp = time.time()
+
+        ptimes = os.times()
+
+        rss_bytes = 0
+        read_bytes = 0
+        write_bytes = 0
+        try:
+            import resource
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            # The resident set size is only available as the peak on these platforms.
+            rss_bytes = usage.ru_maxrss if os.uname().sysname == "Darwin" else usage.ru_maxrss * 1024
+            read_bytes = usage.ru_inblock * 512
+            write_bytes = usage.ru_oublock * 512
+        except ImportError:
+            pass
+
+        sample = TelemetrySample(timestamp, ptimes.user, ptimes.system, rss_bytes, read_bytes, write_bytes, 0,
+                                 threading.active_count())
+
+        return sample
+
+
+class ResourceTelemetrySampler:
+    """
+        The :class:`ResourceTelemetrySampler` runs a background thread that samples the resource usage
+        of the process at an interval and appends the samples to a binary telemetry file as fixed size
+        records.  The records are buffered and written in batches so the sampler makes very few system
+        calls of its own.  When the sampler is stopped, summary statistics are written to a JSON file
+        next to the telemetry file.
+    """
+
+    def __init__(self, telemetry_dir: str, interval: float = 1.0):
+        self._telemetry_dir = telemetry_dir
+        self._interval = interval
+
+        basename = "telemetry-{}".format(os.getpid())
+        self._telemetry_file = os.path.join(telemetry_dir, basename + ".bin")
+        self._summary_file = os.path.join(telemetry_dir, basename + "-summary.json")
+
+        self._reader = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._buffer = bytearray()
+        self._sample_time = 0.0
+        self._sample_count = 0
+        self._started = None
+        return
+
+    @property
+    def summary_file(self) -> str:
+        return self._summary_file
+
+    @property
+    def telemetry_file(self) -> str:
+        return self._telemetry_file
+
+    def start(self):
+        """
+            Creates the telemetry file and starts the sampler thread.
+        """
+        os.makedirs(self._telemetry_dir, exist_ok=True)
+
+        with open(self._telemetry_file, 'wb') as tf:
+            tf.write(TELEMETRY_FILE_MAGIC)
+
+        self._reader = ProcessStatReader()
+        self._started = time.perf_counter()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._sampler_loop, name="mjr-telemetry", daemon=True)
+        self._thread.start()
+        return
+
+    def stop(self, timeout: Optional[float] = 5.0) -> Dict[str, dict]:
+        """
+            Stops the sampler thread, writes the remaining samples and the summary statistics.
+
+            :param timeout: The maximum number of seconds to wait for the sampler thread.
+
+            :returns: The summary statistics of the samples.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join(timeout)
+            self._thread = None
+
+        if self._reader is not None:
+            # A final sample is taken so the summary covers the whole run.
+            self._take_sample()
+            self._reader.close()
+            self._reader = None
+
+        self._flush()
+
+        summary = summarize_telemetry_samples(read_telemetry_file(self._telemetry_file))
+
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+        summary["sampler"] = {
+            "interval": self._interval,
+            "samples": self._sample_count,
+            "sample_time": self._sample_time,
+            "overhead": self._sample_time / elapsed if elapsed > 0 else 0.0
+        }
+
+        with open(self._summary_file, 'w') as sf:
+            json.dump(summary, sf, indent=4)
+
+        return summary
+
+    def _flush(self):
+        if len(self._buffer) > 0:
+            with open(self._telemetry_file, 'ab') as tf:
+                tf.write(self._buffer)
+            self._buffer = bytearray()
+        return
+
+    def _sampler_loop(self):
+
+        while not self._stop_event.wait(self._interval):
+            self._take_sample()
+
+            if len(self._buffer) >= TELEMETRY_FLUSH_RECORDS * TELEMETRY_RECORD.size:
+                try:
+                    self._flush()
+                except OSError:
+                    # The samples are kept in the buffer and written by the next flush.
+                    pass
+
+        return
+
+    def _take_sample(self):
+        start = time.perf_counter()
+
+        try:
+            sample = self._reader.read()
+            self._buffer.extend(TELEMETRY_RECORD.pack(*sample))
+            self._sample_count += 1
+        except (OSError, ValueError, IndexError):
+            # A sample that cannot be read is skipped rather than stopping the sampler.
+            pass
+
+        self._sample_time += time.perf_counter() - start
+        return
+
+
+RESOURCE_TELEMETRY_SAMPLER: Optional[ResourceTelemetrySampler] = None
+
+
+def get_resource_telemetry_sampler() -> Optional[ResourceTelemetrySampler]:
+    """
+        Returns the resource telemetry sampler for the current process or None if telemetry is not enabled.
+    """
+    return RESOURCE_TELEMETRY_SAMPLER
+
+def read_telemetry_file(telemetry_file: str) -> List[TelemetrySample]:
+    """
+        Reads the samples from a binary telemetry file.
+
+        :param telemetry_file: The telemetry file written by a :class:`ResourceTelemetrySampler`.
+
+        :returns: The list of samples in the file.
+    """
+    with open(telemetry_file, 'rb') as tf:
+        content = tf.read()
+
+    if not content.startswith(TELEMETRY_FILE_MAGIC):
+        errmsg = "The file is not a telemetry file. file={}".format(telemetry_file)
+        raise ValueError(errmsg)
+
+    record_data = content[len(TELEMETRY_FILE_MAGIC):]
+    record_end = len(record_data) - (len(record_data) % TELEMETRY_RECORD.size)
+
+    samples = [TelemetrySample(*fields) for fields in TELEMETRY_RECORD.iter_unpack(record_data[:record_end])]
+
+    return samples
+
+def start_resource_telemetry(telemetry_dir: str, interval: float = 1.0) -> ResourceTelemetrySampler:
+    """
+        Starts the resource telemetry sampler for the current process.
+
+        :param telemetry_dir: The directory to write the telemetry and summary files to.
+        :param interval: The number of seconds between samples.
+
+        :returns: The resource telemetry sampler for the current process.
+    """
+    global RESOURCE_TELEMETRY_SAMPLER
+
+    stop_resource_telemetry()
+
+    sampler = ResourceTelemetrySampler(telemetry_dir, interval=interval)
+    sampler.start()
+
+    RESOURCE_TELEMETRY_SAMPLER = sampler
+
+    return sampler
+
+def stop_resource_telemetry() -> Optional[Dict[str, dict]]:
+    """
+        Stops the resource telemetry sampler for the current process and writes the summary statistics.
+
+        :returns: The summary statistics or None if telemetry was not running.
+    """
+    global RESOURCE_TELEMETRY_SAMPLER
+
+    summary = None
+
+    if RESOURCE_TELEMETRY_SAMPLER is not None:
+        sampler = RESOURCE_TELEMETRY_SAMPLER
+        RESOURCE_TELEMETRY_SAMPLER = None
+
+        summary = sampler.stop()
+
+    return summary
+
+def summarize_telemetry_samples(samples: List[TelemetrySample]) -> Dict[str, dict]:
+    """
+        Computes the summary statistics of a list of telemetry samples.  The gauges, such as the
+        resident set size, are summarized by their minimum, maximum and mean.  The counters, such as
+        the cpu time, are summarized by their total change and their rate over the sampled period.
+
+        :param samples: The samples to summarize.
+
+        :returns: A dictionary of the summary statistics.
+    """
+    summary = {
+        "sample_count": len(samples),
+        "duration": 0.0,
+        "gauges": {},
+        "counters": {}
+    }
+
+    if len(samples) == 0:
+        return summary
+
+    first = samples[0]
+    last = samples[-1]
+    duration = last.timestamp - first.timestamp
+    summary["duration"] = duration
+
+    for gauge_name in ("rss_bytes", "open_fds", "threads"):
+        values = [getattr(sample, gauge_name) for sample in samples]
+        summary["gauges"][gauge_name] = {
+            "min": min(values),
+            "max": max(values),
+            "mean": sum(values) / len(values),
+            "last": values[-1]
+        }
+
+    for counter_name in ("cpu_user", "cpu_system", "read_bytes", "write_bytes"):
+        delta = getattr(last, counter_name) - getattr(first, counter_name)
+        summary["counters"][counter_name] = {
+            "total": delta,
+            "rate": delta / duration if duration > 0 else 0.0
+        }
+
+    cpu_total = summary["counters"]["cpu_user"]["total"] + summary["counters"]["cpu_system"]["total"]
+    summary["cpu_utilization"] = cpu_total / duration if duration > 0 else 0.0
+
+    return summary
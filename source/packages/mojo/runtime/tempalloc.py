@@ -0,0 +1,230 @@
+"""
+.. module:: tempalloc
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`TempFileAllocator` object which is used to hand out
+               temporary files without name collisions between threads and processes.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import IO, Optional, Tuple
+
+import atexit
+import itertools
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+
+from mojo.runtime.runtimecontext import RuntimeContext, get_current_runtime_context
+
+TEMP_ROOT_PREFIX = "mjr-"
+
+
+class TempFileAllocator:
+    """
+        The :class:`TempFileAllocator` hands out temporary files from a temp root directory that is
+        created once per process below a base directory.  The names in the temp root are made
+        unique with the process id and a process wide counter, and each file is created with
+        O_EXCL, so names never collide between threads or processes and no directory checks are
+        made when a file is allocated.
+
+        A process that is forked from the owning process allocates from its own temp root.
+    """
+
+    def __init__(self, base_dir: str):
+        self._base_dir = base_dir
+        self._temp_root = None
+        self._owner_pid = None
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        return
+
+    @property
+    def base_dir(self) -> str:
+        return self._base_dir
+
+    @property
+    def temp_root(self) -> Optional[str]:
+        """
+            The temp root of the current process, or None if nothing has been allocated yet.
+        """
+        rtnval = self._temp_root if self._owner_pid == os.getpid() else None
+        return rtnval
+
+    def allocate_name(self, suffix: str = "", prefix: str = "") -> str:
+        """
+            Reserves a unique temporary file name by creating an empty file with the name.
+
+            :param suffix: The suffix of the file name.
+            :param prefix: The prefix of the file name.
+
+            :returns: The full path of the reserved temporary file.
+        """
+        fd, temp_path = self._create_file(suffix, prefix)
+        os.close(fd)
+        return temp_path
+
+    def cleanup(self):
+        """
+            Removes the temp root of the current process and everything that was allocated in it.
+        """
+        with self._lock:
+            if self._temp_root is not None and self._owner_pid == os.getpid():
+                shutil.rmtree(self._temp_root, ignore_errors=True)
+            self._temp_root = None
+            self._owner_pid = None
+        return
+
+    def open_file(self, suffix: str = "", prefix: str = "", mode: str = "w+b", **kwargs) -> IO:
+        """
+            Creates and opens a unique temporary file.
+
+            :param suffix: The suffix of the file name.
+            :param prefix: The prefix of the file name.
+            :param mode: The mode to open the file with, the file is always newly created.
+
+            :returns: The open file object, the path of the file is available from its 'name'.
+        """
+        fd, temp_path = self._create_file(suffix, prefix)
+
+        # The file is opened through the descriptor that was created with O_EXCL so the file
+        # object has the path as its name instead of the descriptor number.
+        try:
+            fileobj = open(temp_path, mode, opener=lambda _path, _flags: fd, **kwargs) # pylint: disable=consider-using-with
+        except Exception:
+            os.close(fd)
+            raise
+
+        return fileobj
+
+    def _create_file(self, suffix: str, prefix: str):
+        temp_root = self._get_temp_root()
+        pid = os.getpid()
+
+        flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+
+        while True:
+            temp_name = "{}{}-{}{}".format(prefix, pid, next(self._counter), suffix)
+            temp_path = os.path.join(temp_root, temp_name)
+            try:
+                fd = os.open(temp_path, flags, 0o600)
+                break
+            except FileExistsError:
+                # A file with the name was created by something other than the allocator, the
+                # counter moves on to the next name.
+                continue
+
+        return fd, temp_path
+
+    def _get_temp_root(self) -> str:
+        pid = os.getpid()
+
+        temp_root = self._temp_root
+        if temp_root is None or self._owner_pid != pid:
+            with self._lock:
+                if self._temp_root is None or self._owner_pid != pid:
+                    os.makedirs(self._base_dir, exist_ok=True)
+                    self._temp_root = tempfile.mkdtemp(prefix="{}{}-".format(TEMP_ROOT_PREFIX, pid), dir=self._base_dir)
+                    self._owner_pid = pid
+                    self._counter = itertools.count()
+                temp_root = self._temp_root
+
+        return temp_root
+
+
+TEMP_FILE_ALLOCATOR: Optional[TempFileAllocator] = None
+TEMP_FILE_ALLOCATOR_LOCK = threading.Lock()
+
+# The allocators of the isolated runtime contexts, each allocator is paired with the finalizer that
+# cleans it up when the runtime context is garbage collected or the process exits.
+CONTEXT_TEMP_FILE_ALLOCATORS: "weakref.WeakKeyDictionary[RuntimeContext, Tuple[TempFileAllocator, weakref.finalize]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def get_temp_file_allocator() -> TempFileAllocator:
+    """
+        Returns the temporary file allocator of the runtime.  The temp root is created below the
+        scratch directory when MJR_SCRATCH_DIRECTORY is set, such as a tmpfs mount, otherwise below
+        the 'temp' folder of the output directory.  The temp root is removed when the process exits.
+
+        When an isolated runtime context is current, the allocator of the runtime context is returned,
+        its temp root is below the 'temp' folder of the output directory of the runtime context and
+        is removed when the runtime context is garbage collected or the process exits.
+    """
+    global TEMP_FILE_ALLOCATOR
+
+    rtctx = get_current_runtime_context()
+
+    with TEMP_FILE_ALLOCATOR_LOCK:
+        if rtctx is not None:
+            entry = CONTEXT_TEMP_FILE_ALLOCATORS.get(rtctx, None)
+            if entry is None:
+                base_dir = _get_scratch_directory()
+                if base_dir is None:
+                    base_dir = os.path.join(rtctx.get_path_for_output(), "temp")
+
+                allocator = TempFileAllocator(base_dir)
+                entry = (allocator, weakref.finalize(rtctx, allocator.cleanup))
+                CONTEXT_TEMP_FILE_ALLOCATORS[rtctx] = entry
+
+            allocator, _ = entry
+
+        else:
+            if TEMP_FILE_ALLOCATOR is None:
+                base_dir = _get_scratch_directory()
+                if base_dir is None:
+                    from mojo.runtime.paths import get_temporary_directory
+                    base_dir = get_temporary_directory()
+
+                TEMP_FILE_ALLOCATOR = TempFileAllocator(base_dir)
+                atexit.register(TEMP_FILE_ALLOCATOR.cleanup)
+
+            allocator = TEMP_FILE_ALLOCATOR
+
+    return allocator
+
+def reset_temp_file_allocator(cleanup: bool = True):
+    """
+        Clears the runtime allocator and the allocators of the isolated runtime contexts, so the next
+        allocation creates a new allocator.  This is used when the runtime is deactivated, and without
+        cleanup when the output directory is overridden.
+
+        :param cleanup: Remove the temp roots of the allocators now, otherwise the temp roots of the
+                        process allocator are left in place until the process exits so the temporary
+                        files that are in use are not removed.
+    """
+    global TEMP_FILE_ALLOCATOR
+
+    with TEMP_FILE_ALLOCATOR_LOCK:
+        if TEMP_FILE_ALLOCATOR is not None:
+            if cleanup:
+                atexit.unregister(TEMP_FILE_ALLOCATOR.cleanup)
+                TEMP_FILE_ALLOCATOR.cleanup()
+            TEMP_FILE_ALLOCATOR = None
+
+        if cleanup:
+            context_entries = list(CONTEXT_TEMP_FILE_ALLOCATORS.values())
+            CONTEXT_TEMP_FILE_ALLOCATORS.clear()
+
+            for _, finalizer in context_entries:
+                finalizer()
+
+    return
+
+def _get_scratch_directory() -> Optional[str]:
+    from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES
+
+    scratch_dir = MOJO_RUNTIME_VARIABLES.MJR_SCRATCH_DIRECTORY
+    if scratch_dir is not None:
+        scratch_dir = os.path.abspath(os.path.expandvars(os.path.expanduser(scratch_dir)))
+
+    return scratch_dir
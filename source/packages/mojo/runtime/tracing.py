@@ -0,0 +1,281 @@
+"""
+.. module:: tracing
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the span API that is used to record a timeline of the phases of
+               the runtime and of jobs as Chrome trace events.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+
+    The spans are recorded into a buffer that belongs to the thread that records them, so recording
+    a span never takes a lock.  The buffers are collected and written as Chrome trace-event JSON,
+    which can be loaded into chrome://tracing or the Perfetto UI.
+
+    When tracing is disabled, :func:`span` returns a shared no-op span and functions decorated with
+    :func:`traced` are called directly, so instrumented code costs a single flag check.
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import functools
+import json
+import os
+import threading
+import time
+import weakref
+
+TRACING_ENABLED = False
+
+TRACE_BUFFERS: List[Tuple[int, str, list, weakref.ref]] = []
+TRACE_BUFFERS_LOCK = threading.Lock()
+
+TRACE_THREAD_LOCAL = threading.local()
+
+
+class TraceSpan:
+    """
+        A span of time that is recorded as a complete trace event when the span exits.
+    """
+
+    __slots__ = ("name", "category", "args", "_start")
+
+    def __init__(self, name: str, category: str, args: Optional[Dict[str, Any]]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self._start = None
+        return
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, ex_type, ex_inst, ex_tb):
+        end = time.perf_counter_ns()
+
+        args = self.args
+        if ex_type is not None:
+            args = dict(args) if args is not None else {}
+            args["exception"] = ex_type.__name__
+
+        _get_thread_buffer().append(("X", self.name, self.category, self._start, end - self._start, args))
+        return False
+
+
+class NullSpan:
+    """
+        The span that is returned when tracing is disabled, it records nothing.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ex_type, ex_inst, ex_tb):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+def clear_trace_buffers():
+    """
+        Discards the trace events that have been recorded and not yet written.
+    """
+    with TRACE_BUFFERS_LOCK:
+        for _, _, buffer, _ in TRACE_BUFFERS:
+            del buffer[:]
+
+    return
+
+def collect_trace_events() -> List[dict]:
+    """
+        Removes the trace events that have been recorded from the buffers of all of the threads and
+        returns them as Chrome trace events.
+    """
+    pid = os.getpid()
+
+    events = []
+
+    with TRACE_BUFFERS_LOCK:
+        buffers = list(TRACE_BUFFERS)
+
+        # The buffers of threads that have exited are dropped once their events have been collected.
+        TRACE_BUFFERS[:] = [tbuf for tbuf in TRACE_BUFFERS if tbuf[3]() is not None or len(tbuf[2]) > 0]
+
+    for tid, thread_name, buffer, _ in buffers:
+        # Only the events that were copied are removed, events appended by the owning thread
+        # while the buffer is being collected stay in the buffer for the next collection.
+        recorded = buffer[:]
+        del buffer[:len(recorded)]
+
+        if len(recorded) == 0:
+            continue
+
+        events.append({ "name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": { "name": thread_name } })
+
+        for phase, name, category, start, duration, args in recorded:
+            event = { "name": name, "cat": category, "ph": phase, "ts": start / 1000, "pid": pid, "tid": tid }
+            if phase == "X":
+                event["dur"] = duration / 1000
+            else:
+                event["s"] = "t"
+            if args:
+                event["args"] = args
+            events.append(event)
+
+    return events
+
+def disable_tracing():
+    """
+        Disables the recording of spans, the events that have been recorded are kept until written.
+    """
+    global TRACING_ENABLED
+    TRACING_ENABLED = False
+    return
+
+def enable_tracing():
+    """
+        Enables the recording of spans.
+    """
+    global TRACING_ENABLED
+    TRACING_ENABLED = True
+    return
+
+def is_tracing_enabled() -> bool:
+    return TRACING_ENABLED
+
+def span(name: str, category: str = "mjr", **args):
+    """
+        Returns a context manager that records a span of time as a trace event.
+
+        :param name: The name of the span.
+        :param category: The category of the span, used to filter the events in the trace viewers.
+        :param args: Optional values that are recorded with the span.
+    """
+    if not TRACING_ENABLED:
+        return NULL_SPAN
+
+    rtnval = TraceSpan(name, category, args if args else None)
+    return rtnval
+
+def trace_instant(name: str, category: str = "mjr", **args):
+    """
+        Records an instant event, such as a milestone in the progress of a job.
+
+        :param name: The name of the event.
+        :param category: The category of the event.
+        :param args: Optional values that are recorded with the event.
+    """
+    if TRACING_ENABLED:
+        _get_thread_buffer().append(("i", name, category, time.perf_counter_ns(), 0, args if args else None))
+    return
+
+def traced(name: Optional[str] = None, category: str = "mjr") -> Callable:
+    """
+        Decorator that records each call of the decorated function as a span.
+
+        :param name: The name of the span, defaults to the qualified name of the function.
+        :param category: The category of the span.
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name if name is not None else func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACING_ENABLED:
+                return func(*args, **kwargs)
+
+            with TraceSpan(span_name, category, None):
+                rtnval = func(*args, **kwargs)
+
+            return rtnval
+
+        return wrapper
+
+    return decorator
+
+def write_trace_file(trace_file: str, metadata: Optional[Dict[str, Any]] = None) -> int:
+    """
+        Collects the recorded trace events and writes them to a Chrome trace-event JSON file.  If the
+        file already exists, the events in the file are kept and the new events are added to them.
+
+        :param trace_file: The path of the trace file.
+        :param metadata: Values that identify the job the trace belongs to, they are written as the
+                         'otherData' of the trace and as the labels of the process.
+
+        :returns: The number of events that were written to the file.
+    """
+    events = collect_trace_events()
+
+    trace = { "traceEvents": [], "displayTimeUnit": "ms", "otherData": {} }
+
+    if os.path.exists(trace_file):
+        with open(trace_file, 'r') as tf:
+            trace = json.load(tf)
+
+    if metadata:
+        trace["otherData"].update(metadata)
+
+        pid = os.getpid()
+        labels = ",".join(["{}={}".format(mkey, mval) for mkey, mval in metadata.items() if mval is not None])
+        events.insert(0, { "name": "process_labels", "ph": "M", "pid": pid, "tid": 0, "args": { "labels": labels } })
+
+    trace["traceEvents"].extend(events)
+
+    trace_dir = os.path.dirname(os.path.abspath(trace_file))
+    os.makedirs(trace_dir, exist_ok=True)
+
+    temp_file = "{}.{}.tmp".format(trace_file, os.getpid())
+    with open(temp_file, 'w') as tf:
+        json.dump(trace, tf)
+    os.replace(temp_file, trace_file)
+
+    return len(events)
+
+def flush_runtime_trace() -> Optional[str]:
+    """
+        Writes the trace events recorded by the runtime and the job to the 'trace-(pid).json' file in
+        the output directory, tagged with the job, run and pipeline identifiers.
+
+        :returns: The path of the trace file or None if no events were recorded.
+    """
+    trace_file = None
+
+    with TRACE_BUFFERS_LOCK:
+        has_events = any(len(buffer) > 0 for _, _, buffer, _ in TRACE_BUFFERS)
+
+    if has_events:
+        from mojo.runtime.paths import get_path_for_output
+        from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES, DefaultValue
+
+        metadata = {}
+        for var_name in ("MJR_JOB_ID", "MJR_JOB_NAME", "MJR_RUN_ID", "MJR_PIPELINE_ID", "MJR_PIPELINE_NAME",
+                         "MJR_PIPELINE_INSTANCE"):
+            var_value = getattr(MOJO_RUNTIME_VARIABLES, var_name, None)
+            metadata[var_name] = None if var_value == DefaultValue.NotSet else var_value
+
+        trace_file = os.path.join(get_path_for_output(), "trace-{}.json".format(os.getpid()))
+        write_trace_file(trace_file, metadata=metadata)
+
+    return trace_file
+
+def _get_thread_buffer() -> list:
+    buffer = getattr(TRACE_THREAD_LOCAL, "buffer", None)
+
+    if buffer is None:
+        buffer = []
+        TRACE_THREAD_LOCAL.buffer = buffer
+
+        thread = threading.current_thread()
+        with TRACE_BUFFERS_LOCK:
+            TRACE_BUFFERS.append((thread.native_id or thread.ident, thread.name, buffer, weakref.ref(thread)))
+
+    return buffer
@@ -47,14 +47,62 @@ class MOJO_RUNTIME_VARNAMES(MOJO_CONFIG_VARNAMES):
     MJR_JOB_VENUE = "MJR_JOB_VENUE"
 
     MJR_LOG_LEVEL_CONSOLE = "MJR_LOG_LEVEL_CONSOLE"
+    MJR_LOG_BINARY_ENABLED = "MJR_LOG_BINARY_ENABLED"
+    MJR_LOG_BINARY_RING_RECORDS = "MJR_LOG_BINARY_RING_RECORDS"
+    MJR_LOG_COMPRESSION = "MJR_LOG_COMPRESSION"
+    MJR_LOG_DEDUP = "MJR_LOG_DEDUP"
     MJR_LOG_LEVEL_FILE = "MJR_LOG_LEVEL_FILE"
+    MJR_LOG_RATE_BURST = "MJR_LOG_RATE_BURST"
+    MJR_LOG_RATE_LIMIT = "MJR_LOG_RATE_LIMIT"
+    MJR_LOG_RETENTION_BYTES = "MJR_LOG_RETENTION_BYTES"
+    MJR_LOG_SUMMARY_INTERVAL = "MJR_LOG_SUMMARY_INTERVAL"
     MJR_LOGGER_NAME = "MJR_LOGGER_NAME"
 
+    MJR_MEMORY_RSS_LIMIT = "MJR_MEMORY_RSS_LIMIT"
+    MJR_MEMORY_SIGNAL = "MJR_MEMORY_SIGNAL"
+    MJR_MEMORY_TRACE_FRAMES = "MJR_MEMORY_TRACE_FRAMES"
+    MJR_MEMORY_TRACING = "MJR_MEMORY_TRACING"
+
     MJR_OUTPUT_DIRECTORY = "MJR_OUTPUT_DIRECTORY"
+    MJR_OUTPUT_QUOTA_HARD = "MJR_OUTPUT_QUOTA_HARD"
+    MJR_OUTPUT_QUOTA_SOFT = "MJR_OUTPUT_QUOTA_SOFT"
+    MJR_OUTPUT_ROOTS = "MJR_OUTPUT_ROOTS"
+    MJR_OUTPUT_STAGING_DIRECTORY = "MJR_OUTPUT_STAGING_DIRECTORY"
+    MJR_OUTPUT_STAGING_FLUSH_INTERVAL = "MJR_OUTPUT_STAGING_FLUSH_INTERVAL"
+    MJR_OUTPUT_STAGING_FLUSH_TIMEOUT = "MJR_OUTPUT_STAGING_FLUSH_TIMEOUT"
+    MJR_OUTPUT_STAGING_WORKERS = "MJR_OUTPUT_STAGING_WORKERS"
+    MJR_OUTPUT_STRIPING_POLICY = "MJR_OUTPUT_STRIPING_POLICY"
 
     MJR_HAS_SHARED_OUTPUT_DIRECTORY = "MJR_HAS_SHARED_OUTPUT_DIRECTORY"
+    MJR_SHARED_OUTPUT_LAYOUT = "MJR_SHARED_OUTPUT_LAYOUT"
+    MJR_SHARD_MERGE_MODE = "MJR_SHARD_MERGE_MODE"
     MJR_SHARED_STORE_DIRECTORY = "MJR_SHARED_STORE_DIRECTORY"
 
+    MJR_SCRATCH_DIRECTORY = "MJR_SCRATCH_DIRECTORY"
+
+    MJR_SHARED_IO_MAX_STALLED = "MJR_SHARED_IO_MAX_STALLED"
+    MJR_SHARED_IO_RETRIES = "MJR_SHARED_IO_RETRIES"
+    MJR_SHARED_IO_TIMEOUT = "MJR_SHARED_IO_TIMEOUT"
+    MJR_SHARED_IO_WORKERS = "MJR_SHARED_IO_WORKERS"
+
+    MJR_TELEMETRY_ENABLED = "MJR_TELEMETRY_ENABLED"
+    MJR_TELEMETRY_INTERVAL = "MJR_TELEMETRY_INTERVAL"
+
+    MJR_TRACING_ENABLED = "MJR_TRACING_ENABLED"
+
+    MJR_WATCHDOG_CAPTURE_MEMORY = "MJR_WATCHDOG_CAPTURE_MEMORY"
+    MJR_WATCHDOG_CAPTURE_PROFILE = "MJR_WATCHDOG_CAPTURE_PROFILE"
+    MJR_WATCHDOG_POLICY = "MJR_WATCHDOG_POLICY"
+    MJR_WATCHDOG_TIMEOUT = "MJR_WATCHDOG_TIMEOUT"
+
+    MJR_PROFILER_ENABLED = "MJR_PROFILER_ENABLED"
+    MJR_PROFILER_INTERVAL = "MJR_PROFILER_INTERVAL"
+    MJR_PROFILER_SIGNAL = "MJR_PROFILER_SIGNAL"
+
+    MJR_RELOAD_FILE = "MJR_RELOAD_FILE"
+    MJR_RELOAD_POLL_INTERVAL = "MJR_RELOAD_POLL_INTERVAL"
+    MJR_RELOAD_SIGNAL = "MJR_RELOAD_SIGNAL"
+
     MJR_RESULTS_STATIC_SUMMARY_TEMPLATE = "MJR_RESULTS_STATIC_SUMMARY_TEMPLATE"
     MJR_RESULTS_STATIC_RESOURCE_DEST_DIR = "MJR_RESULTS_STATIC_RESOURCE_DEST_DIR"
     MJR_RESULTS_STATIC_RESOURCE_SRC_DIR = "MJR_RESULTS_STATIC_RESOURCE_SRC_DIR"
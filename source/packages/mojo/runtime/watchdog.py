@@ -0,0 +1,283 @@
+"""
+.. module:: watchdog
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the :class:`HangWatchdog` object which is used to detect a process
+               that has stopped making progress and to capture the evidence of the hang.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+# pylint: disable=global-statement
+
+from typing import List, Optional
+
+import faulthandler
+import gc
+import logging
+import os
+import threading
+import time
+
+from datetime import datetime
+
+from mojo.runtime.enumerations import WatchdogPolicy
+
+WATCHDOG_PROFILE_DURATION = 2.0
+
+# The number of seconds the abort policy waits for the hang dump before faulthandler exits the process.
+WATCHDOG_ABORT_BACKSTOP = 30.0
+
+
+class HangWatchdog:
+    """
+        The :class:`HangWatchdog` runs a background thread that checks how long ago progress was last
+        reported with :meth:`heartbeat`.  When no progress has been reported for the timeout, the
+        watchdog responds to the hang according to its policy:
+
+            * log: A warning is logged.
+            * dump: The stacks of all of the threads are dumped with faulthandler to the hang
+              directory, optionally along with a sampling profile and a memory summary, then a
+              warning is logged and the process continues.
+            * abort: The hang is dumped like the dump policy and then the process is aborted without
+              logging, the abort is reported on stderr.
+
+        The watchdog responds once per hang, it responds again only after progress is reported and
+        the process hangs again.
+    """
+
+    def __init__(self, hang_dir: str, timeout: float, policy: WatchdogPolicy = WatchdogPolicy.Dump,
+                 capture_profile: bool = False, capture_memory: bool = False, check_interval: Optional[float] = None):
+        self._hang_dir = hang_dir
+        self._timeout = timeout
+        self._policy = WatchdogPolicy(policy)
+        self._capture_profile = capture_profile
+        self._capture_memory = capture_memory
+        self._check_interval = check_interval if check_interval is not None else min(max(timeout / 10, 0.01), 5.0)
+
+        self._last_progress = time.monotonic()
+        self._last_label = None
+        self._fired = False
+        self._hang_count = 0
+        self._dump_files: List[str] = []
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        return
+
+    @property
+    def dump_files(self) -> List[str]:
+        return self._dump_files
+
+    @property
+    def hang_count(self) -> int:
+        return self._hang_count
+
+    @property
+    def policy(self) -> WatchdogPolicy:
+        return self._policy
+
+    def heartbeat(self, label: Optional[str] = None):
+        """
+            Reports that the process is making progress.
+
+            :param label: An optional description of the progress, such as the name of the current
+                          test, that is included in the hang report.
+        """
+        self._last_progress = time.monotonic()
+        if label is not None:
+            self._last_label = label
+        self._fired = False
+        return
+
+    def start(self):
+        """
+            Starts the watchdog thread, the timeout starts from the time the watchdog is started.
+        """
+        self._last_progress = time.monotonic()
+        self._fired = False
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watchdog_loop, name="mjr-watchdog", daemon=True)
+        self._thread.start()
+        return
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """
+            Stops the watchdog thread.
+
+            :param timeout: The maximum number of seconds to wait for the watchdog thread.
+        """
+        if self._thread is not None:
+            self._stop_event.set()
+            if self._thread is not threading.current_thread():
+                self._thread.join(timeout)
+            self._thread = None
+        return
+
+    def _respond_to_hang(self, stalled: float):
+        self._hang_count += 1
+
+        logger = logging.getLogger()
+
+        if self._policy == WatchdogPolicy.Log:
+            logger.warning("No progress has been reported for %.1f seconds, the last progress was '%s'. policy=%s",
+                           stalled, self._last_label, self._policy.value)
+            return
+
+        if self._policy == WatchdogPolicy.Abort:
+            # The process is terminated by faulthandler if capturing the evidence of the hang blocks.
+            faulthandler.dump_traceback_later(WATCHDOG_ABORT_BACKSTOP, exit=True)
+
+        # A hung thread might be holding a logging lock, so the stacks are dumped before anything is
+        # logged and nothing is logged before the process is aborted.
+        dump_file = None
+        dump_error = None
+        try:
+            dump_file = self._write_hang_dump(stalled)
+            self._dump_files.append(dump_file)
+        except OSError as oserr:
+            dump_error = oserr
+
+        if self._policy == WatchdogPolicy.Abort:
+            message = "Aborting the hung process, no progress was reported for {:.1f} seconds. dump={}\n".format(
+                stalled, dump_file if dump_file is not None else dump_error)
+            try:
+                os.write(2, message.encode("utf-8", errors="replace"))
+            except OSError:
+                pass
+            os.abort()
+
+        logger.warning("No progress has been reported for %.1f seconds, the last progress was '%s'. policy=%s",
+                       stalled, self._last_label, self._policy.value)
+
+        if dump_file is not None:
+            logger.warning("The stacks of the hung process were written to '%s'.", dump_file)
+        else:
+            logger.error("Unable to write the hang dump. error=%s", dump_error)
+
+        return
+
+    def _watchdog_loop(self):
+
+        while not self._stop_event.wait(self._check_interval):
+            stalled = time.monotonic() - self._last_progress
+            if stalled >= self._timeout and not self._fired:
+                self._fired = True
+                self._respond_to_hang(stalled)
+
+        return
+
+    def _write_hang_dump(self, stalled: float) -> str:
+        os.makedirs(self._hang_dir, exist_ok=True)
+
+        timestamp = datetime.now()
+        basename = "hang-{}-{:03d}".format(os.getpid(), self._hang_count)
+        dump_file = os.path.join(self._hang_dir, basename + ".txt")
+
+        with open(dump_file, 'w') as df:
+            df.write("# Hang detected pid={} time={}\n".format(os.getpid(), timestamp.isoformat()))
+            df.write("# stalled={:.1f}s timeout={}s last_progress={}\n\n".format(stalled, self._timeout, self._last_label))
+            df.flush()
+
+            # faulthandler writes directly to the file descriptor, so the stacks are captured even
+            # when the hung threads are holding locks the interpreter would otherwise need.
+            faulthandler.dump_traceback(file=df, all_threads=True)
+
+            if self._capture_memory:
+                df.write("\n")
+                df.write(self._get_memory_summary())
+
+        if self._capture_profile:
+            from mojo.runtime.profiler import SamplingProfiler
+
+            profiler = SamplingProfiler(self._hang_dir)
+            profiler.start()
+            self._stop_event.wait(WATCHDOG_PROFILE_DURATION)
+            profiler.stop()
+
+        if self._capture_memory:
+            import tracemalloc
+
+            if tracemalloc.is_tracing():
+                from mojo.runtime.memorydiag import MemoryDiagnostics
+                MemoryDiagnostics(self._hang_dir).take_snapshot(basename)
+
+        return dump_file
+
+    def _get_memory_summary(self) -> str:
+        from mojo.runtime.memorydiag import get_process_rss
+
+        lines = [
+            "# Memory summary",
+            "rss={}".format(get_process_rss()),
+            "gc_counts={}".format(gc.get_count()),
+            "gc_objects={}".format(len(gc.get_objects()))
+        ]
+
+        summary = "\n".join(lines) + "\n"
+
+        return summary
+
+
+HANG_WATCHDOG: Optional[HangWatchdog] = None
+
+
+def get_hang_watchdog() -> Optional[HangWatchdog]:
+    """
+        Returns the hang watchdog of the current process or None if the watchdog is not running.
+    """
+    return HANG_WATCHDOG
+
+def report_progress(label: Optional[str] = None):
+    """
+        Reports that the process is making progress to the hang watchdog, if it is running.
+
+        :param label: An optional description of the progress, such as the name of the current test.
+    """
+    watchdog = HANG_WATCHDOG
+    if watchdog is not None:
+        watchdog.heartbeat(label)
+    return
+
+def start_hang_watchdog(hang_dir: str, timeout: float, policy: WatchdogPolicy = WatchdogPolicy.Dump,
+                        capture_profile: bool = False, capture_memory: bool = False) -> HangWatchdog:
+    """
+        Starts the hang watchdog for the current process.
+
+        :param hang_dir: The directory the hang dumps are written to.
+        :param timeout: The number of seconds without progress after which the process is considered hung.
+        :param policy: How the watchdog responds to a hang.
+        :param capture_profile: Take a short sampling profile of the hung process.
+        :param capture_memory: Write a memory summary of the hung process.
+
+        :returns: The hang watchdog for the current process.
+    """
+    global HANG_WATCHDOG
+
+    stop_hang_watchdog()
+
+    watchdog = HangWatchdog(hang_dir, timeout, policy=policy, capture_profile=capture_profile, capture_memory=capture_memory)
+    watchdog.start()
+
+    HANG_WATCHDOG = watchdog
+
+    return watchdog
+
+def stop_hang_watchdog():
+    """
+        Stops the hang watchdog for the current process.
+    """
+    global HANG_WATCHDOG
+
+    if HANG_WATCHDOG is not None:
+        watchdog = HANG_WATCHDOG
+        HANG_WATCHDOG = None
+
+        watchdog.stop()
+
+    return
@@ -0,0 +1,289 @@
+"""
+.. module:: benchmark_paths
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Stress test and benchmark of the output path APIs under thread and process concurrency.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+
+    Each configuration runs M worker processes that share one output directory, and each worker
+    process runs N threads that call the path APIs in a loop:
+
+        * get_path_for_artifacts
+        * get_path_for_diagnostics
+        * get_path_for_testcase_by_products
+        * get_temporary_file
+
+    The results are checked for correctness: no call may raise, every returned path must be in the
+    right directory below the shared output directory and must exist, and no temporary file may be
+    handed out twice across all of the threads and processes.  The throughput of each configuration
+    is reported as ops/sec so the scaling with threads and processes can be plotted.
+
+    Usage::
+
+        cd source
+        python3 tests/benchmarks/benchmark_paths.py --threads 1,4,16 --processes 1,4 --target-dirs /tmp,/dev/shm
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Dict, List, Optional
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarkhistory import append_history_entry, find_regressions # pylint: disable=wrong-import-position
+
+BENCHMARK_SUITE = "paths"
+
+SOURCE_PACKAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "packages"))
+
+DEFAULT_THRESHOLDS = {
+    "ops_per_sec": 0.80
+}
+
+PATH_OPERATIONS = ["artifacts", "diagnostics", "tc_by_products", "temporary_file"]
+
+
+def run_worker(worker_id: int, thread_count: int, op_count: int) -> Dict[str, Any]:
+    """
+        Runs in a worker process, activates the runtime and calls the path APIs from a number
+        of threads.  The worker writes its results as JSON to stdout.
+    """
+    from mojo.runtime.initialize import initialize_runtime
+
+    initialize_runtime(name="mjr", logger_name="MJR")
+
+    from mojo.runtime.activation import activate_runtime, ActivationProfile
+
+    activate_runtime(profile=ActivationProfile.TestRun)
+
+    from mojo.runtime.paths import (
+        get_path_for_artifacts,
+        get_path_for_diagnostics,
+        get_path_for_output,
+        get_path_for_testcase_by_products,
+        get_temporary_file
+    )
+
+    output_dir = get_path_for_output()
+
+    errors = []
+    problems = []
+    temp_files = []
+    results_lock = threading.Lock()
+    start_gate = threading.Barrier(thread_count + 1)
+
+    def check_directory(path: str, expected_parent: str):
+        if os.path.dirname(path) != expected_parent:
+            problems.append("Path '{}' is not in '{}'.".format(path, expected_parent))
+        if not os.path.isdir(path):
+            problems.append("Directory '{}' does not exist.".format(path))
+        return
+
+    def worker_thread(thread_id: int):
+        local_temp_files = []
+        start_gate.wait()
+
+        for op_index in range(op_count):
+            op_name = PATH_OPERATIONS[op_index % len(PATH_OPERATIONS)]
+            label = "w{}-t{}-{}".format(worker_id, thread_id, op_index % 8)
+            try:
+                if op_name == "artifacts":
+                    check_directory(get_path_for_artifacts(label), os.path.join(output_dir, "artifacts"))
+                elif op_name == "diagnostics":
+                    check_directory(get_path_for_diagnostics(label), os.path.join(output_dir, "diagnostics"))
+                elif op_name == "tc_by_products":
+                    check_directory(get_path_for_testcase_by_products(label), os.path.join(output_dir, "tc-by-products"))
+                else:
+                    temp_file = get_temporary_file(suffix=".tmp", prefix=label + "-")
+                    if os.path.dirname(os.path.dirname(temp_file)) != os.path.join(output_dir, "temp"):
+                        problems.append("Temporary file '{}' is not in the temp directory.".format(temp_file))
+                    elif not os.path.isfile(temp_file):
+                        problems.append("Temporary file '{}' was not reserved.".format(temp_file))
+                    local_temp_files.append(temp_file)
+            except Exception: # pylint: disable=broad-except
+                with results_lock:
+                    errors.append(traceback.format_exc())
+
+        with results_lock:
+            temp_files.extend(local_temp_files)
+
+        return
+
+    threads = [threading.Thread(target=worker_thread, args=(tidx,)) for tidx in range(thread_count)]
+    for thread in threads:
+        thread.start()
+
+    start_gate.wait()
+    start = time.perf_counter()
+
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - start
+
+    worker_results = {
+        "worker_id": worker_id,
+        "output_dir": output_dir,
+        "elapsed": elapsed,
+        "ops": thread_count * op_count,
+        "errors": errors,
+        "problems": problems,
+        "temp_files": temp_files
+    }
+
+    return worker_results
+
+def run_configuration(target_dir: str, thread_count: int, process_count: int, op_count: int) -> Dict[str, Any]:
+    """
+        Runs a configuration of worker processes and threads against an output directory under the
+        target directory and checks the combined results for correctness.
+    """
+    sandbox_dir = tempfile.mkdtemp(prefix="mjr-paths-", dir=target_dir)
+    try:
+        output_dir = os.path.join(sandbox_dir, "output")
+
+        env = dict(os.environ)
+        env["MJR_OUTPUT_DIRECTORY"] = output_dir
+        python_path = [SOURCE_PACKAGES_DIR]
+        if "PYTHONPATH" in env:
+            python_path.append(env["PYTHONPATH"])
+        env["PYTHONPATH"] = os.pathsep.join(python_path)
+
+        start = time.perf_counter()
+
+        procs = []
+        for worker_id in range(process_count):
+            command = [sys.executable, os.path.abspath(__file__), "--worker", str(worker_id),
+                       "--worker-threads", str(thread_count), "--ops", str(op_count)]
+            procs.append(subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True))
+
+        worker_results = []
+        failures = []
+        for proc in procs:
+            stdout, stderr = proc.communicate()
+            if proc.returncode != 0:
+                failures.append(stderr)
+                continue
+            for line in stdout.splitlines():
+                if line.startswith("MJR-BENCHMARK:"):
+                    worker_results.append(json.loads(line[len("MJR-BENCHMARK:"):]))
+
+        elapsed = time.perf_counter() - start
+
+        errors = list(failures)
+        problems = []
+        seen_temp_files = set()
+        duplicate_temp_files = 0
+
+        for result in worker_results:
+            errors.extend(result["errors"])
+            problems.extend(result["problems"])
+            if result["output_dir"] != output_dir:
+                problems.append("Worker {} used the output directory '{}'.".format(result["worker_id"], result["output_dir"]))
+            for temp_file in result["temp_files"]:
+                if temp_file in seen_temp_files:
+                    duplicate_temp_files += 1
+                seen_temp_files.add(temp_file)
+
+        total_ops = sum([result["ops"] for result in worker_results])
+        slowest_worker = max([result["elapsed"] for result in worker_results]) if len(worker_results) > 0 else None
+
+        config_results = {
+            "target_dir": target_dir,
+            "threads": thread_count,
+            "processes": process_count,
+            "ops": total_ops,
+            "elapsed": elapsed,
+            "ops_per_sec": total_ops / slowest_worker if slowest_worker else None,
+            "errors": len(errors),
+            "problems": len(problems),
+            "duplicate_temp_files": duplicate_temp_files,
+            "error_details": errors[:5],
+            "problem_details": problems[:5]
+        }
+
+    finally:
+        shutil.rmtree(sandbox_dir, ignore_errors=True)
+
+    return config_results
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(description="Stress and benchmark the runtime path APIs.")
+    parser.add_argument("--threads", default="1,4,16", help="Comma separated thread counts per process.")
+    parser.add_argument("--processes", default="1,4", help="Comma separated process counts.")
+    parser.add_argument("--ops", type=int, default=400, help="The number of calls made by each thread.")
+    parser.add_argument("--target-dirs", default=None, help="Comma separated directories to run against, "
+                        "defaults to the temp directory and /dev/shm when it exists.")
+    parser.add_argument("--history", default=None, help="The JSON history file to compare against.")
+    parser.add_argument("--record", action="store_true", help="Append the results to the history file.")
+    parser.add_argument("--worker", type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-threads", type=int, default=1, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        worker_results = run_worker(args.worker, args.worker_threads, args.ops)
+        sys.stdout.write("MJR-BENCHMARK:" + json.dumps(worker_results) + "\n")
+        return 0
+
+    if args.target_dirs is not None:
+        target_dirs = [tdir.strip() for tdir in args.target_dirs.split(",") if len(tdir.strip()) > 0]
+    else:
+        target_dirs = [tempfile.gettempdir()]
+        if os.path.isdir("/dev/shm"):
+            target_dirs.append("/dev/shm")
+
+    thread_counts = [int(tcount) for tcount in args.threads.split(",")]
+    process_counts = [int(pcount) for pcount in args.processes.split(",")]
+
+    all_results = []
+    history_results = {}
+    failed = False
+
+    for target_dir in target_dirs:
+        for process_count in process_counts:
+            for thread_count in thread_counts:
+                config_results = run_configuration(target_dir, thread_count, process_count, args.ops)
+                all_results.append(config_results)
+
+                case_name = "{}:p{}:t{}".format(target_dir, process_count, thread_count)
+                history_results[case_name] = { "ops_per_sec": config_results["ops_per_sec"] }
+
+                if config_results["errors"] > 0 or config_results["problems"] > 0 or config_results["duplicate_temp_files"] > 0:
+                    failed = True
+
+                print("{:<32} processes={:<3} threads={:<3} ops/sec={:>10.1f} errors={} problems={} duplicates={}".format(
+                    target_dir, process_count, thread_count, config_results["ops_per_sec"] or 0.0, config_results["errors"],
+                    config_results["problems"], config_results["duplicate_temp_files"]))
+
+    print(json.dumps(all_results, indent=4))
+
+    regressions = []
+    if args.history is not None:
+        regressions = find_regressions(args.history, BENCHMARK_SUITE, history_results, DEFAULT_THRESHOLDS)
+        if args.record and not failed and len(regressions) == 0:
+            append_history_entry(args.history, BENCHMARK_SUITE, history_results)
+
+    for regression in regressions:
+        print("REGRESSION: {}".format(regression), file=sys.stderr)
+
+    exit_code = 1 if failed or len(regressions) > 0 else 0
+
+    return exit_code
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+.. module:: benchmark_startup
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Benchmark of the cost of initializing and activating the runtime for each activation profile.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+
+    Each sample initializes and activates the runtime in a fresh python process with its own home
+    and temp directories, and measures:
+
+        * wall_time: The wall time of the whole process in seconds.
+        * activation_time: The time spent in initialize_runtime and activate_runtime in seconds.
+        * peak_rss_kb: The peak resident set size of the process in KiB.
+        * module_count: The number of modules imported by initialization and activation.
+        * files_created / dirs_created: The files and directories created under the home and temp directories.
+        * syscalls: The number of system calls made by the process, when run with --strace.
+
+    Usage::
+
+        cd source
+        python3 tests/benchmarks/benchmark_startup.py --repeat 5 --history ../benchmarks/startup-history.json --record
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarkhistory import append_history_entry, find_regressions, summarize_samples # pylint: disable=wrong-import-position
+
+BENCHMARK_SUITE = "startup"
+
+SOURCE_PACKAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "packages"))
+
+DEFAULT_PROFILES = ["command", "console", "service", "testrun"]
+
+DEFAULT_THRESHOLDS = {
+    "wall_time": 1.25,
+    "activation_time": 1.25,
+    "peak_rss_kb": 1.10,
+    "module_count": 1.05,
+    "files_created": 1.0,
+    "dirs_created": 1.0,
+    "syscalls": 1.15
+}
+
+CHILD_SCRIPT = """
+import json, resource, sys, time
+
+profile_name, home_dir = sys.argv[1], sys.argv[2]
+modules_before = len(sys.modules)
+start = time.perf_counter()
+
+from mojo.runtime.initialize import initialize_runtime
+initialize_runtime(name="mjr", home_dir=home_dir, logger_name="MJR", service_name="benchmark")
+
+from mojo.runtime.activation import activate_runtime, ActivationProfile
+activate_runtime(profile=ActivationProfile(profile_name))
+
+activation_time = time.perf_counter() - start
+
+peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == "darwin":
+    peak_rss = peak_rss / 1024
+
+sys.stdout.write("MJR-BENCHMARK:" + json.dumps({
+    "activation_time": activation_time,
+    "peak_rss_kb": peak_rss,
+    "module_count": len(sys.modules) - modules_before
+}) + "\\n")
+sys.stdout.flush()
+"""
+
+
+def count_tree(root_dir: str) -> Tuple[int, int]:
+    """
+        Counts the files and directories below a directory.
+    """
+    file_count = 0
+    dir_count = 0
+
+    for _, dirnames, filenames in os.walk(root_dir):
+        dir_count += len(dirnames)
+        file_count += len(filenames)
+
+    return file_count, dir_count
+
+def parse_strace_summary(summary_file: str) -> Optional[int]:
+    """
+        Parses the total number of calls from the summary written by 'strace -c'.
+    """
+    total_calls = None
+
+    with open(summary_file, 'r') as sf:
+        for line in sf:
+            tokens = line.split()
+            if len(tokens) >= 5 and tokens[-1] == "total":
+                total_calls = int(tokens[3])
+
+    return total_calls
+
+def run_sample(profile_name: str, use_strace: bool) -> Dict[str, Any]:
+    """
+        Runs a single initialization and activation of the runtime in a fresh process.
+    """
+    sandbox_dir = tempfile.mkdtemp(prefix="mjr-benchmark-")
+    try:
+        home_dir = os.path.join(sandbox_dir, "home")
+        temp_dir = os.path.join(sandbox_dir, "tmp")
+        os.makedirs(home_dir)
+        os.makedirs(temp_dir)
+
+        env = dict(os.environ)
+        env["TMPDIR"] = temp_dir
+        env["MJR_SERVICE_NAME"] = "benchmark"
+        python_path = [SOURCE_PACKAGES_DIR]
+        if "PYTHONPATH" in env:
+            python_path.append(env["PYTHONPATH"])
+        env["PYTHONPATH"] = os.pathsep.join(python_path)
+
+        command = [sys.executable, "-c", CHILD_SCRIPT, profile_name, home_dir]
+
+        strace_file = os.path.join(sandbox_dir, "strace.txt")
+        if use_strace:
+            command = ["strace", "-f", "-c", "-o", strace_file] + command
+
+        start = time.perf_counter()
+        proc = subprocess.run(command, env=env, capture_output=True, text=True)
+        wall_time = time.perf_counter() - start
+
+        if proc.returncode != 0:
+            errmsg_lines = [
+                "The benchmark process failed for profile '{}'.".format(profile_name),
+                "STDERR:",
+                proc.stderr
+            ]
+            errmsg = os.linesep.join(errmsg_lines)
+            raise RuntimeError(errmsg)
+
+        sample = None
+        for line in proc.stdout.splitlines():
+            if line.startswith("MJR-BENCHMARK:"):
+                sample = json.loads(line[len("MJR-BENCHMARK:"):])
+
+        if sample is None:
+            raise RuntimeError("The benchmark process for profile '{}' did not report its results.".format(profile_name))
+
+        sample["wall_time"] = wall_time
+
+        home_files, home_dirs = count_tree(home_dir)
+        temp_files, temp_dirs = count_tree(temp_dir)
+        sample["files_created"] = home_files + temp_files
+        sample["dirs_created"] = home_dirs + temp_dirs
+
+        sample["syscalls"] = parse_strace_summary(strace_file) if use_strace else None
+
+    finally:
+        shutil.rmtree(sandbox_dir, ignore_errors=True)
+
+    return sample
+
+def run_benchmark(profiles: List[str], repeat: int, use_strace: bool) -> Dict[str, Dict[str, float]]:
+
+    results = {}
+
+    for profile_name in profiles:
+        samples = [run_sample(profile_name, use_strace) for _ in range(repeat)]
+        results[profile_name] = summarize_samples(samples)
+
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+
+    parser = argparse.ArgumentParser(description="Benchmark the startup and activation of the runtime.")
+    parser.add_argument("--profiles", default=",".join(DEFAULT_PROFILES), help="Comma separated activation profiles.")
+    parser.add_argument("--repeat", type=int, default=5, help="The number of samples per profile.")
+    parser.add_argument("--strace", action="store_true", help="Count the system calls with strace.")
+    parser.add_argument("--history", default=None, help="The JSON history file to compare against.")
+    parser.add_argument("--record", action="store_true", help="Append the results to the history file.")
+    parser.add_argument("--window", type=int, default=5, help="The number of history entries in the baseline.")
+    args = parser.parse_args(argv)
+
+    if args.strace and shutil.which("strace") is None:
+        parser.error("The --strace option requires strace to be installed.")
+
+    profiles = [pname.strip() for pname in args.profiles.split(",") if len(pname.strip()) > 0]
+
+    results = run_benchmark(profiles, args.repeat, args.strace)
+
+    print(json.dumps(results, indent=4))
+
+    regressions = []
+    if args.history is not None:
+        regressions = find_regressions(args.history, BENCHMARK_SUITE, results, DEFAULT_THRESHOLDS, window=args.window)
+        if args.record and len(regressions) == 0:
+            append_history_entry(args.history, BENCHMARK_SUITE, results)
+
+    for regression in regressions:
+        print("REGRESSION: {}".format(regression), file=sys.stderr)
+
+    exit_code = 1 if len(regressions) > 0 else 0
+
+    return exit_code
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+.. module:: benchmarkhistory
+    :platform: Darwin, Linux, Unix, Windows
+    :synopsis: Module which contains the functions used by the benchmarks to keep a JSON history of
+               their results and to detect regressions against the recent history.
+
+.. moduleauthor:: Myron Walker <myron.walker@gmail.com>
+"""
+
+__author__ = "Myron Walker"
+__copyright__ = "Copyright 2023, Myron W Walker"
+__credits__ = []
+
+
+from typing import Any, Dict, List, Optional
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from datetime import datetime
+
+
+def append_history_entry(history_file: str, suite: str, results: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """
+        Appends the results of a benchmark run to a history file.
+
+        :param history_file: The JSON history file.
+        :param suite: The name of the benchmark suite.
+        :param results: A dictionary of case names to dictionaries of metric names to values.
+
+        :returns: The history entry that was appended.
+    """
+    history = load_history(history_file)
+
+    entry = {
+        "suite": suite,
+        "timestamp": datetime.now().isoformat(),
+        "commit": get_source_commit(),
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "results": results
+    }
+    history.append(entry)
+
+    history_dir = os.path.dirname(os.path.abspath(history_file))
+    os.makedirs(history_dir, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(prefix=".history-", suffix=".json", dir=history_dir)
+    with os.fdopen(fd, 'w') as hf:
+        json.dump(history, hf, indent=4)
+    os.replace(temp_path, history_file)
+
+    return entry
+
+def find_regressions(history_file: str, suite: str, results: Dict[str, Dict[str, float]], thresholds: Dict[str, float],
+                     window: int = 5) -> List[str]:
+    """
+        Compares the results of a benchmark run with the median of the most recent entries in the
+        history for the same suite, python version and platform.
+
+        :param history_file: The JSON history file.
+        :param suite: The name of the benchmark suite.
+        :param results: A dictionary of case names to dictionaries of metric names to values.
+        :param thresholds: A dictionary of metric names to the maximum allowed ratio of the result to
+                           the baseline.  A metric with a ratio below 1.0 is one where lower values
+                           are regressions, such as throughput, and the ratio is the minimum allowed.
+        :param window: The number of recent history entries the baseline is computed from.
+
+        :returns: A list of descriptions of the regressions that were found.
+    """
+    regressions = []
+
+    history = [
+        entry for entry in load_history(history_file)
+        if entry.get("suite") == suite and entry.get("python") == platform.python_version()
+            and entry.get("platform") == sys.platform
+    ]
+    history = history[-window:]
+
+    if len(history) == 0:
+        return regressions
+
+    for case_name, case_metrics in results.items():
+        for metric_name, metric_value in case_metrics.items():
+            if metric_name not in thresholds or metric_value is None:
+                continue
+
+            baseline_values = [
+                entry["results"][case_name][metric_name] for entry in history
+                if case_name in entry["results"] and entry["results"][case_name].get(metric_name) is not None
+            ]
+            if len(baseline_values) == 0:
+                continue
+
+            baseline = statistics.median(baseline_values)
+            ratio = thresholds[metric_name]
+
+            if ratio >= 1.0:
+                regressed = metric_value > baseline * ratio
+            else:
+                regressed = metric_value < baseline * ratio
+
+            if regressed:
+                regressions.append("{}: {} is {:.4g}, baseline {:.4g}, allowed ratio {}".format(
+                    case_name, metric_name, metric_value, baseline, ratio))
+
+    return regressions
+
+def get_source_commit() -> Optional[str]:
+    """
+        Returns the git commit of the source tree being benchmarked, if it can be determined.
+    """
+    commit = None
+
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, timeout=10)
+        if proc.returncode == 0:
+            commit = proc.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+
+    return commit
+
+def load_history(history_file: str) -> List[Dict[str, Any]]:
+    history = []
+
+    if os.path.exists(history_file):
+        with open(history_file, 'r') as hf:
+            history = json.load(hf)
+
+    return history
+
+def summarize_samples(samples: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+        Reduces the samples from repeated runs of a case to the median of each metric.
+    """
+    summary = {}
+
+    metric_names = []
+    for sample in samples:
+        for metric_name in sample.keys():
+            if metric_name not in metric_names:
+                metric_names.append(metric_name)
+
+    for metric_name in metric_names:
+        values = [sample[metric_name] for sample in samples if sample.get(metric_name) is not None]
+        summary[metric_name] = statistics.median(values) if len(values) > 0 else None
+
+    return summary
@@ -0,0 +1,109 @@
+
+import io
+import logging
+import os
+import tempfile
+import unittest
+
+from contextlib import redirect_stdout
+
+from mojo.runtime.binarylog import (
+    BinaryLogHandler,
+    format_binary_log_record,
+    main,
+    read_binary_log,
+    read_ring_buffer
+)
+
+
+class TestBinaryLog(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self._log_file = os.path.join(self._tempdir.name, "log.mjrlog")
+        self._ring_file = os.path.join(self._tempdir.name, "diagnostics", "ring.mjrring")
+
+        self._logger = logging.getLogger("MJR-TEST-BINARYLOG")
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+        return
+
+    def tearDown(self):
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+            handler.close()
+        self._logger.propagate = True
+        self._tempdir.cleanup()
+        return
+
+    def test_stream_round_trip(self):
+
+        handler = BinaryLogHandler(log_file=self._log_file)
+        self._logger.addHandler(handler)
+
+        self._logger.debug("Connected. host=%s port=%d secure=%s latency=%.2f", "alpha", 8080, True, 1.5)
+        self._logger.info("A message without arguments.")
+        self._logger.warning("Mapped arguments. host=%(host)s", {"host": "beta"})
+        try:
+            raise RuntimeError("failure")
+        except RuntimeError:
+            self._logger.exception("Operation failed. attempt=%d", 3)
+
+        handler.flush()
+
+        records = list(read_binary_log(self._log_file))
+        assert len(records) == 4, "Expected all of the records. records={}".format(records)
+
+        assert records[0].args == ("alpha", 8080, True, 1.5)
+        assert records[0].logger == "MJR-TEST-BINARYLOG"
+        assert records[0].levelno == logging.DEBUG
+
+        lines = [format_binary_log_record(record) for record in records]
+        assert lines[0].endswith("Connected. host=alpha port=8080 secure=True latency=1.50")
+        assert lines[1].endswith("A message without arguments.")
+        assert lines[2].endswith("Mapped arguments. host=beta")
+        assert "Operation failed. attempt=3" in lines[3] and "RuntimeError: failure" in lines[3]
+
+        return
+
+    def test_ring_keeps_the_last_records(self):
+
+        handler = BinaryLogHandler(ring_file=self._ring_file, ring_records=16, ring_slot_size=128)
+        self._logger.addHandler(handler)
+
+        for index in range(100):
+            self._logger.info("Ring record. index=%d", index)
+        self._logger.info("Long record. payload=%s", "x" * 500)
+
+        # The ring is read from the file while it is still mapped, as it would be after a crash.
+        records = read_ring_buffer(self._ring_file)
+        assert len(records) == 16, "The ring should hold the last 16 records. count={}".format(len(records))
+        assert records[0].args == (85,), "Unexpected oldest record. record={}".format(records[0])
+        assert records[-1].template.startswith("Long record. payload=xxx"), "Oversized records should be truncated."
+
+        return
+
+    def test_decoder_cli(self):
+
+        handler = BinaryLogHandler(log_file=self._log_file, ring_file=self._ring_file, ring_records=8)
+        self._logger.addHandler(handler)
+
+        for index in range(10):
+            self._logger.error("Decoded record. index=%d", index)
+        handler.flush()
+
+        for log_file in (self._log_file, self._ring_file):
+            output = io.StringIO()
+            with redirect_stdout(output):
+                rtncode = main([log_file, "--tail", "2"])
+
+            lines = output.getvalue().splitlines()
+            assert rtncode == 0
+            assert len(lines) == 2, "Expected the last two records. lines={}".format(lines)
+            assert lines[-1].endswith("MJR-TEST-BINARYLOG: Decoded record. index=9")
+
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+
+import argparse
+import sys
+import unittest
+
+from datetime import datetime
+
+from mojo.runtime.cliopts import (
+    add_runtime_options,
+    apply_parsed_overrides,
+    collect_parsed_overrides,
+    get_option_dest,
+    get_option_flag
+)
+from mojo.runtime.optionspecs import RUNTIME_OPTION_SPECS
+
+
+class TestCliOptions(unittest.TestCase):
+
+    def test_options_are_generated(self):
+
+        parser = argparse.ArgumentParser()
+        parser.add_argument("--name", dest="name")
+        add_runtime_options(parser, prefix="mjr-")
+
+        parsed = parser.parse_args(["--name", "tool", "--mjr-job-name", "nightly", "--mjr-output-quota-hard", "10G"])
+
+        assert parsed.name == "tool", "The options of the tool should not be affected."
+
+        overrides = collect_parsed_overrides(vars(parsed))
+        assert overrides == { "MJR_JOB_NAME": "nightly", "MJR_OUTPUT_QUOTA_HARD": "10G" }
+
+        return
+
+    def test_options_follow_option_specs(self):
+
+        parser = argparse.ArgumentParser()
+        add_runtime_options(parser)
+
+        parsed = parser.parse_args(["--starttime", "2023-05-01T10:30:00"])
+
+        for spec in RUNTIME_OPTION_SPECS:
+            assert hasattr(parsed, get_option_dest(spec.var_name)), "Missing option for {}.".format(spec.var_name)
+
+        assert parsed.mjr_starttime == datetime(2023, 5, 1, 10, 30), "The datetime options should be parsed."
+
+        return
+
+    def test_log_level_options_are_validated(self):
+
+        parser = argparse.ArgumentParser()
+        add_runtime_options(parser, include=["MJR_LOG_LEVEL_CONSOLE"])
+
+        parsed = parser.parse_args(["--log-level-console", "debug"])
+        assert parsed.mjr_log_level_console == "DEBUG", "The level name should be normalized."
+
+        with self.assertRaises(SystemExit):
+            parser.parse_args(["--log-level-console", "chatty"])
+
+        return
+
+    def test_option_flags(self):
+
+        assert get_option_flag("MJR_LOG_LEVEL_CONSOLE") == "--log-level-console"
+        assert get_option_flag("MJR_JOB_ID", prefix="mjr-") == "--mjr-job-id"
+
+        return
+
+    def test_no_overrides_does_not_import_runtime(self):
+
+        parser = argparse.ArgumentParser()
+        add_runtime_options(parser, include=["MJR_JOB_NAME"])
+
+        parsed = parser.parse_args([])
+        changed = apply_parsed_overrides(parsed)
+
+        assert changed == frozenset()
+        assert "mojo.runtime.optionoverrides" not in sys.modules, "Parsing should not import the override machinery."
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
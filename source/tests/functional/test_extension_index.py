@@ -0,0 +1,89 @@
+
+import os
+import sys
+import tempfile
+import textwrap
+import unittest
+
+from mojo.runtime.extensionindex import ExtensionIndex
+
+
+class TestExtensionIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+
+        package_dir = os.path.join(self._tempdir.name, "mjrtestext")
+        os.makedirs(os.path.join(package_dir, "drivers"))
+
+        self._write_module(package_dir, "__init__.py", "")
+        self._write_module(package_dir, "base.py", """
+            class ExtensionFactory:
+                pass
+        """)
+        self._write_module(package_dir, os.path.join("drivers", "__init__.py"), "")
+        self._write_module(package_dir, os.path.join("drivers", "power.py"), """
+            from mjrtestext.base import ExtensionFactory
+
+            class PowerFactory(ExtensionFactory):
+                pass
+
+            class SmartPowerFactory(PowerFactory):
+                pass
+        """)
+
+        self._driver_file = os.path.join(package_dir, "drivers", "power.py")
+        self._cache_file = os.path.join(self._tempdir.name, "cache", "extension-index.json")
+
+        sys.path.insert(0, self._tempdir.name)
+        return
+
+    def tearDown(self):
+        sys.path.remove(self._tempdir.name)
+        for module_name in list(sys.modules.keys()):
+            if module_name.startswith("mjrtestext"):
+                del sys.modules[module_name]
+        self._tempdir.cleanup()
+        return
+
+    def test_factories_are_indexed_without_import(self):
+
+        index = ExtensionIndex(["mjrtestext"], cache_file=self._cache_file)
+
+        found = [entry.qualified_name for entry in index.find_factories("ExtensionFactory")]
+
+        assert sorted(found) == ["mjrtestext.drivers.power.PowerFactory", "mjrtestext.drivers.power.SmartPowerFactory"]
+        assert "mjrtestext.drivers.power" not in sys.modules, "Indexing should not import the extension modules."
+
+        factory = index.resolve_factory("SmartPowerFactory")
+        assert factory.__name__ == "SmartPowerFactory"
+        assert "mjrtestext.drivers.power" in sys.modules, "Resolving a factory should import its module."
+
+        return
+
+    def test_index_cache_is_reused(self):
+
+        first_index = ExtensionIndex(["mjrtestext"], cache_file=self._cache_file)
+        first_index.build()
+        assert first_index.parsed_file_count == 4
+
+        second_index = ExtensionIndex(["mjrtestext"], cache_file=self._cache_file)
+        second_index.build()
+        assert second_index.parsed_file_count == 0, "Unchanged module files should be loaded from the cache."
+
+        stat_info = os.stat(self._driver_file)
+        os.utime(self._driver_file, ns=(stat_info.st_atime_ns, stat_info.st_mtime_ns + 1000000000))
+
+        third_index = ExtensionIndex(["mjrtestext"], cache_file=self._cache_file)
+        third_index.build()
+        assert third_index.parsed_file_count == 1, "Only the modified module file should be parsed again."
+
+        return
+
+    def _write_module(self, package_dir, relpath, content):
+        with open(os.path.join(package_dir, relpath), 'w') as mf:
+            mf.write(textwrap.dedent(content))
+        return
+
+if __name__ == '__main__':
+    unittest.main()
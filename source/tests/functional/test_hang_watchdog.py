@@ -0,0 +1,99 @@
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from mojo.runtime.enumerations import WatchdogPolicy
+from mojo.runtime.watchdog import HangWatchdog
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestHangWatchdog(unittest.TestCase):
+
+    def test_hang_is_dumped_once_per_stall(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            watchdog = HangWatchdog(tempdir, 0.1, policy=WatchdogPolicy.Dump, capture_memory=True, check_interval=0.01)
+            watchdog.start()
+            try:
+                watchdog.heartbeat("test_setup")
+
+                # The stacks are dumped before the hang is logged.
+                with self.assertLogs(level="WARNING") as logs:
+                    assert wait_for(lambda: len(logs.records) == 2), "The stall should have been logged."
+                assert len(watchdog.dump_files) == 1, "The stall should have been dumped."
+
+                time.sleep(0.2)
+                assert watchdog.hang_count == 1, "A single stall should only be reported once."
+
+                watchdog.heartbeat("test_body")
+                with self.assertLogs(level="WARNING") as logs:
+                    assert wait_for(lambda: len(logs.records) == 2), "A new stall should be logged again."
+                assert len(watchdog.dump_files) == 2, "A new stall should be dumped again."
+            finally:
+                watchdog.stop()
+
+            with open(watchdog.dump_files[0], 'r') as df:
+                content = df.read()
+
+            assert "last_progress=test_setup" in content
+            assert "test_hang_is_dumped_once_per_stall" in content, "The stack of the stalled thread should be dumped."
+            assert "# Memory summary" in content
+
+        return
+
+    def test_log_policy_does_not_write_dumps(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            watchdog = HangWatchdog(tempdir, 0.05, policy=WatchdogPolicy.Log, check_interval=0.01)
+            watchdog.start()
+            try:
+                with self.assertLogs(level="WARNING") as logs:
+                    assert wait_for(lambda: watchdog.hang_count == 1)
+            finally:
+                watchdog.stop()
+
+            assert "No progress has been reported" in logs.output[0]
+            assert os.listdir(tempdir) == []
+
+        return
+
+    @unittest.skipUnless(hasattr(os, "fork"), "The abort test requires a POSIX platform.")
+    def test_abort_does_not_wait_on_logging_locks(self):
+
+        # The hung main thread holds the lock of a logging handler, the abort policy must still
+        # dump the stacks and abort the process.
+        script = "\n".join([
+            "import logging, sys, time",
+            "from mojo.runtime.enumerations import WatchdogPolicy",
+            "from mojo.runtime.watchdog import HangWatchdog",
+            "handler = logging.StreamHandler(sys.stdout)",
+            "logging.getLogger().addHandler(handler)",
+            "watchdog = HangWatchdog(sys.argv[1], 0.1, policy=WatchdogPolicy.Abort, check_interval=0.01)",
+            "watchdog.start()",
+            "handler.acquire()",
+            "time.sleep(30)"
+        ])
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            env = dict(os.environ)
+            env["PYTHONPATH"] = os.pathsep.join(sys.path)
+
+            proc = subprocess.run([sys.executable, "-c", script, tempdir], env=env, capture_output=True, timeout=20)
+
+            assert proc.returncode != 0, "The hung process should have been aborted."
+            assert b"Aborting the hung process" in proc.stderr
+            assert len(os.listdir(tempdir)) == 1, "The stacks should have been dumped before the abort."
+
+        return
@@ -0,0 +1,160 @@
+
+import logging
+import os
+import tempfile
+import unittest
+
+from mojo.runtime.logcontrol import (
+    apply_log_levels,
+    capture_log_handlers,
+    deferred_open_handler_type,
+    find_deferred_log_handlers,
+    get_runtime_log_handlers,
+    open_log_file,
+    register_runtime_log_handler,
+    reopen_log_files,
+    teardown_log_handlers,
+    unregister_runtime_log_handler
+)
+from mojo.runtime.reload import read_reload_file
+
+
+class TestLogControl(unittest.TestCase):
+
+    def test_teardown_only_removes_new_handlers(self):
+
+        root_logger = logging.getLogger()
+        named_logger = logging.getLogger("MJR-TEST-LOGCONTROL")
+
+        existing_handler = logging.NullHandler()
+        root_logger.addHandler(existing_handler)
+
+        try:
+            snapshot = capture_log_handlers()
+
+            added_root_handler = logging.NullHandler()
+            added_named_handler = logging.NullHandler()
+            application_handler = logging.NullHandler()
+            root_logger.addHandler(added_root_handler)
+            named_logger.addHandler(added_named_handler)
+            root_logger.addHandler(application_handler)
+
+            register_runtime_log_handler(added_root_handler)
+            register_runtime_log_handler(added_named_handler)
+
+            teardown_count = teardown_log_handlers(snapshot)
+
+            assert teardown_count == 2, "Both of the runtime handlers added after the snapshot should have been torn down."
+            assert existing_handler in root_logger.handlers, "The handler that existed before the snapshot should remain."
+            assert application_handler in root_logger.handlers, "Handlers added by the application should remain."
+            assert added_root_handler not in root_logger.handlers
+            assert added_named_handler not in named_logger.handlers
+            assert len(get_runtime_log_handlers()) == 0, "The torn down handlers should be unregistered."
+        finally:
+            root_logger.removeHandler(existing_handler)
+            root_logger.removeHandler(application_handler)
+
+        return
+
+    def test_levels_are_applied_and_files_reopened(self):
+
+        root_logger = logging.getLogger()
+        previous_level = root_logger.level
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            log_file = os.path.join(tempdir, "service.log")
+
+            console_handler = logging.StreamHandler()
+            file_handler = logging.FileHandler(log_file)
+            console_handler.setLevel(logging.WARNING)
+            file_handler.setLevel(logging.INFO)
+            root_logger.addHandler(console_handler)
+            root_logger.addHandler(file_handler)
+
+            application_handler = logging.StreamHandler()
+            application_handler.setLevel(logging.WARNING)
+            root_logger.addHandler(application_handler)
+
+            register_runtime_log_handler(console_handler)
+            register_runtime_log_handler(file_handler)
+
+            try:
+                root_logger.setLevel(logging.INFO)
+                apply_log_levels(console_level="ERROR", file_level="DEBUG")
+
+                assert console_handler.level == logging.ERROR
+                assert file_handler.level == logging.DEBUG
+                assert application_handler.level == logging.WARNING, "Handlers of the application should be left alone."
+                assert root_logger.level == logging.DEBUG
+
+                root_logger.debug("before rotation")
+
+                # An external log rotation moves the file away, reopening creates a new file.
+                os.rename(log_file, log_file + ".1")
+                assert reopen_log_files() >= 1
+
+                root_logger.debug("after rotation")
+                file_handler.flush()
+
+                with open(log_file + ".1", 'r') as lf:
+                    assert "before rotation" in lf.read()
+                with open(log_file, 'r') as lf:
+                    assert "after rotation" in lf.read()
+
+                apply_log_levels(file_level="INFO")
+                assert root_logger.level == logging.DEBUG, "The root logger level should never be raised."
+            finally:
+                unregister_runtime_log_handler(console_handler)
+                unregister_runtime_log_handler(file_handler)
+                root_logger.removeHandler(application_handler)
+                root_logger.removeHandler(console_handler)
+                root_logger.removeHandler(file_handler)
+                file_handler.close()
+                root_logger.setLevel(previous_level)
+
+        return
+
+    def test_deferred_log_files_are_opened(self):
+
+        named_logger = logging.getLogger("MJR-TEST-LOGCONTROL-DEFERRED")
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            log_file = os.path.join(tempdir, "deferred.log")
+
+            handler_type = deferred_open_handler_type(logging.FileHandler)
+            assert deferred_open_handler_type(logging.FileHandler) is handler_type, "The deferred types should be cached."
+
+            file_handler = handler_type(log_file)
+            named_logger.addHandler(file_handler)
+
+            try:
+                assert not os.path.exists(log_file), "The file should not be opened when the handler is created."
+                assert file_handler in find_deferred_log_handlers()
+
+                open_log_file(file_handler)
+                assert os.path.exists(log_file)
+                assert file_handler not in find_deferred_log_handlers()
+            finally:
+                named_logger.removeHandler(file_handler)
+                file_handler.close()
+
+        return
+
+    def test_read_reload_file_formats(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            env_file = os.path.join(tempdir, "reload.env")
+            with open(env_file, 'w') as rf:
+                rf.write("# Turn on debug logging\n\nMJR_LOG_LEVEL_FILE = DEBUG\nMJR_LOG_LEVEL_CONSOLE=INFO\n")
+
+            json_file = os.path.join(tempdir, "reload.json")
+            with open(json_file, 'w') as rf:
+                rf.write('{ "MJR_LOG_LEVEL_FILE": "DEBUG" }')
+
+            assert read_reload_file(env_file) == { "MJR_LOG_LEVEL_FILE": "DEBUG", "MJR_LOG_LEVEL_CONSOLE": "INFO" }
+            assert read_reload_file(json_file) == { "MJR_LOG_LEVEL_FILE": "DEBUG" }
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+
+import logging
+import time
+import unittest
+
+from mojo.runtime.logcontrol import register_runtime_log_handler, unregister_runtime_log_handler
+from mojo.runtime.logfilters import (
+    DuplicateFilter,
+    RateLimitFilter,
+    install_log_filters,
+    uninstall_log_filters
+)
+
+
+class CollectingHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.records = []
+        return
+
+    def emit(self, record):
+        self.records.append(record)
+        return
+
+
+class TestLogFilters(unittest.TestCase):
+
+    def setUp(self):
+        self._logger = logging.getLogger("MJR-TEST-LOGFILTERS")
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+        self._handler = CollectingHandler()
+        self._logger.addHandler(self._handler)
+        return
+
+    def tearDown(self):
+        uninstall_log_filters()
+        self._logger.removeHandler(self._handler)
+        self._logger.propagate = True
+        return
+
+    def test_rate_limit_per_template(self):
+
+        rate_filter = RateLimitFilter(rate=0.001, burst=5, summary_interval=3600)
+        self._handler.addFilter(rate_filter)
+
+        for index in range(100):
+            self._logger.warning("Dependency is down. attempt=%d", index)
+        self._logger.warning("A different message.")
+        self._logger.error("Dependency is down. attempt=%d", 0)
+
+        messages = [record.getMessage() for record in self._handler.records]
+        assert len(messages) == 7, "Expected the burst of the first template and one of each other key. messages={}".format(messages)
+
+        rate_filter.flush()
+
+        summary = self._handler.records[-1].getMessage()
+        assert summary.startswith("Suppressed 95 messages"), "Unexpected summary record. summary={}".format(summary)
+        assert self._handler.records[-1].levelno == logging.WARNING
+
+        return
+
+    def test_rate_limit_summary_interval(self):
+
+        rate_filter = RateLimitFilter(rate=0.001, burst=1, summary_interval=0.05)
+        self._handler.addFilter(rate_filter)
+
+        for _ in range(10):
+            self._logger.info("Flapping.")
+        time.sleep(0.1)
+        self._logger.info("Flapping.")
+
+        messages = [record.getMessage() for record in self._handler.records]
+        assert messages[0] == "Flapping."
+        assert messages[1].startswith("Suppressed 10 messages"), "Expected a periodic summary. messages={}".format(messages)
+
+        return
+
+    def test_duplicate_filter(self):
+
+        dup_filter = DuplicateFilter(window=3600)
+        self._handler.addFilter(dup_filter)
+
+        for _ in range(20):
+            self._logger.warning("Connection refused. host=%s", "alpha")
+        self._logger.warning("Connection refused. host=%s", "beta")
+
+        messages = [record.getMessage() for record in self._handler.records]
+        assert messages[0] == "Connection refused. host=alpha"
+        assert messages[1].startswith("Suppressed 19 identical messages"), "Unexpected records. messages={}".format(messages)
+        assert messages[2] == "Connection refused. host=beta"
+
+        return
+
+    def test_filters_shared_by_handlers(self):
+
+        second_handler = CollectingHandler()
+        self._logger.addHandler(second_handler)
+
+        try:
+            install_log_filters(rate=1.0, burst=4, dedup=True, summary_interval=3600,
+                                handlers=[self._handler, second_handler])
+
+            for index in range(4):
+                self._logger.warning("Distinct record. index=%d", index)
+            for _ in range(3):
+                self._logger.warning("Repeated record.")
+
+            for handler in (self._handler, second_handler):
+                messages = [record.getMessage() for record in handler.records]
+                expected = ["Distinct record. index={}".format(index) for index in range(4)] + ["Repeated record."]
+                assert messages == expected, "Each handler should get every record once. messages={}".format(messages)
+
+            uninstall_log_filters()
+
+            for handler in (self._handler, second_handler):
+                summary = handler.records[-1].getMessage()
+                assert summary.startswith("Suppressed 2 identical messages"), "Unexpected summary. summary={}".format(summary)
+        finally:
+            self._logger.removeHandler(second_handler)
+
+        return
+
+    def test_install_and_uninstall(self):
+
+        filters = install_log_filters(rate=0.001, burst=1, dedup=True, handlers=[self._handler])
+        assert len(filters) == 2
+        assert all(lfilter in self._handler.filters for lfilter in filters)
+
+        self._logger.critical("Always logged.")
+        self._logger.critical("Always logged.")
+        assert len(self._handler.records) == 2, "Critical records should never be filtered."
+
+        uninstall_log_filters()
+        assert len(self._handler.filters) == 0, "The filters should have been removed."
+
+        return
+
+    def test_default_handlers_are_runtime_handlers(self):
+
+        runtime_handler = CollectingHandler()
+        self._logger.addHandler(runtime_handler)
+        register_runtime_log_handler(runtime_handler)
+
+        try:
+            filters = install_log_filters(dedup=True)
+
+            assert all(lfilter in runtime_handler.filters for lfilter in filters), "The runtime handler should be filtered."
+            assert len(self._handler.filters) == 0, "The handlers of the application should not be filtered."
+
+            uninstall_log_filters()
+            assert len(runtime_handler.filters) == 0, "The filters should have been removed."
+        finally:
+            unregister_runtime_log_handler(runtime_handler)
+            self._logger.removeHandler(runtime_handler)
+
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
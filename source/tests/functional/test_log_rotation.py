@@ -0,0 +1,91 @@
+
+import gzip
+import logging
+import os
+import tempfile
+import unittest
+
+from mojo.runtime.enumerations import LogCompression
+from mojo.runtime.logrotation import CompressingRotatingFileHandler, resolve_log_compression
+
+
+class TestLogRotation(unittest.TestCase):
+
+    def setUp(self):
+        self._tempdir = tempfile.TemporaryDirectory()
+        self._logfile = os.path.join(self._tempdir.name, "service.log")
+        self._logger = logging.getLogger("MJR-TEST-LOGROTATION")
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+        return
+
+    def tearDown(self):
+        for handler in list(self._logger.handlers):
+            self._logger.removeHandler(handler)
+            handler.close()
+        self._logger.propagate = True
+        self._tempdir.cleanup()
+        return
+
+    def _create_handler(self, **kwargs) -> CompressingRotatingFileHandler:
+        handler = CompressingRotatingFileHandler(self._logfile, maxBytes=1024, backupCount=5,
+                                                 compression=LogCompression.Gzip, **kwargs)
+        self._logger.addHandler(handler)
+        return handler
+
+    def test_rotated_segments_are_compressed(self):
+
+        handler = self._create_handler()
+
+        for index in range(100):
+            self._logger.info("Rotated record. index=%04d padding=%s", index, "x" * 40)
+
+        assert handler.wait_for_compression(10), "The rotated segments should have been compressed."
+
+        for index in range(1, 6):
+            segment = "{}.{}".format(self._logfile, index)
+            assert not os.path.exists(segment), "The segment should have been compressed. segment={}".format(segment)
+            assert os.path.exists(segment + ".gz"), "The compressed segment is missing. segment={}".format(segment)
+
+        assert not os.path.exists(self._logfile + ".6.gz"), "Only backupCount segments should be kept."
+
+        # The newest segment has the records logged right before the current log file.
+        with gzip.open(self._logfile + ".1.gz", 'rt') as sf:
+            newest = sf.read()
+        with open(self._logfile, 'r') as lf:
+            current = lf.read()
+
+        assert "index=0099" in current, "The last record should be in the current log file."
+        assert "index=0099" not in newest and "index=00" in newest, "The newest segment should have the earlier records."
+
+        return
+
+    def test_retention_bytes(self):
+
+        handler = self._create_handler(retention_bytes=1500)
+
+        for index in range(100):
+            self._logger.info("Retained record. index=%04d padding=%s", index, os.urandom(20).hex())
+
+        assert handler.wait_for_compression(10)
+
+        retained = [
+            os.path.getsize("{}.{}.gz".format(self._logfile, index)) for index in range(1, 6)
+            if os.path.exists("{}.{}.gz".format(self._logfile, index))
+        ]
+        assert sum(retained) <= 1500, "The compressed segments exceed the retention. retained={}".format(retained)
+        assert os.path.exists(self._logfile + ".1.gz"), "The newest compressed segment should be kept."
+
+        return
+
+    def test_resolve_falls_back_to_gzip(self):
+
+        resolved = resolve_log_compression("auto")
+        assert resolved in (LogCompression.Gzip, LogCompression.Zstd)
+        assert resolve_log_compression("gzip") == LogCompression.Gzip
+
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+
+import os
+import tempfile
+import time
+import tracemalloc
+import unittest
+
+from mojo.runtime.memorydiag import MemoryDiagnostics, get_process_rss, list_memory_snapshots
+
+
+def allocate_leaky_buffers(count: int):
+    return [bytearray(4096) for _ in range(count)]
+
+
+class TestMemoryDiagnostics(unittest.TestCase):
+
+    def test_snapshots_contain_top_sites_and_diffs(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            memdiag = MemoryDiagnostics(tempdir, top_n=10)
+            memdiag.start()
+            try:
+                leaked = allocate_leaky_buffers(500)
+                checkpoint_file = memdiag.take_snapshot("checkpoint")
+            finally:
+                memdiag.stop()
+
+            assert not tracemalloc.is_tracing(), "Tracing started by the diagnostics should be stopped."
+            del leaked
+
+            snapshot_files = list_memory_snapshots(tempdir)
+            assert [os.path.basename(sf).split("-", 3)[3] for sf in snapshot_files] == \
+                ["activation.txt", "checkpoint.txt", "exit.txt"]
+
+            with open(checkpoint_file, 'r') as cf:
+                content = cf.read()
+
+            assert "## Top 10 allocation sites" in content
+            assert "## Top 10 differences from snapshot 'activation'" in content
+            assert "test_memory_diagnostics.py" in content, "The leaking allocation site should be reported."
+
+        return
+
+    def test_rss_limit_triggers_snapshot(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            rss = get_process_rss()
+            assert rss is not None and rss > 0
+
+            memdiag = MemoryDiagnostics(tempdir, rss_limit=1, rss_interval=0.01)
+            memdiag.start()
+            try:
+                deadline = time.time() + 5
+                while time.time() < deadline:
+                    if any(sf.endswith("rss-threshold.txt") for sf in list_memory_snapshots(tempdir)):
+                        break
+                    time.sleep(0.01)
+            finally:
+                memdiag.stop()
+
+            assert any(sf.endswith("rss-threshold.txt") for sf in list_memory_snapshots(tempdir))
+
+        return
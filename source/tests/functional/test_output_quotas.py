@@ -0,0 +1,100 @@
+
+import logging
+import logging.handlers
+import os
+import tempfile
+import unittest
+
+from mojo.runtime import quotas
+from mojo.runtime.exceptions import OutputQuotaExceededError
+from mojo.runtime.quotas import OutputQuota, QuotaTrackedFile, configure_output_quota, quota_tracked_handler_type
+
+
+class TestOutputQuotas(unittest.TestCase):
+
+    def test_reserve_within_limits(self):
+
+        quota = OutputQuota(hard_limit=100)
+        quota.reserve(40)
+        quota.reserve(60)
+
+        assert quota.bytes_written == 100, "The quota should have accounted for all the bytes reserved."
+
+        return
+
+    def test_reserve_exceeds_hard_limit(self):
+
+        quota = OutputQuota(hard_limit=100)
+        quota.reserve(90)
+
+        with self.assertRaises(OutputQuotaExceededError):
+            quota.reserve(11)
+
+        assert quota.bytes_written == 90, "A rejected reservation should not be accounted."
+
+        return
+
+    def test_tracked_file_raises_before_write(self):
+
+        quota = OutputQuota(hard_limit=10)
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            filename = os.path.join(tempdir, "artifact.txt")
+
+            with QuotaTrackedFile(open(filename, 'w'), quota, filename) as tf:
+                tf.write("0123456789")
+
+                with self.assertRaises(OutputQuotaExceededError):
+                    tf.write("X")
+
+            with open(filename, 'r') as rf:
+                content = rf.read()
+
+        assert content == "0123456789", "The write that exceeded the quota should not have been performed."
+
+        with self.assertRaises(OutputQuotaExceededError):
+            quota.check()
+
+        return
+
+    def test_log_file_writes_are_counted(self):
+
+        logger = logging.getLogger("MJR-TEST-QUOTA-LOG")
+        logger.propagate = False
+
+        previous_quota = quotas.OUTPUT_QUOTA
+        quota = configure_output_quota(soft_limit=None, hard_limit=20)
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            log_file = os.path.join(tempdir, "service.log")
+
+            handler_type = quota_tracked_handler_type(logging.handlers.RotatingFileHandler)
+            assert quota_tracked_handler_type(logging.handlers.RotatingFileHandler) is handler_type
+
+            handler = handler_type(log_file, maxBytes=1000, backupCount=1)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+
+            try:
+                logger.warning("0123456789")
+                logger.warning("0123456789")
+                logger.warning("0123456789")
+
+                assert quota.bytes_written == 33, "Every byte written to the log should have been counted."
+
+                handler.flush()
+                with open(log_file, 'r') as lf:
+                    assert lf.read().count("0123456789") == 3, "Log writes should never be refused by the quota."
+
+                with self.assertRaises(OutputQuotaExceededError):
+                    quota.check()
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+                logger.propagate = True
+                quotas.OUTPUT_QUOTA = previous_quota
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
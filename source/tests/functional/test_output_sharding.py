@@ -0,0 +1,98 @@
+
+import json
+import os
+import tempfile
+import unittest
+
+from mojo.runtime.enumerations import ShardMergeMode
+from mojo.runtime.sharding import (
+    SHARD_COMPLETE_MARKER,
+    SHARD_MANIFEST_FILENAME,
+    SHARD_MERGE_LOCK_FILENAME,
+    SHARDS_DIRNAME,
+    complete_output_shard,
+    configure_output_sharding,
+    merge_output_shards,
+    reset_output_sharding
+)
+
+
+class TestOutputSharding(unittest.TestCase):
+
+    def _write_shard_file(self, unified_dir: str, shard_name: str, relpath: str, content: str):
+        fullpath = os.path.join(unified_dir, SHARDS_DIRNAME, shard_name, relpath)
+        os.makedirs(os.path.dirname(fullpath), exist_ok=True)
+        with open(fullpath, 'w') as of:
+            of.write(content)
+        return
+
+    def test_merge_symlinks(self):
+
+        with tempfile.TemporaryDirectory() as unified_dir:
+            self._write_shard_file(unified_dir, "node1-100", os.path.join("artifacts", "a.txt"), "a")
+            self._write_shard_file(unified_dir, "node2-200", os.path.join("artifacts", "b.txt"), "b")
+            self._write_shard_file(unified_dir, "node2-200", os.path.join("artifacts", "a.txt"), "a2")
+
+            merged = merge_output_shards(unified_dir, mode=ShardMergeMode.Symlink)
+
+            assert merged == 3, "All of the shard files should have been merged."
+
+            unified_files = os.listdir(os.path.join(unified_dir, "artifacts"))
+            assert len(unified_files) == 3, "The conflicting path should have been suffixed with the shard name."
+
+            with open(os.path.join(unified_dir, "artifacts", "b.txt"), 'r') as rf:
+                content = rf.read()
+            assert content == "b", "The symlink should resolve to the shard file."
+
+            with open(os.path.join(unified_dir, SHARD_MANIFEST_FILENAME), 'r') as mf:
+                entries = [json.loads(line) for line in mf]
+            assert len(entries) == 3, "The manifest should have an entry for each shard file."
+
+        return
+
+    def test_merge_can_be_rerun(self):
+
+        for mode in (ShardMergeMode.Symlink, ShardMergeMode.Copy):
+            with tempfile.TemporaryDirectory() as unified_dir:
+                self._write_shard_file(unified_dir, "node1-100", os.path.join("artifacts", "a.txt"), "a")
+                self._write_shard_file(unified_dir, "node2-200", os.path.join("artifacts", "a.txt"), "a2")
+
+                assert merge_output_shards(unified_dir, mode=mode) == 2
+                first_files = sorted(os.listdir(os.path.join(unified_dir, "artifacts")))
+
+                self._write_shard_file(unified_dir, "node3-300", os.path.join("artifacts", "c.txt"), "c")
+
+                assert merge_output_shards(unified_dir, mode=mode) == 3, "The re-run should merge every shard file."
+
+                unified_files = sorted(os.listdir(os.path.join(unified_dir, "artifacts")))
+                assert unified_files == sorted(first_files + ["c.txt"]), "The re-run should not duplicate entries. mode={} files={}".format(
+                    mode, unified_files)
+                assert not os.path.exists(os.path.join(unified_dir, SHARD_MERGE_LOCK_FILENAME))
+
+        return
+
+    def test_last_shard_to_complete_merges(self):
+
+        with tempfile.TemporaryDirectory() as unified_dir:
+            self._write_shard_file(unified_dir, "node1-100", "a.txt", "a")
+
+            try:
+                shard_dir = configure_output_sharding(unified_dir, shard_name="node2-200")
+                self._write_shard_file(unified_dir, "node2-200", "b.txt", "b")
+
+                assert not complete_output_shard(mode=ShardMergeMode.Symlink), "Another shard is still running."
+
+                with open(os.path.join(unified_dir, SHARDS_DIRNAME, "node1-100", SHARD_COMPLETE_MARKER), 'w') as mf:
+                    mf.write("done")
+
+                assert complete_output_shard(mode=ShardMergeMode.Symlink), "The last shard to complete should merge."
+                assert os.path.islink(os.path.join(unified_dir, "a.txt"))
+                assert os.path.islink(os.path.join(unified_dir, "b.txt"))
+                assert os.path.isdir(shard_dir)
+            finally:
+                reset_output_sharding()
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
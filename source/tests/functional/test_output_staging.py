@@ -0,0 +1,160 @@
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from mojo.runtime.staging import (
+    OutputStager,
+    find_staged_outputs,
+    recover_staged_output
+)
+
+
+class TestOutputStaging(unittest.TestCase):
+
+    def test_flush_writes_back_staged_files(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            staging_dir = os.path.join(tempdir, "staging", "job-1")
+            destination_dir = os.path.join(tempdir, "destination")
+
+            stager = OutputStager(staging_dir, destination_dir, max_workers=2)
+            stager.start(job_id="job-1")
+
+            os.makedirs(os.path.join(staging_dir, "artifacts"))
+            with open(os.path.join(staging_dir, "artifacts", "one.txt"), 'w') as of:
+                of.write("one")
+
+            stager.commit_file(os.path.join("artifacts", "one.txt")).result()
+
+            with open(os.path.join(staging_dir, "two.txt"), 'w') as of:
+                of.write("two")
+
+            completed = stager.shutdown(timeout=10)
+
+            assert completed, "The final flush should have completed."
+            assert os.path.exists(os.path.join(destination_dir, "artifacts", "one.txt")), "The committed file should have been written back."
+            assert os.path.exists(os.path.join(destination_dir, "two.txt")), "The final flush should have written back the uncommitted file."
+            assert not os.path.exists(staging_dir), "The staging directory should be removed after a successful flush."
+
+        return
+
+    def test_changed_files_are_written_back_while_running(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            staging_dir = os.path.join(tempdir, "staging", "job-3")
+            destination_dir = os.path.join(tempdir, "destination")
+
+            stager = OutputStager(staging_dir, destination_dir, flush_interval=0.05)
+            stager.start(job_id="job-3")
+            try:
+                with open(os.path.join(staging_dir, "progress.log"), 'w') as of:
+                    of.write("step one")
+
+                destination_file = os.path.join(destination_dir, "progress.log")
+
+                deadline = time.monotonic() + 5.0
+                while not os.path.exists(destination_file) and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+                assert os.path.exists(destination_file), "The watcher should have written back the settled file."
+            finally:
+                assert stager.shutdown(timeout=10)
+
+        return
+
+    def test_rewritten_file_clears_error(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            staging_dir = os.path.join(tempdir, "staging", "job-4")
+            destination_dir = os.path.join(tempdir, "destination")
+
+            # A file at the destination blocks the directory the staged file is written back to.
+            os.makedirs(destination_dir)
+            with open(os.path.join(destination_dir, "artifacts"), 'w') as bf:
+                bf.write("blocker")
+
+            stager = OutputStager(staging_dir, destination_dir)
+            stager.start(job_id="job-4")
+
+            os.makedirs(os.path.join(staging_dir, "artifacts"))
+            with open(os.path.join(staging_dir, "artifacts", "one.txt"), 'w') as of:
+                of.write("one")
+
+            assert not stager.flush(timeout=10), "The blocked write-back should fail."
+            assert len(stager.errors) == 1
+
+            os.remove(os.path.join(destination_dir, "artifacts"))
+            stager.commit_file(os.path.join("artifacts", "one.txt")).result()
+
+            assert len(stager.errors) == 0, "The error should be cleared once the file is written back."
+            assert stager.shutdown(timeout=10)
+
+        return
+
+    def test_stalled_write_back_does_not_block_shutdown(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            staging_dir = os.path.join(tempdir, "staging", "job-1")
+            destination_dir = os.path.join(tempdir, "destination")
+
+            stall_gate = threading.Event()
+
+            class StalledOutputStager(OutputStager):
+                def _write_back_file(self, relpath):
+                    stall_gate.wait()
+                    return super()._write_back_file(relpath)
+
+            stager = StalledOutputStager(staging_dir, destination_dir, max_workers=1)
+            stager.start(job_id="job-1")
+
+            try:
+                for name in ("one.txt", "two.txt"):
+                    with open(os.path.join(staging_dir, name), 'w') as of:
+                        of.write(name)
+
+                started = time.monotonic()
+                completed = stager.shutdown(timeout=0.2)
+                elapsed = time.monotonic() - started
+
+                assert not completed, "The final flush should have timed out."
+                assert elapsed < 5, "The shutdown should be bounded by the flush timeout. elapsed={}".format(elapsed)
+                assert all(thread.daemon for thread in threading.enumerate() if thread.name.startswith("mjr-staging")), \
+                    "The abandoned write-back workers should not hold up the exit."
+                assert os.path.exists(staging_dir), "The staging directory should be kept when the flush did not complete."
+            finally:
+                stall_gate.set()
+
+        return
+
+    def test_recover_staged_output(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            staging_root = os.path.join(tempdir, "staging")
+            staging_dir = os.path.join(staging_root, "job-2")
+            destination_dir = os.path.join(tempdir, "destination")
+
+            # Simulate a job that crashed before the final flush
+            stager = OutputStager(staging_dir, destination_dir)
+            stager.start(job_id="job-2")
+            with open(os.path.join(staging_dir, "results.json"), 'w') as of:
+                of.write("{}")
+
+            found = find_staged_outputs(staging_root)
+            assert len(found) == 1, "The staged output of the crashed job should have been found."
+            assert found[0]["job_id"] == "job-2"
+
+            recovered_to = recover_staged_output(found[0]["staging_dir"])
+
+            assert recovered_to == destination_dir
+            assert os.path.exists(os.path.join(destination_dir, "results.json")), "The staged output should have been recovered."
+
+            found = find_staged_outputs(staging_root)
+            assert len(found) == 0, "The recovered output should no longer be reported as staged."
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+
+import os
+import tempfile
+import unittest
+
+from mojo.runtime.enumerations import OutputStripingPolicy
+from mojo.runtime.striping import parse_output_roots, select_output_root
+
+
+class TestOutputStriping(unittest.TestCase):
+
+    def test_parse_output_roots(self):
+
+        roots_value = os.pathsep.join(["/vol1/results", "", " /vol2/results "])
+        roots = parse_output_roots(roots_value)
+
+        assert roots == ["/vol1/results", "/vol2/results"], "The empty entries should have been removed."
+
+        return
+
+    def test_round_robin_selection(self):
+
+        roots = ["/vol1/results", "/vol2/results", "/vol3/results"]
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            counter_file = os.path.join(tempdir, "counter")
+
+            selected = []
+            for _ in range(6):
+                root = select_output_root(roots, OutputStripingPolicy.RoundRobin, "job", counter_file=counter_file)
+                selected.append(root)
+
+        assert selected == roots + roots, "Round-robin selection should cycle through the roots."
+
+        return
+
+    def test_job_hash_selection_is_stable(self):
+
+        roots = ["/vol1/results", "/vol2/results", "/vol3/results"]
+
+        first = select_output_root(roots, OutputStripingPolicy.JobHash, "1c4a1d3c-job")
+        second = select_output_root(roots, OutputStripingPolicy.JobHash, "1c4a1d3c-job")
+
+        assert first == second, "The same job id should always select the same output root."
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
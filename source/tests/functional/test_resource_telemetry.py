@@ -0,0 +1,44 @@
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from mojo.runtime.telemetry import ResourceTelemetrySampler, read_telemetry_file
+
+
+class TestResourceTelemetry(unittest.TestCase):
+
+    def test_sampler_records_samples_and_summary(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            telemetry_dir = os.path.join(tempdir, "diagnostics", "telemetry")
+
+            sampler = ResourceTelemetrySampler(telemetry_dir, interval=0.01)
+            sampler.start()
+
+            ballast = [bytearray(1024) for _ in range(1024)]
+            deadline = time.perf_counter() + 0.3
+            while time.perf_counter() < deadline:
+                sum(range(1000))
+
+            summary = sampler.stop()
+            del ballast
+
+            samples = read_telemetry_file(sampler.telemetry_file)
+            assert len(samples) >= 5, "The sampler should have taken a sample every interval."
+            assert summary["sample_count"] == len(samples)
+
+            last = samples[-1]
+            assert last.rss_bytes > 0
+            assert last.threads >= 1
+            assert all(later.timestamp >= earlier.timestamp for earlier, later in zip(samples, samples[1:]))
+            assert summary["counters"]["cpu_user"]["total"] >= 0.0
+
+            with open(sampler.summary_file, 'r') as sf:
+                written = json.load(sf)
+            assert written["sampler"]["samples"] == len(samples)
+            assert written["gauges"]["rss_bytes"]["max"] >= written["gauges"]["rss_bytes"]["min"]
+
+        return
@@ -0,0 +1,82 @@
+
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+
+from mojo.runtime import profiler
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def busy_profiled_function(stop_event: threading.Event):
+    while not stop_event.is_set():
+        sum(range(1000))
+    return
+
+
+class TestSamplingProfiler(unittest.TestCase):
+
+    def test_profile_contains_collapsed_stacks_of_worker_threads(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            stop_event = threading.Event()
+            worker = threading.Thread(target=busy_profiled_function, args=(stop_event,), name="busy-worker")
+            worker.start()
+
+            sampler = profiler.SamplingProfiler(tempdir, interval=0.005)
+            sampler.start()
+            time.sleep(0.3)
+            profile_file = sampler.stop()
+
+            stop_event.set()
+            worker.join()
+
+            assert profile_file is not None and os.path.dirname(profile_file) == tempdir
+
+            with open(profile_file, 'r') as pf:
+                lines = pf.read().splitlines()
+
+            worker_lines = [line for line in lines if line.startswith("busy-worker;")]
+            assert len(worker_lines) > 0, "The worker thread should have been sampled."
+            assert any("busy_profiled_function" in line for line in worker_lines)
+            assert not any(line.startswith("mjr-profiler") for line in lines), "The sampler should not sample itself."
+
+            for line in lines:
+                stack, count = line.rsplit(" ", 1)
+                assert len(stack) > 0 and int(count) > 0
+
+        return
+
+    @unittest.skipUnless(hasattr(signal, "SIGUSR2"), "The platform does not have SIGUSR2.")
+    def test_signal_toggles_the_profiler(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            profiler.configure_sampling_profiler(tempdir, interval=0.005)
+            try:
+                assert profiler.install_profiler_signal_handler()
+
+                # The profiler is toggled on a separate thread after the signal is handled.
+                os.kill(os.getpid(), signal.SIGUSR2)
+                assert wait_for(lambda: profiler.get_sampling_profiler() is not None), "The first signal should start the profiler."
+
+                time.sleep(0.1)
+
+                os.kill(os.getpid(), signal.SIGUSR2)
+                assert wait_for(lambda: profiler.get_sampling_profiler() is None), "The second signal should stop the profiler."
+
+                assert wait_for(lambda: any(fname.endswith(".folded") for fname in os.listdir(tempdir)))
+            finally:
+                profiler.reset_sampling_profiler()
+
+            assert signal.getsignal(signal.SIGUSR2) == signal.SIG_DFL
+
+        return
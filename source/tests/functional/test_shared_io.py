@@ -0,0 +1,155 @@
+
+import asyncio
+import errno
+import os
+import tempfile
+import threading
+import unittest
+
+from mojo.runtime.exceptions import SharedStorageTimeoutError
+from mojo.runtime.sharedio import SharedIOExecutor
+
+
+class TestSharedIO(unittest.TestCase):
+
+    def test_stalled_operation_times_out(self):
+
+        stall_gate = threading.Event()
+
+        def stalled_operation():
+            stall_gate.wait()
+            return
+
+        executor = SharedIOExecutor(max_workers=2, timeout=0.05, retries=2, backoff=0.01)
+        try:
+            with self.assertRaises(SharedStorageTimeoutError):
+                executor.run(stalled_operation, op_name="stalled")
+
+            histograms = executor.get_latency_histograms()
+            assert histograms["stalled"]["timeouts"] == 1, "A timed out operation should not be retried."
+        finally:
+            stall_gate.set()
+            executor.shutdown()
+
+        return
+
+    def test_stalled_path_does_not_wedge_executor(self):
+
+        stall_gate = threading.Event()
+
+        def stalled_operation(path):
+            stall_gate.wait()
+            return
+
+        executor = SharedIOExecutor(max_workers=2, timeout=0.5, retries=2, backoff=0.01)
+        try:
+            with tempfile.TemporaryDirectory() as tempdir:
+                stalled_dir = os.path.join(tempdir, "stalled")
+
+                with self.assertRaises(SharedStorageTimeoutError):
+                    executor.run(stalled_operation, stalled_dir, op_name="stalled")
+
+                # An unrelated operation still runs while the stalled attempt is stuck.
+                assert executor.run(lambda: "ok") == "ok"
+                assert executor.exists(tempdir)
+
+                # Operations on the stalled path fail immediately instead of waiting for the timeout.
+                with self.assertRaises(SharedStorageTimeoutError):
+                    executor.makedirs(os.path.join(stalled_dir, "child"), timeout=30)
+
+                stall_gate.set()
+                for _ in range(100):
+                    if executor.stalled_count == 0:
+                        break
+                    threading.Event().wait(0.01)
+
+                assert executor.stalled_count == 0, "The stalled attempt should be released once it returns."
+                executor.makedirs(os.path.join(stalled_dir, "child"))
+        finally:
+            stall_gate.set()
+            executor.shutdown()
+
+        return
+
+    def test_workers_are_pooled(self):
+
+        executor = SharedIOExecutor(max_workers=2, timeout=5)
+        try:
+            threads = [threading.Thread(target=lambda: [executor.run(lambda: threading.current_thread().name) for _ in range(50)])
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert 1 <= executor.worker_count <= 2, "The operations should reuse a bounded pool of workers."
+        finally:
+            executor.shutdown()
+
+        return
+
+    def test_too_many_stalled_fails_fast(self):
+
+        stall_gate = threading.Event()
+
+        def stalled_operation(path):
+            stall_gate.wait()
+            return
+
+        executor = SharedIOExecutor(max_workers=1, max_stalled=2, timeout=0.05, retries=0)
+        try:
+            with tempfile.TemporaryDirectory() as tempdir:
+                for name in ("first", "second"):
+                    with self.assertRaises(SharedStorageTimeoutError):
+                        executor.run(stalled_operation, os.path.join(tempdir, name))
+
+                assert executor.stalled_count == 2
+                assert executor.worker_count == 2, "A stalled worker should be replaced in the pool."
+
+                with self.assertRaisesRegex(SharedStorageTimeoutError, "Too many"):
+                    executor.exists(tempdir)
+        finally:
+            stall_gate.set()
+            executor.shutdown()
+
+        return
+
+    def test_transient_error_is_retried(self):
+
+        attempts = []
+
+        def flaky_operation():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise OSError(errno.EIO, "Transient I/O error")
+            return "done"
+
+        executor = SharedIOExecutor(max_workers=1, timeout=5, retries=3, backoff=0.01)
+        try:
+            result = executor.run(flaky_operation)
+        finally:
+            executor.shutdown()
+
+        assert result == "done"
+        assert len(attempts) == 3, "The operation should have been retried until it succeeded."
+
+        return
+
+    def test_makedirs_async(self):
+
+        executor = SharedIOExecutor(max_workers=1, timeout=5)
+        try:
+            with tempfile.TemporaryDirectory() as tempdir:
+                target_dir = os.path.join(tempdir, "a", "b")
+
+                asyncio.run(executor.makedirs_async(target_dir))
+                exists = asyncio.run(executor.exists_async(target_dir))
+
+                assert exists, "The directory should have been created."
+        finally:
+            executor.shutdown()
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+
+import signal
+import threading
+import unittest
+
+from mojo.runtime.sighandlers import SignalHandlerSlot, install_pending_signal_handlers
+
+
+@unittest.skipUnless(hasattr(signal, "SIGUSR2"), "The platform does not have SIGUSR2.")
+class TestSignalHandlers(unittest.TestCase):
+
+    def setUp(self):
+        self._received = []
+        self._slot = SignalHandlerSlot("test", "SIGUSR2", self._on_signal)
+        return
+
+    def tearDown(self):
+        self._slot.uninstall()
+        return
+
+    def test_install_from_worker_is_deferred(self):
+
+        results = []
+        with self.assertLogs(level="INFO"):
+            worker = threading.Thread(target=lambda: results.append(self._slot.install()))
+            worker.start()
+            worker.join()
+
+        assert results == [False], "A worker thread cannot install a signal handler."
+        assert not self._slot.installed
+        assert signal.getsignal(signal.SIGUSR2) == signal.SIG_DFL
+
+        assert install_pending_signal_handlers() == 1
+        assert self._slot.installed and self._slot.signum == signal.SIGUSR2
+
+        signal.raise_signal(signal.SIGUSR2)
+        assert self._received == [signal.SIGUSR2]
+
+        self._slot.uninstall()
+        assert signal.getsignal(signal.SIGUSR2) == signal.SIG_DFL
+
+        return
+
+    def test_uninstall_cancels_deferred_install(self):
+
+        with self.assertLogs(level="INFO"):
+            worker = threading.Thread(target=self._slot.install)
+            worker.start()
+            worker.join()
+
+        self._slot.uninstall()
+        assert install_pending_signal_handlers() == 0
+
+        return
+
+    def _on_signal(self, signum, frame): # pylint: disable=unused-argument
+        self._received.append(signum)
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+
+import os
+import tempfile
+import threading
+import unittest
+
+from mojo.runtime.tempalloc import TempFileAllocator
+
+
+class TestTempFileAllocator(unittest.TestCase):
+
+    def test_names_are_unique_across_threads(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            allocator = TempFileAllocator(tempdir)
+
+            allocated = []
+            allocated_lock = threading.Lock()
+
+            def allocate():
+                names = [allocator.allocate_name(suffix=".tmp", prefix="tc-") for _ in range(200)]
+                with allocated_lock:
+                    allocated.extend(names)
+                return
+
+            threads = [threading.Thread(target=allocate) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert len(allocated) == len(set(allocated)) == 1600, "Every allocated name should be unique."
+            for temp_file in allocated:
+                assert os.path.dirname(temp_file) == allocator.temp_root
+                assert os.path.isfile(temp_file), "The allocated name should be reserved with an empty file."
+
+        return
+
+    def test_open_file_skips_existing_names_and_cleans_up(self):
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            allocator = TempFileAllocator(tempdir)
+
+            first = allocator.allocate_name(suffix=".log")
+            temp_root = allocator.temp_root
+
+            # A file created by something other than the allocator with the next name in the sequence.
+            next_name = os.path.join(temp_root, "{}-1.log".format(os.getpid()))
+            with open(next_name, 'w') as nf:
+                nf.write("existing")
+
+            with allocator.open_file(suffix=".log", mode="w") as tf:
+                tf.write("allocated")
+                opened = tf.name
+
+            assert opened not in (first, next_name)
+            with open(next_name, 'r') as nf:
+                assert nf.read() == "existing", "An existing file should never be reused."
+
+            allocator.cleanup()
+            assert not os.path.exists(temp_root), "The temp root should be removed by cleanup."
+            assert allocator.temp_root is None
+
+            second_root = os.path.dirname(allocator.allocate_name())
+            assert second_root != temp_root, "Allocating after cleanup should create a new temp root."
+            allocator.cleanup()
+
+        return
@@ -0,0 +1,91 @@
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from mojo.runtime import tracing
+
+
+@tracing.traced(category="test")
+def traced_operation(value: int) -> int:
+    return value * 2
+
+
+class TestTracing(unittest.TestCase):
+
+    def tearDown(self):
+        tracing.disable_tracing()
+        tracing.clear_trace_buffers()
+        return
+
+    def test_disabled_tracing_records_nothing(self):
+
+        tracing.disable_tracing()
+
+        with tracing.span("ignored") as ignored:
+            assert ignored is tracing.NULL_SPAN
+
+        assert traced_operation(2) == 4
+        tracing.trace_instant("ignored")
+
+        assert tracing.collect_trace_events() == []
+
+        return
+
+    def test_spans_from_threads_are_written_as_chrome_trace(self):
+
+        tracing.enable_tracing()
+
+        def worker():
+            with tracing.span("worker-phase", category="test", item=1):
+                traced_operation(1)
+            return
+
+        with tracing.span("main-phase", category="test"):
+            thread = threading.Thread(target=worker, name="trace-worker")
+            thread.start()
+            thread.join()
+            tracing.trace_instant("milestone")
+
+        try:
+            with tracing.span("failing-phase"):
+                raise ValueError("failed")
+        except ValueError:
+            pass
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            trace_file = os.path.join(tempdir, "trace.json")
+            metadata = { "MJR_JOB_ID": "job-1", "MJR_RUN_ID": None }
+
+            tracing.write_trace_file(trace_file, metadata=metadata)
+
+            with tracing.span("second-flush"):
+                pass
+            tracing.write_trace_file(trace_file, metadata=metadata)
+
+            with open(trace_file, 'r') as tf:
+                trace = json.load(tf)
+
+        assert trace["otherData"]["MJR_JOB_ID"] == "job-1"
+
+        events = { event["name"]: event for event in trace["traceEvents"] if event["ph"] != "M" }
+        assert set(events) == {"main-phase", "worker-phase", "traced_operation", "milestone", "failing-phase", "second-flush"}
+
+        main_phase = events["main-phase"]
+        worker_phase = events["worker-phase"]
+        assert worker_phase["tid"] != main_phase["tid"]
+        assert worker_phase["args"] == { "item": 1 }
+        assert main_phase["ts"] <= worker_phase["ts"]
+        assert worker_phase["ts"] + worker_phase["dur"] <= main_phase["ts"] + main_phase["dur"]
+        assert events["traced_operation"]["cat"] == "test"
+        assert events["milestone"]["ph"] == "i"
+        assert events["failing-phase"]["args"]["exception"] == "ValueError"
+
+        thread_names = [event["args"]["name"] for event in trace["traceEvents"] if event["name"] == "thread_name"]
+        assert "trace-worker" in thread_names
+
+        assert tracing.collect_trace_events() == [], "Written events should be removed from the buffers."
+
+        return
@@ -0,0 +1,34 @@
+import asyncio
+import os
+import unittest
+
+class TestStartupAsync(unittest.TestCase):
+
+    def test_startup_async(self):
+
+        from mojo.runtime.initialize import initialize_runtime
+
+        initialize_runtime(name="mjr", logger_name="MJR")
+
+        from mojo.runtime.activation import activate_runtime_async, reset_runtime, ActivationProfile
+        from mojo.runtime.asyncpaths import get_path_for_output_async, get_temporary_file_async
+
+        async def start_service():
+            await activate_runtime_async(profile=ActivationProfile.TestRun)
+
+            output_dir = await get_path_for_output_async()
+            temp_file = await get_temporary_file_async(suffix=".txt")
+
+            return output_dir, temp_file
+
+        output_dir, temp_file = asyncio.run(start_service())
+
+        assert os.path.isdir(output_dir), "The output directory should have been created by activation."
+        assert temp_file.startswith(output_dir), "The temporary file should be in the output directory."
+
+        reset_runtime()
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import asyncio
+import unittest
+
+class TestStartupIsolated(unittest.TestCase):
+
+    def test_startup_isolated(self):
+
+        from mojo.runtime.initialize import initialize_runtime
+
+        initialize_runtime(name="mjr", logger_name="MJR")
+
+        from mojo.runtime.activation import activate_runtime, reset_runtime, ActivationProfile
+        from mojo.runtime.integration import get_job_id
+        from mojo.runtime.paths import get_path_for_output
+        from mojo.runtime.runtimecontext import isolated_runtime
+
+        activate_runtime(profile=ActivationProfile.TestRun)
+
+        process_job_id = get_job_id()
+        process_output_directory = get_path_for_output()
+
+        async def run_isolated_job(job_id):
+            with isolated_runtime(job_id=job_id):
+                await asyncio.sleep(0)
+                rtnval = (get_job_id(), get_path_for_output())
+            return rtnval
+
+        async def run_isolated_jobs():
+            results = await asyncio.gather(run_isolated_job("job-a"), run_isolated_job("job-b"))
+            return results
+
+        (job_a_id, job_a_output), (job_b_id, job_b_output) = asyncio.run(run_isolated_jobs())
+
+        assert job_a_id == "job-a" and job_b_id == "job-b", "Each task should see its own job id."
+        assert job_a_output != job_b_output, "Each task should have its own output directory."
+        assert job_a_output.startswith(process_output_directory), "Isolated outputs should be under the process output."
+
+        assert get_job_id() == process_job_id, "The process job id should be unchanged outside the isolated runtimes."
+        assert get_path_for_output() == process_output_directory, "The process output should be unchanged."
+
+        reset_runtime()
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+class TestStartupJobInfo(unittest.TestCase):
+
+    def test_startup_jobinfo(self):
+
+        from mojo.runtime.initialize import initialize_runtime
+
+        initialize_runtime(name="mjr", logger_name="MJR")
+
+        from mojo.runtime.activation import activate_runtime, reset_runtime, ActivationProfile
+        from mojo.runtime.integration import get_job_info, get_job_name, get_pipeline_info
+        from mojo.runtime.optionoverrides import MOJO_RUNTIME_OPTION_OVERRIDES
+
+        activate_runtime(profile=ActivationProfile.TestRun)
+
+        first_info = get_job_info()
+        assert get_job_info() is first_info, "The job info snapshot should be cached."
+
+        with self.assertRaises(AttributeError):
+            first_info.name = "changed"
+
+        MOJO_RUNTIME_OPTION_OVERRIDES.override_job_name("snapshot-job")
+
+        second_info = get_job_info()
+        assert second_info is not first_info, "Overriding a job field should invalidate the snapshot."
+        assert second_info.name == "snapshot-job" and get_job_name() == "snapshot-job"
+        assert second_info["name"] == "snapshot-job", "The snapshot should support item access by field name."
+
+        pipeline_info = get_pipeline_info()
+        assert get_pipeline_info() is pipeline_info, "The pipeline info snapshot should be cached."
+
+        reset_runtime()
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
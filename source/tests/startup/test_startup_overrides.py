@@ -0,0 +1,58 @@
+import unittest
+
+class TestStartupOverrides(unittest.TestCase):
+
+    def test_startup_overrides(self):
+
+        from mojo.runtime.initialize import initialize_runtime
+
+        initialize_runtime(name="mjr", logger_name="MJR")
+
+        from mojo.errors.exceptions import ConfigurationError
+
+        from mojo.runtime.activation import activate_runtime, reset_runtime, ActivationProfile
+        from mojo.runtime.integration import get_job_info, get_pipeline_instance, get_pipeline_name
+        from mojo.runtime.optionoverrides import (
+            MOJO_RUNTIME_OPTION_OVERRIDES,
+            register_override_listener,
+            unregister_override_listener
+        )
+        from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES
+
+        activate_runtime(profile=ActivationProfile.TestRun)
+
+        notifications = []
+        register_override_listener(notifications.append)
+
+        try:
+            first_info = get_job_info()
+
+            changed = MOJO_RUNTIME_OPTION_OVERRIDES.apply_overrides({
+                "MJR_JOB_NAME": "batch-job",
+                "MJR_PIPELINE_NAME": "batch-pipeline",
+                "MJR_PIPELINE_INSTANCE": "batch-instance"
+            })
+
+            assert changed == frozenset(["MJR_JOB_NAME", "MJR_PIPELINE_NAME", "MJR_PIPELINE_INSTANCE"])
+            assert notifications == [changed], "A single notification should be fired for the batch."
+            assert get_job_info() is not first_info, "The job info snapshot should have been invalidated."
+            assert get_pipeline_name() == "batch-pipeline"
+            assert get_pipeline_instance() == "batch-instance"
+
+            with self.assertRaises(ConfigurationError):
+                MOJO_RUNTIME_OPTION_OVERRIDES.apply_overrides({
+                    "MJR_JOB_NAME": "never-applied",
+                    "MJR_OUTPUT_QUOTA_HARD": -1
+                })
+
+            assert MOJO_RUNTIME_VARIABLES.MJR_JOB_NAME == "batch-job", "An invalid batch should not apply any override."
+            assert len(notifications) == 1, "An invalid batch should not fire a notification."
+        finally:
+            unregister_override_listener(notifications.append)
+
+        reset_runtime()
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
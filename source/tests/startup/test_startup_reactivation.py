@@ -0,0 +1,38 @@
+
+import unittest
+
+class TestStartupReactivation(unittest.TestCase):
+
+    def test_startup_reactivation(self):
+
+        from mojo.runtime.initialize import initialize_runtime
+
+        initialize_runtime(name="mjr", logger_name="MJR")
+
+        from mojo.runtime.activation import activate_runtime, reset_runtime, ActivationProfile
+        from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES
+        from mojo.runtime.paths import get_path_for_output
+
+        activate_runtime(profile=ActivationProfile.TestRun)
+
+        first_job_id = MOJO_RUNTIME_VARIABLES.MJR_JOB_ID
+        first_output_directory = get_path_for_output()
+
+        reset_runtime()
+
+        assert MOJO_RUNTIME_VARIABLES.MJR_ACTIVATION_PROFILE is None, "The activation profile should have been cleared."
+
+        activate_runtime(profile=ActivationProfile.Console)
+
+        second_output_directory = get_path_for_output()
+
+        assert MOJO_RUNTIME_VARIABLES.MJR_JOB_ID != first_job_id, "The second activation should be a new job."
+        assert second_output_directory != first_output_directory, "The path caches should have been cleared."
+        assert second_output_directory.startswith("/tmp"), "The console profile should output to a temp directory."
+
+        reset_runtime()
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import logging
+import os
+import signal
+import tempfile
+import time
+import unittest
+
+class TestStartupReload(unittest.TestCase):
+
+    def test_startup_reload(self):
+
+        from mojo.runtime.initialize import initialize_runtime
+
+        initialize_runtime(name="mjr", logger_name="MJR", service_name="reload-service")
+
+        from mojo.runtime.activation import activate_runtime, reset_runtime, ActivationProfile
+        from mojo.runtime.reload import get_runtime_reloader
+        from mojo.runtime.runtimevariables import MOJO_RUNTIME_VARIABLES
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            reload_file = os.path.join(tempdir, "reload.env")
+            with open(reload_file, 'w') as rf:
+                rf.write("MJR_LOG_LEVEL_FILE=INFO\n")
+
+            MOJO_RUNTIME_VARIABLES.MJR_RELOAD_FILE = reload_file
+            MOJO_RUNTIME_VARIABLES.MJR_RELOAD_SIGNAL = True
+            MOJO_RUNTIME_VARIABLES.MJR_RELOAD_POLL_INTERVAL = 0.05
+
+            activate_runtime(profile=ActivationProfile.Service)
+
+            try:
+                reloader = get_runtime_reloader()
+                assert reloader is not None
+
+                with open(reload_file, 'w') as rf:
+                    rf.write("MJR_LOG_LEVEL_FILE=DEBUG\n")
+
+                deadline = time.time() + 5
+                while reloader.reload_count == 0 and time.time() < deadline:
+                    time.sleep(0.05)
+
+                assert MOJO_RUNTIME_VARIABLES.MJR_LOG_LEVEL_FILE == "DEBUG", "The file change should reload the log level."
+                assert logging.getLogger().level == logging.DEBUG
+
+                file_handlers = [hdlr for hdlr in logging.getLogger().handlers if isinstance(hdlr, logging.FileHandler)]
+                assert all([hdlr.level == logging.DEBUG for hdlr in file_handlers])
+
+                os.kill(os.getpid(), signal.SIGHUP)
+
+                deadline = time.time() + 5
+                while reloader.reload_count < 2 and time.time() < deadline:
+                    time.sleep(0.05)
+
+                assert reloader.reload_count == 2, "SIGHUP should trigger a reload."
+            finally:
+                reset_runtime()
+
+            assert get_runtime_reloader() is None
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()
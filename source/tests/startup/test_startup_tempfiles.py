@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+
+class TestStartupTempFiles(unittest.TestCase):
+
+    def test_startup_tempfiles(self):
+
+        from mojo.runtime.initialize import initialize_runtime
+
+        initialize_runtime(name="mjr", logger_name="MJR")
+
+        from mojo.runtime.activation import activate_runtime, reset_runtime, ActivationProfile
+        from mojo.runtime.optionoverrides import MOJO_RUNTIME_OPTION_OVERRIDES
+        from mojo.runtime.paths import get_path_for_output, get_temporary_file
+        from mojo.runtime.runtimecontext import isolated_runtime
+
+        activate_runtime(profile=ActivationProfile.TestRun)
+
+        process_temp_file = get_temporary_file(suffix=".tmp")
+        assert process_temp_file.startswith(get_path_for_output()), "Temp files should be under the process output."
+
+        with isolated_runtime(job_id="job-temp") as rtctx:
+            isolated_temp_file = get_temporary_file(suffix=".tmp")
+            assert isolated_temp_file.startswith(rtctx.get_path_for_output()), \
+                "Temp files of an isolated runtime should be under its output directory."
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            MOJO_RUNTIME_OPTION_OVERRIDES.apply_overrides({ "MJR_OUTPUT_DIRECTORY": tempdir })
+
+            overridden_temp_file = get_temporary_file(suffix=".tmp")
+            assert overridden_temp_file.startswith(tempdir), "Temp files should follow an output directory override."
+            assert os.path.exists(process_temp_file), "Temp files in use should not be removed by an override."
+
+            reset_runtime()
+
+        return
+
+if __name__ == '__main__':
+    unittest.main()